@@ -28,12 +28,13 @@ def usage():
     Prints the command line usage information for galclass
     """
     Console.newLine()
-    Console.printInfo("Usage: galclass [-c <categories_file>] [-i <input_file>] [-o <output_file_suffix>] [--graphical-only]")
+    Console.printInfo("Usage: galclass [-c <categories_file>] [-i <input_file>] [-o <output_file_suffix>] [--graphical-only] [--sqlite]")
     Console.newLine()
     Console.printInfo("[-c <categories_file>]\t->\t[optional] categories file (None)")
     Console.printInfo("[-i <input_file>]\t\t->\t[optional] input list file (None)")
     Console.printInfo("[-o <output_file_suffix>]\t->\t[optional] output classification file suffix ('_classificied.json')")
     Console.printInfo("[--graphical-only]\t\t->\t[optional] use the Graphical User Interface to get the path to the categories file")
+    Console.printInfo("[--sqlite]\t\t\t->\t[optional] keep the classification in an SQLite database, exported to the output classification file on exit")
     return
 
 #******#
@@ -60,6 +61,7 @@ def main(argv=sys.argv[1:]):
     inputFile=None
     outputFileSuffix="_classified.json"
     graphicalOnly=False
+    outputBackend="json"
 
     # Evaluate Command Line Arguments
 
@@ -89,6 +91,8 @@ def main(argv=sys.argv[1:]):
             iarg=iarg+1
         elif((argv[iarg]=="--graphical-only")):
             graphicalOnly=True
+        elif((argv[iarg]=="--sqlite")):
+            outputBackend="sqlite"
         else:
             Console.popJob(success=False)
             Console.printError(f"Unknown argument: \"{argv[iarg]}\"")
@@ -103,7 +107,7 @@ def main(argv=sys.argv[1:]):
 
     # Inititalize the Qt interface
 
-    qt.start(categoriesFile=categoriesFile, inputFile=inputFile, outputFileSuffix=outputFileSuffix)
+    qt.start(categoriesFile=categoriesFile, inputFile=inputFile, outputFileSuffix=outputFileSuffix, outputBackend=outputBackend)
     
     # That's all folks!
 
@@ -8,4 +8,13 @@ A submodule for the analysis of classifications.
 
 # Local #
 
-from .classification import *
\ No newline at end of file
+from .countmatrix import *
+from .classification import *
+from .hierarchy import *
+from .query import *
+from .weighting import *
+from .uncertainty import *
+from .agreement import *
+from .mapped import *
+from .export import *
+from .cache import *
\ No newline at end of file
@@ -0,0 +1,293 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+# Local #
+
+from .classification import classification, combinedClassification, unpackCategories
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['getCooccurrenceMatrix', 'getNumberOfRaters', 'getFleissKappa', 'getCohenKappa']
+
+#############
+# Constants #
+#############
+
+# Memory budget of the blocks of items processed at once, in bytes
+maxBlockBytes=67108864
+
+#############
+# Functions #
+#############
+
+#****************#
+# Get chunk size #
+#****************#
+
+def getChunkSize(bytesPerItem: int, chunkSize: Optional[int] = None) -> int:
+    """
+    Returns the number of items processed at once, so that the blocks of items stay within the memory budget
+
+    Parameters
+    ----------
+    bytesPerItem : int
+        The number of bytes used per item of a block
+    chunkSize : int, optional
+        The requested number of items per block (default is None, for as many as fit in the memory budget)
+    """
+
+    # Evaluate arguments
+    if(chunkSize is not None):
+        return max(int(chunkSize), 1)
+
+    # Return
+    return max(maxBlockBytes//max(bytesPerItem, 1), 1)
+
+#***************************#
+# Iterate membership blocks #
+#***************************#
+
+def iterateMembershipBlocks(classification: Union[classification, combinedClassification], threshold: int = 1, chunkSize: Optional[int] = None) -> Iterator:
+    """
+    Yields the membership of consecutive blocks of items in each category, as boolean arrays with one row per item and one column per category
+
+    Parameters
+    ----------
+    classification : classification or combinedClassification
+        The classification
+    threshold : int, optional
+        The number of times an item of a combined classification must have fallen within a category to be a member of it (default is 1)
+    chunkSize : int, optional
+        The number of items per block (default is None, for as many as fit in the memory budget)
+    """
+
+    # Determine the number of items per block
+    chunkSize=getChunkSize(8*classification.ncategories, chunkSize)
+
+    # Yield the blocks
+    for start in range(0, classification.nitems, chunkSize):
+        end=min(start+chunkSize, classification.nitems)
+        if(isinstance(classification, combinedClassification)):
+            yield start, end, (classification.counts.getRows(start, end)>=threshold)
+        else:
+            membership=np.zeros((end-start, classification.ncategories), dtype=bool)
+            membership[unpackCategories(classification.categoryBits[start:end], classification.ncategories)]=True
+            yield start, end, membership
+
+    # Return
+    return
+
+#**********************#
+# Iterate vote tensors #
+#**********************#
+
+def iterateVoteTensors(combined: combinedClassification, chunkSize: Optional[int] = None) -> Iterator:
+    """
+    Yields the votes of each combined classification on consecutive blocks of items, as one-hot tensors
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    chunkSize : int, optional
+        The number of items per block (default is None, for as many as fit in the memory budget)
+
+    Yields
+    ------
+    start, end : int
+        The IDs of the first item and past the last item of the block
+    rated : np.ndarray
+        Whether each classification includes each item of the block, with shape (nclassifications, nitems)
+    votes : np.ndarray
+        Whether each classification puts each item of the block in each category, with shape (nclassifications, nitems, ncategories)
+    """
+
+    # Sort the items of each classification by their IDs in the combined classification, and map their categories
+    sources=[]
+    for source in combined.sources:
+        assert hasattr(source['classification'], 'categoryBits'), "the vote tensors can only be built from combined single classifications"
+        order=np.argsort(source['itemIDs'], kind='stable')
+        categoryIDs=np.array([combined.categoryIDs.get(category, -1) for category in source['classification'].categories], dtype=np.int64)
+        sources.append({'order': order, 'sortedItemIDs': source['itemIDs'][order], 'categoryIDs': categoryIDs, 'classification': source['classification']})
+
+    # Determine the number of items per block
+    chunkSize=getChunkSize(5*len(sources)*combined.ncategories, chunkSize)
+
+    # Yield the blocks
+    for start in range(0, combined.nitems, chunkSize):
+        end=min(start+chunkSize, combined.nitems)
+        rated=np.zeros((len(sources), end-start), dtype=bool)
+        votes=np.zeros((len(sources), end-start, combined.ncategories), dtype=bool)
+        for isource, source in enumerate(sources):
+            # Select the items of the classification in the block
+            first, last=np.searchsorted(source['sortedItemIDs'], [start, end])
+            localItemIDs=source['order'][first:last]
+            blockItemIDs=source['sortedItemIDs'][first:last]-start
+            rated[isource, blockItemIDs]=True
+            # Scatter the categories of the items
+            itemIndices, categoryIndices=unpackCategories(source['classification'].categoryBits[localItemIDs], source['classification'].ncategories)
+            categoryIDs=source['categoryIDs'][categoryIndices]
+            isCombined=(categoryIDs>=0)
+            votes[isource, blockItemIDs[itemIndices[isCombined]], categoryIDs[isCombined]]=True
+        yield start, end, rated, votes
+
+    # Return
+    return
+
+#*************************#
+# Get cooccurrence matrix #
+#*************************#
+
+def getCooccurrenceMatrix(classification: Union[classification, combinedClassification], threshold: int = 1, chunkSize: Optional[int] = None) -> np.ndarray:
+    """
+    Returns the number of items in each pair of categories, the diagonal holding the number of items in each category
+
+    Parameters
+    ----------
+    classification : classification or combinedClassification
+        The classification
+    threshold : int, optional
+        The number of times an item of a combined classification must have fallen within a category to be counted in it (default is 1)
+    chunkSize : int, optional
+        The number of items processed at once (default is None, for as many as fit in the memory budget)
+    """
+
+    # Accumulate the products of the membership blocks
+    cooccurrenceMatrix=np.zeros((classification.ncategories, classification.ncategories), dtype=np.int64)
+    for start, end, membership in iterateMembershipBlocks(classification, threshold=threshold, chunkSize=chunkSize):
+        membership=membership.astype(np.float32)
+        cooccurrenceMatrix+=np.rint(membership.T@membership).astype(np.int64)
+
+    # Return
+    return cooccurrenceMatrix
+
+#**********************#
+# Get number of raters #
+#**********************#
+
+def getNumberOfRaters(combined: combinedClassification) -> np.ndarray:
+    """
+    Returns the number of combined classifications that include each item
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    """
+
+    # Count each item once per classification
+    nraters=np.zeros((combined.nitems,), dtype=np.int64)
+    for source in combined.sources:
+        nraters+=np.bincount(np.unique(source['itemIDs']), minlength=combined.nitems)
+
+    # Return
+    return nraters
+
+#******************#
+# Get Fleiss kappa #
+#******************#
+
+def getFleissKappa(combined: combinedClassification, chunkSize: Optional[int] = None) -> np.ndarray:
+    """
+    Returns Fleiss' kappa of each category, treating membership of the category as a binary rating of the items included in at least two classifications
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    chunkSize : int, optional
+        The number of items processed at once (default is None, for as many as fit in the memory budget)
+
+    Returns
+    -------
+    kappa : np.ndarray
+        Fleiss' kappa of each category, or NaN if it is undefined
+    """
+
+    # Determine the number of classifications that include each item
+    nraters=getNumberOfRaters(combined)
+
+    # Accumulate the agreement of the items along with the overall proportion of positive ratings
+    chunkSize=getChunkSize(8*combined.ncategories, chunkSize)
+    sumAgreement=np.zeros((combined.ncategories,), dtype=np.float64)
+    sumPositive=np.zeros((combined.ncategories,), dtype=np.float64)
+    sumRatings=0.0
+    nratedItems=0
+    for start in range(0, combined.nitems, chunkSize):
+        end=min(start+chunkSize, combined.nitems)
+        n=nraters[start:end].astype(np.float64)
+        isRated=(n>=2)
+        n=n[isRated,np.newaxis]
+        positive=np.minimum(combined.counts.getRows(start, end)[isRated], n)
+        sumAgreement+=np.sum((positive**2+(n-positive)**2-n)/(n*(n-1)), axis=0)
+        sumPositive+=np.sum(positive, axis=0)
+        sumRatings=sumRatings+float(np.sum(n))
+        nratedItems=nratedItems+int(np.count_nonzero(isRated))
+
+    # Compare the observed agreement with the agreement expected by chance
+    with np.errstate(divide='ignore', invalid='ignore'):
+        observedAgreement=sumAgreement/nratedItems
+        positiveProportion=sumPositive/sumRatings
+        expectedAgreement=positiveProportion**2+(1-positiveProportion)**2
+        kappa=(observedAgreement-expectedAgreement)/(1-expectedAgreement)
+
+    # Return
+    return kappa
+
+#*****************#
+# Get Cohen kappa #
+#*****************#
+
+def getCohenKappa(combined: combinedClassification, chunkSize: Optional[int] = None) -> np.ndarray:
+    """
+    Returns Cohen's kappa of each category for each pair of combined classifications, over the items included in both
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    chunkSize : int, optional
+        The number of items processed at once (default is None, for as many as fit in the memory budget)
+
+    Returns
+    -------
+    kappa : np.ndarray
+        Cohen's kappa with shape (ncategories, nclassifications, nclassifications), or NaN if it is undefined
+    """
+
+    # Get metadata
+    nclassifications=len(combined.sources)
+
+    # Accumulate the contingency of each pair of classifications through matrix products of the vote tensors
+    ncommonItems=np.zeros((nclassifications, nclassifications), dtype=np.float64)
+    nbothPositive=np.zeros((combined.ncategories, nclassifications, nclassifications), dtype=np.float64)
+    npositive=np.zeros((combined.ncategories, nclassifications, nclassifications), dtype=np.float64)
+    for start, end, rated, votes in iterateVoteTensors(combined, chunkSize=chunkSize):
+        rated=rated.astype(np.float32)
+        votes=votes.transpose((2, 0, 1)).astype(np.float32)
+        ncommonItems+=rated@rated.T
+        nbothPositive+=votes@votes.transpose((0, 2, 1))
+        npositive+=votes@rated.T
+
+    # Compare the observed agreement with the agreement expected by chance
+    npositiveFirst=npositive
+    npositiveSecond=npositive.transpose((0, 2, 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        observedAgreement=(2*nbothPositive+ncommonItems-npositiveFirst-npositiveSecond)/ncommonItems
+        expectedAgreement=(npositiveFirst*npositiveSecond+(ncommonItems-npositiveFirst)*(ncommonItems-npositiveSecond))/ncommonItems**2
+        kappa=(observedAgreement-expectedAgreement)/(1-expectedAgreement)
+
+    # Return
+    return kappa
\ No newline at end of file
@@ -0,0 +1,237 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from typing import Optional
+
+import os
+import json
+import shutil
+import hashlib
+
+# Local #
+
+from .classification import readCategoriesFile
+from .mapped import mappedCombinedClassification, combineClassificationFiles
+from ..fileio import readJSONFile, writeJSONFile, computeFileHash
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['readCombinedClassification', 'clearCombinationCache']
+
+#############
+# Constants #
+#############
+
+# Version of the layout of the combination caches
+combinationCacheVersion=1
+
+# Default directory of the combination cache
+defaultCombinationCacheDir=os.environ.get('GALCLASS_COMBINATION_CACHE', os.path.join("~", ".cache", "galclass", "combinations"))
+
+#############
+# Functions #
+#############
+
+#*****************#
+# Get file hashes #
+#*****************#
+
+def getFileHashes(files: list, cacheDir: str, rehash: bool = False) -> list:
+    """
+    Returns the hashes of the contents of the specified files, reusing the hashes recorded in the cache directory for the files the size and modification time of which are unchanged
+
+    Parameters
+    ----------
+    files : list
+        The paths to the files
+    cacheDir : str
+        The path to the cache directory
+    rehash : bool, optional
+        Should the contents of every file be hashed again? (default is False)
+    """
+
+    # Read the recorded hashes
+    hashesFile=os.path.join(cacheDir, "hashes.json")
+    try:
+        recordedHashes=readJSONFile(hashesFile, quiet=True)
+    except (OSError, ValueError):
+        recordedHashes={}
+
+    # Hash the files that have changed since their hashes were recorded
+    hashes=[]
+    isChanged=False
+    for file in files:
+        path=os.path.abspath(os.path.expanduser(file))
+        fileStat=os.stat(path)
+        record=recordedHashes.get(path)
+        if(rehash or (record is None) or (record.get('size')!=fileStat.st_size) or (record.get('mtime')!=fileStat.st_mtime_ns)):
+            record={'size': fileStat.st_size, 'mtime': fileStat.st_mtime_ns, 'hash': computeFileHash(path)}
+            recordedHashes[path]=record
+            isChanged=True
+        hashes.append(record['hash'])
+
+    # Record the new hashes
+    if(isChanged):
+        try:
+            writeJSONFile(hashesFile, recordedHashes, indent=None, atomic=True, quiet=True)
+        except OSError:
+            pass
+
+    # Return
+    return hashes
+
+#***************************#
+# Get combination cache key #
+#***************************#
+
+def getCombinationCacheKey(files: list, categoriesFile: str, cacheDir: str, rehash: bool = False) -> dict:
+    """
+    Returns the key that identifies the combination of the contents of the specified classification files with the categories of the specified categories file
+
+    Parameters
+    ----------
+    files : list
+        The paths to the classification files
+    categoriesFile : str
+        The path to the categories file
+    cacheDir : str
+        The path to the cache directory
+    rehash : bool, optional
+        Should the contents of every file be hashed again? (default is False)
+
+    Returns
+    -------
+    key : dict
+        The version of the layout of the cache, the hashes of the categories file and of the classification files, in order, the paths to the files, and the digest of the hashes, which names the entry of the combination in the cache
+    """
+
+    # Hash the files
+    categoriesHash, *classificationHashes=getFileHashes([categoriesFile,]+list(files), cacheDir, rehash=rehash)
+
+    # Digest the hashes, so that the same contents give the same entry wherever the files are
+    digest=hashlib.blake2b(json.dumps([combinationCacheVersion, categoriesHash, classificationHashes]).encode('utf-8'), digest_size=20).hexdigest()
+
+    # Return
+    return {'version': combinationCacheVersion, 'categoriesHash': categoriesHash, 'classificationHashes': classificationHashes, 'paths': [os.path.abspath(os.path.expanduser(file)) for file in [categoriesFile,]+list(files)], 'digest': digest}
+
+#****************************#
+# Read combination cache key #
+#****************************#
+
+def readCombinationCacheKey(entryDir: str) -> Optional[dict]:
+    """
+    Reads the key of an entry of the combination cache, or returns None if the entry is missing or incomplete
+
+    Parameters
+    ----------
+    entryDir : str
+        The path to the directory of the entry
+    """
+
+    # Read the key, which is written last
+    try:
+        file=open(os.path.join(entryDir, "key.json"), mode='r')
+        key=json.load(file)
+        file.close()
+    except (OSError, ValueError):
+        return None
+
+    # Return
+    return key
+
+#******************************#
+# Read combined classification #
+#******************************#
+
+def readCombinedClassification(files: list, categoriesFile: str, cacheDir: Optional[str] = None, rehash: bool = False, quiet: bool = False) -> mappedCombinedClassification:
+    """
+    Reads and combines classification files through a persistent cache keyed on the contents of the files, so that they are only parsed and combined again when any of them has changed
+
+    Parameters
+    ----------
+    files : list
+        The paths to the classification files, the order of which is part of the key
+    categoriesFile : str
+        The path to the categories file
+    cacheDir : str, optional
+        The path to the cache directory (default is None, for the GALCLASS_COMBINATION_CACHE environment variable or ~/.cache/galclass/combinations)
+    rehash : bool, optional
+        Should the contents of every file be hashed again, rather than trusting the recorded hashes of the files the size and modification time of which are unchanged? (default is False)
+    quiet : bool, optional
+        Should the console output be suppressed? (default is False)
+
+    Returns
+    -------
+    combined : mappedCombinedClassification
+        The combined classification, memory-mapped read-only from the cache
+    """
+
+    # Evaluate arguments
+    cacheDir=os.path.expanduser(cacheDir if cacheDir is not None else defaultCombinationCacheDir)
+    os.makedirs(cacheDir, exist_ok=True)
+
+    # Determine the key of the combination
+    key=getCombinationCacheKey(files, categoriesFile, cacheDir, rehash=rehash)
+    entryDir=os.path.join(cacheDir, key['digest'])
+
+    # Combine the files into a temporary entry unless the combination is cached
+    if(readCombinationCacheKey(entryDir) is None):
+        temporaryDir=entryDir+f".{os.getpid()}.tmp"
+        shutil.rmtree(temporaryDir, ignore_errors=True)
+        combined=combineClassificationFiles(files, readCategoriesFile(categoriesFile, quiet=quiet), temporaryDir, quiet=quiet)
+
+        # Count the items at every threshold up front, as the entry is opened read-only
+        combined.getThresholdTable()
+        del combined
+
+        # Write the key last, marking the entry as complete
+        file=open(os.path.join(temporaryDir, "key.json"), mode='w')
+        json.dump(key, file)
+        file.close()
+
+        # Move the entry into place, unless another process has just done so, replacing any incomplete entry
+        if(os.path.exists(entryDir) and (readCombinationCacheKey(entryDir) is None)):
+            shutil.rmtree(entryDir, ignore_errors=True)
+        try:
+            os.rename(temporaryDir, entryDir)
+        except OSError:
+            shutil.rmtree(temporaryDir, ignore_errors=True)
+
+        # Discard the entries of earlier contents of the same files, which can no longer be hit unless the files are restored
+        for name in os.listdir(cacheDir):
+            otherEntryDir=os.path.join(cacheDir, name)
+            if((name!=key['digest'])and os.path.isdir(otherEntryDir)):
+                otherKey=readCombinationCacheKey(otherEntryDir)
+                if((otherKey is not None)and(otherKey.get('paths')==key['paths'])):
+                    shutil.rmtree(otherEntryDir, ignore_errors=True)
+
+    # Return
+    return mappedCombinedClassification(entryDir, mode="r")
+
+#*************************#
+# Clear combination cache #
+#*************************#
+
+def clearCombinationCache(cacheDir: Optional[str] = None) -> None:
+    """
+    Deletes all entries of the combination cache along with the recorded hashes of the files
+
+    Parameters
+    ----------
+    cacheDir : str, optional
+        The path to the cache directory (default is None, for the GALCLASS_COMBINATION_CACHE environment variable or ~/.cache/galclass/combinations)
+    """
+
+    # Delete the cache directory
+    shutil.rmtree(os.path.expanduser(cacheDir if cacheDir is not None else defaultCombinationCacheDir), ignore_errors=True)
+
+    # Return
+    return
\ No newline at end of file
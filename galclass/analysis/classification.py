@@ -6,15 +6,22 @@
 
 from __future__ import annotations
 
-from _collections_abc import Iterable
+from collections.abc import Iterable
+from itertools import chain, repeat
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import numpy as np
 
 # Local #
 
-from ..fileio import readJSONFile
+from .countmatrix import denseCountMatrix, sparseCountMatrix, thresholdIndex, buildCountMatrix
+from ..fileio import readJSONFile, readGalaxiesFile
+
+if(TYPE_CHECKING):
+    from .hierarchy import categoryHierarchy
 
 ###########
 # Classes #
@@ -35,16 +42,75 @@ class classification():
         """
 
         # Evaluate arguments
-        self.items=items
-        self.itemCategories=itemCategories
-        self.itemComments=itemComments
-        self.categories=categories
+        self.items=list(items)
+        self.itemComments=list(itemComments)
+        self.categories=list(categories)
 
         # Get metadata
-        self.nitems=len(items)
+        self.nitems=len(self.items)
+        self.ncategories=len(self.categories)
+
+        # Map the categories to their IDs, the first occurrence of each taking precedence, and the items on first lookup
+        self.itemIDs=None
+        self.categoryIDs=buildIndexMap(self.categories)
+
+        # Count the modifications, so that results derived from the classification can tell when they are out of date
+        self.modificationCount=0
+
+        # Encode the categories of the items as (item, category) pairs, adding any categories of the items that are not listed
+        itemIndices, categoryIndices=self.__encodeItemCategories(itemCategories, np.arange(self.nitems, dtype=np.int64))
+
+        # Pack the categories of the items into a bit matrix, with one bit per category in words of 64 bits
+        self.categoryBits=packCategories(itemIndices, categoryIndices, self.nitems, self.ncategories)
 
         # Return
         return
+
+    @classmethod
+    def fromArrays(cls, items: Iterable, categoryBits: np.ndarray, itemComments: Iterable, categories: Iterable) -> classification:
+        """
+        Builds a classification from the bit matrix of the categories of its items, without decoding it
+
+        Parameters
+        ----------
+        items : Iterable
+            The items of the classification
+        categoryBits : np.ndarray
+            The bit matrix of the categories of the items, with one bit per category in words of 64 bits
+        itemComments : Iterable
+            The comments on the items
+        categories : Iterable
+            The categories of the classification, in the order of their bits
+        """
+
+        # Initialize the classification without any items
+        newClassification=cls([], [], [], categories)
+
+        # Set the items along with their categories and comments
+        newClassification.items=list(items)
+        newClassification.itemComments=list(itemComments)
+        newClassification.categoryBits=categoryBits
+        newClassification.nitems=len(newClassification.items)
+
+        # Return
+        return newClassification
+
+    def __encodeItemCategories(self, itemCategories: Iterable, itemIDs: np.ndarray) -> tuple:
+        # Determine the number of categories of each item
+        itemCategories=list(itemCategories)
+        ncategoriesOf=np.fromiter(map(len, itemCategories), dtype=np.int64, count=len(itemCategories))
+
+        # Encode the pairs
+        flatCategories=list(chain.from_iterable(itemCategories))
+        itemIndices=np.repeat(itemIDs, ncategoriesOf)
+        categoryIndices=np.fromiter(map(self.categoryIDs.get, flatCategories, repeat(-1)), dtype=np.int64, count=len(flatCategories))
+
+        # Add the categories that are not part of the classification yet
+        for iflatCategory in np.flatnonzero(categoryIndices<0).tolist():
+            categoryIndices[iflatCategory]=self.addCategory(flatCategories[iflatCategory])
+
+        # Return
+        return itemIndices, categoryIndices
     
     def __getItemID(self, item: str):
         """
@@ -57,11 +123,7 @@ class classification():
         """
 
         # Determine the item id of the specified item
-        itemID=-1
-        for iitem in range(self.nitems):
-            if(self.items[iitem]==item):
-                itemID=iitem
-                break
+        itemID=self.getItemIDs().get(item, -1)
         
         # Make sure that the item has beeen found
         assert (itemID!=-1), "the specified item is not part of this classification"
@@ -80,17 +142,128 @@ class classification():
         """
 
         # Determine the item id of the specified category
-        categoryID=-1
-        for icategory in range(self.ncategories):
-            if(self.categories[icategory]==category):
-                categoryID=icategory
-                break
+        categoryID=self.categoryIDs.get(category, -1)
         
         # Make sure that the category has beeen found
         assert (categoryID!=-1), "the specified category is not part of this combined classification"
         
         # Return
         return categoryID
+
+    def getItemIDs(self) -> dict:
+        """
+        Returns the dictionary that maps each item to its ID, the first occurrence of each item taking precedence
+        """
+
+        # Map the items to their IDs on first use
+        if(self.itemIDs is None):
+            self.itemIDs=buildIndexMap(self.items)
+
+        # Return
+        return self.itemIDs
+
+    @property
+    def itemCategories(self) -> list:
+        """
+        The categories of each item, decoded from the bit matrix
+        """
+
+        # Decode the categories of all items
+        itemIndices, categoryIndices=self.encode()
+        boundaries=np.searchsorted(itemIndices, np.arange(self.nitems+1, dtype=np.int64)).tolist()
+        categoryNames=[self.categories[icategory] for icategory in categoryIndices.tolist()]
+
+        # Return
+        return [categoryNames[boundaries[iitem]:boundaries[iitem+1]] for iitem in range(self.nitems)]
+
+    def addCategory(self, category: str) -> int:
+        """
+        Adds the specified category, if it is not already present, and returns its ID
+
+        Parameters
+        ----------
+        category : str
+            The category to be added
+        """
+
+        # Check whether the category is already present
+        if(category in self.categoryIDs):
+            return self.categoryIDs[category]
+
+        # Add the category
+        self.categoryIDs[category]=self.ncategories
+        self.categories.append(category)
+        self.ncategories=self.ncategories+1
+        self.modificationCount=self.modificationCount+1
+
+        # Add a word to the bit matrix if the category does not fit in the current words
+        if(hasattr(self, 'categoryBits')and(self.ncategories>64*self.categoryBits.shape[1])):
+            self.categoryBits=np.concatenate((self.categoryBits, np.zeros((self.nitems, 1), dtype=np.uint64)), axis=1)
+
+        # Return
+        return self.ncategories-1
+
+    def addItem(self, item: str, categories: Iterable = (), comments: str = "") -> int:
+        """
+        Adds the specified item, along with its categories and comments, and returns its ID
+
+        Parameters
+        ----------
+        item : str
+            The item to be added
+        categories : Iterable, optional
+            The categories of the item (default is no categories)
+        comments : str, optional
+            The comments on the item (default is "")
+        """
+
+        # Add the item, which only becomes the target of lookups if it is not already present
+        self.getItemIDs().setdefault(item, self.nitems)
+        self.items.append(item)
+        self.itemComments.append(comments)
+        self.nitems=self.nitems+1
+        self.modificationCount=self.modificationCount+1
+
+        # Set the bits of the categories of the item
+        itemIndices, categoryIndices=self.__encodeItemCategories([categories,], np.array([0,], dtype=np.int64))
+        self.categoryBits=np.concatenate((self.categoryBits, packCategories(itemIndices, categoryIndices, 1, self.ncategories, nwords=self.categoryBits.shape[1])), axis=0)
+
+        # Return
+        return self.nitems-1
+
+    def encode(self) -> tuple:
+        """
+        Encodes the categories of the items as integer arrays of (item, category) pairs, sorted by item and category
+
+        Returns
+        -------
+        itemIndices : np.ndarray
+            The index of the item of each pair in the items of this classification
+        categoryIndices : np.ndarray
+            The ID of the category of each pair
+        """
+
+        # Return
+        return unpackCategories(self.categoryBits, self.ncategories)
+
+    def getMembershipOf(self, category: str) -> np.ndarray:
+        """
+        Returns whether each item is in the specified category
+
+        Parameters
+        ----------
+        category : str
+            The category the membership of which to return
+        """
+
+        # Evaluate arguments
+        assert (category in self.categoryIDs), "the requested category is not present"
+
+        # Determine the word and bit of the category
+        icategory=self.categoryIDs[category]
+
+        # Return
+        return ((self.categoryBits[:,icategory//64]>>np.uint64(icategory%64))&np.uint64(1)).astype(bool)
     
     def getCategoriesOf(self, item: str) -> list:
         """
@@ -102,8 +275,12 @@ class classification():
             The item the categories of which to return
         """
 
+        # Decode the categories of the item
+        itemID=self.__getItemID(item)
+        itemIndices, categoryIndices=unpackCategories(self.categoryBits[itemID:itemID+1], self.ncategories)
+
         # Return
-        return self.itemCategories[self.__getItemID(item)]
+        return [self.categories[icategory] for icategory in categoryIndices.tolist()]
     
     def getCommentsOn(self, item: str) -> list:
         """
@@ -128,17 +305,8 @@ class classification():
             The category the number of items in which to determine
         """
 
-        # Evaluate arguments
-        assert (category in self.categories), "the requested category is not present"
-
-        # Determine the number of items in this category
-        nitemsInCategory=0
-        for iitem in range(self.nitems):
-            if(category in self.itemCategories[iitem]):
-                nitemsInCategory=nitemsInCategory+1
-
         # Return
-        return nitemsInCategory
+        return int(np.count_nonzero(self.getMembershipOf(category)))
 
     def getFractionOf(self, category: str) -> float:
         """
@@ -163,18 +331,69 @@ class classification():
             The category the items in which to return
         """
 
-        # Evaluate arguments
-        assert (category in self.categories), "the requested category is not present"
-
-        # Determine the number of items in this category
-        itemsInCategory=[]
-        for iitem in range(self.nitems):
-            if(category in self.itemCategories[iitem]):
-                itemsInCategory.append(itemsInCategory)
+        # Determine the items in this category
+        itemsInCategory=[self.items[iitem] for iitem in np.flatnonzero(self.getMembershipOf(category)).tolist()]
 
         # Return
         return itemsInCategory
 
+    def rollUp(self, hierarchy: categoryHierarchy) -> classification:
+        """
+        Returns a copy of the classification in which every item is also in all ancestors of its categories, adding any ancestors that are not listed
+
+        Parameters
+        ----------
+        hierarchy : categoryHierarchy
+            The category hierarchy
+        """
+
+        # Add the ancestors of the categories that are not part of the classification
+        ancestorMatrix=hierarchy.getAncestorMatrix()
+        hierarchyIDs=hierarchy.mapCategories(self.categories)
+        isAncestor=np.any(ancestorMatrix[hierarchyIDs[hierarchyIDs>=0]], axis=0)
+        categories=self.categories+[category for category in dict.fromkeys(hierarchy.categories[icategory] for icategory in np.flatnonzero(isAncestor).tolist()) if(category not in self.categoryIDs)]
+
+        # Pack the ancestors of each category
+        ancestors=hierarchy.alignMatrix(ancestorMatrix, categories)
+        nwords=max((len(categories)+63)//64, 1)
+        ancestorBits=packCategories(*np.nonzero(ancestors), len(categories), len(categories), nwords=nwords)
+
+        # Set the bits of the ancestors of each category for all items in it at once
+        categoryBits=np.zeros((self.nitems, nwords), dtype=np.uint64)
+        categoryBits[:,:self.categoryBits.shape[1]]=self.categoryBits
+        for icategory in np.flatnonzero(np.any(ancestors[:self.ncategories], axis=1)).tolist():
+            categoryBits[((self.categoryBits[:,icategory//64]>>np.uint64(icategory%64))&np.uint64(1)).astype(bool)]|=ancestorBits[icategory]
+
+        # Return
+        return classification.fromArrays(self.items, categoryBits, self.itemComments, categories)
+
+    def getExclusionViolations(self, hierarchy: categoryHierarchy) -> np.ndarray:
+        """
+        Flags the items that are in categories mutually exclusive with any of their other categories, according to the isNot of the hierarchy
+
+        Parameters
+        ----------
+        hierarchy : categoryHierarchy
+            The category hierarchy
+
+        Returns
+        -------
+        violations : np.ndarray
+            Whether each item is in each category while also being in a category mutually exclusive with it, with one row per item and one column per category
+        """
+
+        # Pack the categories mutually exclusive with each category
+        exclusions=hierarchy.alignMatrix(hierarchy.getExclusionMatrix(symmetric=True), self.categories)
+        exclusionBits=packCategories(*np.nonzero(exclusions), self.ncategories, self.ncategories, nwords=self.categoryBits.shape[1])
+
+        # Flag the members of each category that are also in any of the categories mutually exclusive with it
+        violations=np.zeros((self.nitems, self.ncategories), dtype=bool)
+        for icategory in np.flatnonzero(np.any(exclusions, axis=1)).tolist():
+            violations[:,icategory]=((self.categoryBits[:,icategory//64]>>np.uint64(icategory%64))&np.uint64(1)).astype(bool)&np.any(self.categoryBits&exclusionBits[icategory], axis=1)
+
+        # Return
+        return violations
+
 #*************************#
 # Combined classification #
 #*************************#
@@ -184,9 +403,19 @@ class combinedClassification(classification):
     A class for the combination of classifications
     """
 
-    def __init__(self, classifications: Iterable) -> None:
+    # Class attributes
+    densityThreshold=0.1
+
+    def __init__(self, classifications: Iterable, backend: str = "auto") -> None:
         """
         Constructor
+
+        Parameters
+        ----------
+        classifications : Iterable
+            The classifications to be combined
+        backend : str, optional
+            The storage of the count matrix, either "dense", "sparse" or "auto" to choose from its density (default is "auto")
         """
 
         # Get metadata
@@ -198,10 +427,12 @@ class combinedClassification(classification):
         # Combine the available categories
 
         # Get metadata
-        self.categories=classifications[0].categories
+        self.categories=list(classifications[0].categories)
+        self.categoryIDs=buildIndexMap(self.categories)
         for iclassification in range(1, self.nclassifications):
             for category in classifications[iclassification].categories:
-                if(category not in self.categories):
+                if(category not in self.categoryIDs):
+                    self.categoryIDs[category]=len(self.categories)
                     self.categories.append(category)
         
         # Get metadata
@@ -212,12 +443,9 @@ class combinedClassification(classification):
 
         # Combine the available items
 
-        # Determine the items of the combined classification
-        self.items=classifications[0].items
-        for iclassification in range(1, self.nclassifications):
-            for item in classifications[iclassification].items:
-                if(item not in self.items):
-                    self.items.append(item)
+        # Determine the items of the combined classification, along with the IDs of the items of each classification
+        self.items, classificationItemIDs=mergeItems([classification.items for classification in classifications])
+        self.itemIDs=None
         
         # Get metadata
         self.nitems=len(self.items)
@@ -227,26 +455,247 @@ class combinedClassification(classification):
 
         # Combine the classifications
 
-        # Initialize the comments on each item
-        self.comments=[[] for iitem in range(self.nitems)]
-
-        # Initialize the times an items falls in each category
-        self.ntimesInCategory=np.zeros((self.nitems, self.ncategories), dtype=int)
+        # Keep each classification along with the IDs of its items, so that its comments can be gathered per item on demand and its counts retracted
+        self.sources=[{'classification': classification, 'nitems': classification.nitems, 'itemIDs': itemIDs, 'comments': classification.itemComments} for classification, itemIDs in zip(classifications, classificationItemIDs)]
 
-        # Determine the comments and number of times each item falls in each category
-        for classification in classifications:
-            for iitem in range(classification.nitems):
-                ilocalItem=self._classification__getItemID(classification.items[iitem])
-                itemCategories=classification.itemCategories[iitem]
-                for itemCategory in itemCategories:
-                    ilocalCategory=self._classification__getCategoryID(itemCategory)
-                    self.ntimesInCategory[ilocalItem, ilocalCategory]=self.ntimesInCategory[ilocalItem, ilocalCategory]+1
-                itemComments=classification.itemComments[iitem]
-                self.comments[ilocalItem].append(itemComments)
+        # Determine the number of times each item falls in each category
+        self.counts=self.buildCounts(backend=backend)
+        self.thresholdIndex=None
+        self.modificationCount=0
 
         # Return
         return
+
+    def buildCounts(self, backend: str = "auto") -> Union[denseCountMatrix, sparseCountMatrix]:
+        """
+        Builds the count matrix from the classifications, scattering the (item, category) pairs of all classifications at once
+
+        Parameters
+        ----------
+        backend : str, optional
+            The storage of the count matrix, either "dense", "sparse" or "auto" to choose from its density (default is "auto")
+        """
+
+        # Map the (item, category) pairs of each classification to the combined items and categories
+        allItemIndices=[]
+        allCategoryIndices=[]
+        for source in self.sources:
+            itemIndices, categoryIndices=source['classification'].encode()
+            categoryIDs=np.array([self.categoryIDs[category] for category in source['classification'].categories], dtype=np.int64)
+            allItemIndices.append(source['itemIDs'][itemIndices])
+            allCategoryIndices.append(categoryIDs[categoryIndices])
+
+        # Return
+        return buildCountMatrix(np.concatenate(allItemIndices), np.concatenate(allCategoryIndices), self.nitems, self.ncategories, backend=backend, densityThreshold=self.densityThreshold)
+
+    @property
+    def ntimesInCategory(self) -> np.ndarray:
+        """
+        The number of times each item falls in each category, as a dense array
+        """
+
+        # Return
+        return self.counts.toarray()
+
+    @property
+    def comments(self) -> list:
+        """
+        The comments on each item, in the order of the classifications
+        """
+
+        # Gather the comments of all classifications
+        comments=[[] for iitem in range(self.nitems)]
+        for source in self.sources:
+            for itemID, itemComments in zip(source['itemIDs'].tolist(), source['comments']):
+                comments[itemID].append(itemComments)
+
+        # Return
+        return comments
+
+    def addCategory(self, category: str) -> int:
+        """
+        Adds the specified category, if it is not already present, and returns its ID
+
+        Parameters
+        ----------
+        category : str
+            The category to be added
+        """
+
+        # Check whether the category is already present
+        if(category in self.categoryIDs):
+            return self.categoryIDs[category]
+
+        # Add the category, with no items in it
+        self.categoryIDs[category]=self.ncategories
+        self.categories.append(category)
+        self.ncategories=self.ncategories+1
+        self.counts.addColumns(1)
+        self.thresholdIndex=None
+        self.modificationCount=self.modificationCount+1
+
+        # Return
+        return self.ncategories-1
+
+    def addItem(self, item: str) -> int:
+        """
+        Adds the specified item, if it is not already present, and returns its ID
+
+        Parameters
+        ----------
+        item : str
+            The item to be added
+        """
+
+        # Check whether the item is already present
+        itemIDs=self.getItemIDs()
+        if(item in itemIDs):
+            return itemIDs[item]
+
+        # Add the item, in no categories and with no comments
+        itemIDs[item]=self.nitems
+        self.items.append(item)
+        self.nitems=self.nitems+1
+        self.counts.addRows(1)
+        self.thresholdIndex=None
+        self.modificationCount=self.modificationCount+1
+
+        # Return
+        return self.nitems-1
     
+    def addClassification(self, classification: classification) -> None:
+        """
+        Folds the specified classification into the combined classification, adding any new items and categories
+
+        Parameters
+        ----------
+        classification : classification
+            The classification to be added
+        """
+
+        # Add the new categories
+        categoryIDs=np.array([self.addCategory(category) for category in classification.categories], dtype=np.int64)
+
+        # Determine the IDs of the items of the classification, adding the new items at once
+        combinedItemIDs=self.getItemIDs()
+        itemIDs=np.fromiter(map(combinedItemIDs.get, classification.items, repeat(-1)), dtype=np.int64, count=classification.nitems)
+        nnewItems=0
+        for iitem in np.flatnonzero(itemIDs<0).tolist():
+            item=classification.items[iitem]
+            if(item not in combinedItemIDs):
+                combinedItemIDs[item]=self.nitems+nnewItems
+                self.items.append(item)
+                nnewItems=nnewItems+1
+            itemIDs[iitem]=combinedItemIDs[item]
+        if(nnewItems>0):
+            self.nitems=self.nitems+nnewItems
+            self.counts.addRows(nnewItems)
+
+        # Add the (item, category) pairs of the classification
+        itemIndices, categoryIndices=classification.encode()
+        self.counts.addPairs(itemIDs[itemIndices], categoryIDs[categoryIndices], weight=1)
+        self.thresholdIndex=None
+        self.modificationCount=self.modificationCount+1
+
+        # Keep the classification along with the IDs of its items
+        self.sources.append({'classification': classification, 'nitems': classification.nitems, 'itemIDs': itemIDs, 'comments': classification.itemComments})
+        self.nclassifications=self.nclassifications+1
+
+        # Return
+        return
+
+    def removeClassification(self, classification: Union[classification, int]) -> None:
+        """
+        Retracts the counts and comments of the specified classification, keeping its items and categories
+
+        Parameters
+        ----------
+        classification : classification or int
+            The classification to be removed, or its index among the combined classifications
+        """
+
+        # Determine the index of the classification
+        if(isinstance(classification, (int, np.integer))):
+            isource=int(classification)
+        else:
+            isource=-1
+            for jsource in range(len(self.sources)):
+                if(self.sources[jsource]['classification'] is classification):
+                    isource=jsource
+                    break
+        
+        # Make sure that the classification has been found
+        assert (0<=isource<len(self.sources)), "the specified classification is not part of this combined classification"
+
+        # Retract the (item, category) pairs the classification had when it was added
+        source=self.sources.pop(isource)
+        itemIndices, categoryIndices=source['classification'].encode()
+        categoryIDs=np.array([self.categoryIDs.get(category, -1) for category in source['classification'].categories], dtype=np.int64)
+        itemIndices, categoryIndices=itemIndices[itemIndices<source['nitems']], categoryIndices[itemIndices<source['nitems']]
+        self.counts.addPairs(source['itemIDs'][itemIndices], categoryIDs[categoryIndices], weight=-1)
+        self.thresholdIndex=None
+        self.modificationCount=self.modificationCount+1
+        self.nclassifications=self.nclassifications-1
+
+        # Return
+        return
+
+    def getThresholdIndex(self) -> thresholdIndex:
+        """
+        Returns the index of the items of each category sorted by their counts, building it on first use after any change of the counts
+        """
+
+        # Build the index if needed
+        if(self.thresholdIndex is None):
+            self.thresholdIndex=thresholdIndex(self.counts)
+
+        # Return
+        return self.thresholdIndex
+
+    def getThresholdTable(self, fractions: bool = False) -> np.ndarray:
+        """
+        Returns the number of items in each category for every threshold, as an array with one row per category and one column per threshold from 0 to the maximum count
+
+        Parameters
+        ----------
+        fractions : bool, optional
+            Should the fractions of items be returned rather than their numbers? (default is False)
+        """
+
+        # Get the table of the index
+        table=self.getThresholdIndex().table
+
+        # Return
+        return (table/self.nitems if fractions else table.copy())
+
+    def encode(self, threshold: int = 1) -> tuple:
+        """
+        Encodes the categories the items have fallen within at least the specified number of times as integer arrays of (item, category) pairs, sorted by item and category
+
+        Parameters
+        ----------
+        threshold : int, optional
+            The number of times an item must have fallen within a category in order for the pair to be returned (default is 1)
+        """
+
+        # Return
+        return self.counts.getPairs(threshold=threshold)
+
+    def getMembershipOf(self, category: str, threshold: int = 1) -> np.ndarray:
+        """
+        Returns whether each item has fallen within the specified category at least the specified number of times
+
+        Parameters
+        ----------
+        category : str
+            The category the membership of which to return
+        threshold : int, optional
+            The number of times an item must have fallen within the category (default is 1)
+        """
+
+        # Return
+        return (self.counts.getColumn(self._classification__getCategoryID(category))>=threshold)
+
     def getCategoriesOf(self, item: str, threshold: int = 1) -> list:
         """
         Return the categories of the specified item
@@ -260,11 +709,8 @@ class combinedClassification(classification):
         """
 
         # Determine the categories to be returned
-        shouldReturnCategory=(self.ntimesInCategory[self._classification__getItemID(item),:]>=threshold)
-        categoriesToReturn=[]
-        for icategory in range(self.ncategories):
-            if(shouldReturnCategory[icategory]):
-                categoriesToReturn.append(self.categories[icategory])
+        shouldReturnCategory=(self.counts.getRow(self._classification__getItemID(item))>=threshold)
+        categoriesToReturn=[self.categories[icategory] for icategory in np.flatnonzero(shouldReturnCategory).tolist()]
 
         # Return
         return categoriesToReturn
@@ -279,8 +725,20 @@ class combinedClassification(classification):
             The item the comments on which to return
         """
 
+        # Determine the item ID of the specified item
+        itemID=self._classification__getItemID(item)
+
+        # Gather the comments of each classification on the item, sorting the item IDs of each classification once
+        comments=[]
+        for source in self.sources:
+            if('order' not in source):
+                source['order']=np.argsort(source['itemIDs'], kind='stable')
+                source['sortedItemIDs']=source['itemIDs'][source['order']]
+            start, end=np.searchsorted(source['sortedItemIDs'], [itemID, itemID+1])
+            comments.extend([source['comments'][iitem] for iitem in source['order'][start:end].tolist()])
+
         # Return
-        return self.comments[self.__getItemID(item)]
+        return comments
     
     def getNumberOf(self, category: str, threshold: int = 1) -> int:
         """
@@ -295,7 +753,7 @@ class combinedClassification(classification):
         """
 
         # Return
-        return int(np.sum(self.ntimesInCategory[:,self._classification__getCategoryID(category)]>=threshold))
+        return self.getThresholdIndex().getNumberOf(self._classification__getCategoryID(category), threshold)
 
     def getFractionOf(self, category: str, threshold: int = 1) -> float:
         """
@@ -325,19 +783,189 @@ class combinedClassification(classification):
         """
 
         # Determine the items to be returned
-        shouldReturnItem=(self.ntimesInCategory[:,self._classification__getCategoryID(category)]>=threshold)
-        itemsToReturn=[]
-        for iitem in range(self.nitems):
-            if(shouldReturnItem[iitem]):
-                itemsToReturn.append(self.items[iitem])
+        itemsToReturn=[self.items[iitem] for iitem in self.getThresholdIndex().getItemIDsIn(self._classification__getCategoryID(category), threshold).tolist()]
 
         # Return
         return itemsToReturn
 
+    def rollUp(self, hierarchy: categoryHierarchy) -> combinedClassification:
+        """
+        Returns the combination of the classifications rolled up to the ancestors of their categories, so that every classification that puts an item in a category also counts towards the ancestors of that category, once
+
+        Parameters
+        ----------
+        hierarchy : categoryHierarchy
+            The category hierarchy
+        """
+
+        # Return
+        return combinedClassification([source['classification'].rollUp(hierarchy) for source in self.sources], backend=("dense" if isinstance(self.counts, denseCountMatrix) else "sparse"))
+
+    def getExclusionViolations(self, hierarchy: categoryHierarchy, threshold: int = 1, chunkSize: int = 65536) -> np.ndarray:
+        """
+        Flags the items that have fallen within categories mutually exclusive with any of their other categories, according to the isNot of the hierarchy
+
+        Parameters
+        ----------
+        hierarchy : categoryHierarchy
+            The category hierarchy
+        threshold : int, optional
+            The number of times an item must have fallen within a category in order to be in it (default is 1)
+        chunkSize : int, optional
+            The number of items processed at once (default is 65536)
+
+        Returns
+        -------
+        violations : np.ndarray
+            Whether each item is in each category while also being in a category mutually exclusive with it, with one row per item and one column per category
+        """
+
+        # Align the mutual exclusions with the categories
+        exclusions=hierarchy.alignMatrix(hierarchy.getExclusionMatrix(symmetric=True), self.categories).astype(np.float32)
+
+        # Flag the members of each category that are also members of any of the categories mutually exclusive with it, one block of items at a time
+        violations=np.zeros((self.nitems, self.ncategories), dtype=bool)
+        for start in range(0, self.nitems, chunkSize):
+            end=min(start+chunkSize, self.nitems)
+            membership=(self.counts.getRows(start, end)>=threshold)
+            violations[start:end]=membership&((membership.astype(np.float32)@exclusions)>0)
+
+        # Return
+        return violations
+
 #############
 # Functions #
 #############
 
+#*****************#
+# Pack categories #
+#*****************#
+
+def packCategories(itemIndices: np.ndarray, categoryIndices: np.ndarray, nitems: int, ncategories: int, nwords: Optional[int] = None) -> np.ndarray:
+    """
+    Packs (item, category) pairs into a bit matrix, with one bit per category in words of 64 bits
+
+    Parameters
+    ----------
+    itemIndices : np.ndarray
+        The index of the item of each pair
+    categoryIndices : np.ndarray
+        The ID of the category of each pair
+    nitems : int
+        The number of items
+    ncategories : int
+        The number of categories
+    nwords : int, optional
+        The number of words per item (default is None, for as many as needed for the categories)
+    """
+
+    # Evaluate arguments
+    if(nwords is None):
+        nwords=max((ncategories+63)//64, 1)
+
+    # Set the bits of the pairs, which may repeat
+    categoryBits=np.zeros((nitems, nwords), dtype=np.uint64)
+    np.bitwise_or.at(categoryBits, (itemIndices, categoryIndices//64), np.left_shift(np.uint64(1), (categoryIndices%64).astype(np.uint64)))
+
+    # Return
+    return categoryBits
+
+#*******************#
+# Unpack categories #
+#*******************#
+
+def unpackCategories(categoryBits: np.ndarray, ncategories: int) -> tuple:
+    """
+    Unpacks a bit matrix into (item, category) pairs, sorted by item and category
+
+    Parameters
+    ----------
+    categoryBits : np.ndarray
+        The bit matrix, with one bit per category in words of 64 bits
+    ncategories : int
+        The number of categories
+    """
+
+    # Expand the bits of each item, the least significant bit of each word first
+    bits=np.unpackbits(np.ascontiguousarray(categoryBits).astype('<u8').view(np.uint8).reshape((categoryBits.shape[0], 8*categoryBits.shape[1])), axis=1, bitorder='little')[:,:ncategories]
+
+    # Return
+    return np.nonzero(bits)
+
+#*************#
+# Merge items #
+#*************#
+
+def mergeItems(itemLists: list) -> tuple:
+    """
+    Merges lists of items into the list of their unique items, in the order of their first occurrence
+
+    Parameters
+    ----------
+    itemLists : list
+        The lists of items to be merged
+
+    Returns
+    -------
+    items : list
+        The unique items
+    itemIDs : list
+        The IDs of the items of each list in the unique items, as integer arrays
+    """
+
+    # Encode each distinct list of items once, as the same items are usually classified by every classifier, recognizing the lists by identity or else by their hashed contents
+    distinctListIDs=[]
+    distinctIDsByIdentity={}
+    distinctIDsByContents={}
+    for itemList in itemLists:
+        idistinctList=distinctIDsByIdentity.get(id(itemList))
+        if(idistinctList is None):
+            idistinctList=distinctIDsByContents.setdefault(tuple(itemList), len(distinctIDsByContents))
+            distinctIDsByIdentity[id(itemList)]=idistinctList
+        distinctListIDs.append(idistinctList)
+    distinctItemLists=list(distinctIDsByContents.keys())
+
+    # Determine the unique items, in the order of their first occurrence
+    if(set(chain.from_iterable(map(type, itemList) for itemList in distinctItemLists))<={str}):
+        # Rank the unique strings through a single sort
+        allItems=np.concatenate([np.asarray(itemList, dtype=str) for itemList in distinctItemLists]+[np.zeros((0,), dtype=str),])
+        uniqueItems, firstIndices, inverseIndices=np.unique(allItems, return_index=True, return_inverse=True)
+        order=np.argsort(firstIndices, kind='stable')
+        ranks=np.empty((len(order),), dtype=np.int64)
+        ranks[order]=np.arange(len(order), dtype=np.int64)
+        allItemIDs=ranks[inverseIndices.reshape(-1)]
+        boundaries=np.cumsum([0,]+[len(itemList) for itemList in distinctItemLists])
+        uniqueItems=uniqueItems[order].tolist()
+        distinctItemIDs=[allItemIDs[boundaries[idistinctList]:boundaries[idistinctList+1]] for idistinctList in range(len(distinctItemLists))]
+    else:
+        # Keep any other items as they are, rather than as their string representations
+        uniqueItems=list(dict.fromkeys(chain.from_iterable(distinctItemLists)))
+        itemIDs=dict(zip(uniqueItems, range(len(uniqueItems))))
+        distinctItemIDs=[np.fromiter(map(itemIDs.__getitem__, itemList), dtype=np.int64, count=len(itemList)) for itemList in distinctItemLists]
+
+    # Return
+    return uniqueItems, [distinctItemIDs[idistinctList] for idistinctList in distinctListIDs]
+
+#*****************#
+# Build index map #
+#*****************#
+
+def buildIndexMap(names: Iterable) -> dict:
+    """
+    Returns a dictionary that maps each name to the index of its first occurrence
+
+    Parameters
+    ----------
+    names : Iterable
+        The names to be mapped
+    """
+
+    # Map the names in reverse order, so that the first occurrences overwrite any later ones
+    names=list(names)
+
+    # Return
+    return {names[iname]: iname for iname in range(len(names)-1, -1, -1)}
+
 #****************#
 # Get categories #
 #****************#
@@ -371,7 +999,7 @@ def getCategories(category: dict, depth: int = 0) -> dict:
 # Read categories file #
 #**********************#
 
-def readCategoriesFile(file: str) -> list:
+def readCategoriesFile(file: str, quiet: bool = False) -> list:
     """
     Reads and parses the categories of a categories JSON file
 
@@ -379,19 +1007,58 @@ def readCategoriesFile(file: str) -> list:
     -----------
     file : str
         The path to the categories file
+    quiet : bool, optional
+        Should the console output be suppressed? (default is False)
     """
 
     # Read the categories file
-    categories=readJSONFile(file)
+    categories=readJSONFile(file, mutable=False, quiet=quiet)
 
     # Return
     return getCategories(categories)
 
+#****************************#
+# Read classification arrays #
+#****************************#
+
+def readClassificationArrays(file: str, categories: list, quiet: bool = False) -> dict:
+    """
+    Reads and parses a classification file into compact arrays, which are cheap to send back from worker processes
+
+    Parameters
+    ----------
+    file : str
+        The path to the classification file
+    categories : list
+        The categories of the classification
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+
+    Returns
+    -------
+    arrays : dict
+        The items as a string array, the categories, the bit matrix of the categories of the items and the comments on the items
+    """
+
+    # Read the classification file
+    fileClassification=readGalaxiesFile(file, mutable=False, quiet=quiet)
+
+    # Parse the data of the classification
+    fileNames=[galaxy['name'] for galaxy in fileClassification['galaxies']]
+    fileCategories=[galaxy['categories'] for galaxy in fileClassification['galaxies']]
+    fileComments=[galaxy['comments'] for galaxy in fileClassification['galaxies']]
+
+    # Encode the categories of the galaxies
+    fileClassification=classification(fileNames, fileCategories, fileComments, categories)
+
+    # Return
+    return {'items': np.asarray(fileNames, dtype=str), 'categories': fileClassification.categories, 'categoryBits': fileClassification.categoryBits, 'comments': fileComments}
+
 #**********************#
 # Read classifications #
 #**********************#
 
-def readClassifications(files: list, categories: list, combine: bool = False) -> Union[list, combinedClassification]:
+def readClassifications(files: list, categories: list, combine: bool = False, nworkers: int = 1, executor: str = "process") -> Union[list, combinedClassification]:
     """
     Reads and parses a list of classification files
 
@@ -403,35 +1070,29 @@ def readClassifications(files: list, categories: list, combine: bool = False) ->
         The categories of the classification
     combine : bool, optional
         Should we combine the classification data? (default is False)
+    nworkers : int, optional
+        The number of workers among which the files are split (default is 1)
+    executor : str, optional
+        The kind of workers, either "process" or "thread" (default is "process")
     """
 
-    # Get metadata
-    nclassifications=len(files)
-
-    # Initialize the classifications list
-    classifications=[]
-
-    for iclassification in range(nclassifications):
+    # Evaluate arguments
+    assert (executor in ["process", "thread"]), "the requested executor is not available"
 
-        # Read the classification file
-        fileClassification=readJSONFile(files[iclassification])
-
-        # Get metadata
-        nfileGalaxies=len(fileClassification['galaxies'])
-
-        # Allocate the required memory
-        fileNames=[]
-        fileCategories=[]
-        fileComments=[]
+    # Read and encode the classification files, concurrently if requested
+    if((nworkers>1)and(len(files)>1)):
+        Executor=(ProcessPoolExecutor if executor=="process" else ThreadPoolExecutor)
+        with Executor(max_workers=min(nworkers, len(files))) as pool:
+            classificationArrays=list(pool.map(partial(readClassificationArrays, categories=list(categories), quiet=True), files))
+    else:
+        classificationArrays=[readClassificationArrays(file, list(categories)) for file in files]
 
-        # Parse the data of the classification
-        for igalaxy in range(nfileGalaxies):
-            fileNames.append(fileClassification['galaxies'][igalaxy]['name'])
-            fileCategories.append(fileClassification['galaxies'][igalaxy]['categories'])
-            fileComments.append(fileClassification['galaxies'][igalaxy]['comments'])
+    # Initialize the classifications from their arrays
+    classifications=[classification.fromArrays(arrays['items'].tolist(), arrays['categoryBits'], arrays['comments'], arrays['categories']) for arrays in classificationArrays]
 
-        # Initialize the classification
-        classifications.append(classification(fileNames, fileCategories, fileComments, categories))
+    # Combine the classifications
+    if(combine):
+        return combinedClassification(classifications)
 
     # Return
     return classifications
\ No newline at end of file
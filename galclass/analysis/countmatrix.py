@@ -0,0 +1,943 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import os
+
+import numpy as np
+
+# Local #
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['denseCountMatrix', 'sparseCountMatrix', 'mappedCountMatrix', 'thresholdIndex', 'scoreIndex', 'buildCountMatrix']
+
+###########
+# Classes #
+###########
+
+#********************#
+# Dense count matrix #
+#********************#
+
+class denseCountMatrix():
+    """
+    A matrix of the number of times each item falls in each category, stored as a dense array
+    """
+
+    def __init__(self, counts: np.ndarray):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.counts=counts
+
+        # Initialize the over-allocated array the counts are a view of once rows or columns are appended
+        self.buffer=None
+
+        # Return
+        return
+
+    @property
+    def shape(self) -> tuple:
+        return self.counts.shape
+
+    @property
+    def nnz(self) -> int:
+        return int(np.count_nonzero(self.counts))
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes
+
+    @staticmethod
+    def fromPairs(itemIndices: np.ndarray, categoryIndices: np.ndarray, nitems: int, ncategories: int) -> denseCountMatrix:
+        """
+        Builds the count matrix from (item, category) pairs, which may repeat
+
+        Parameters
+        ----------
+        itemIndices : np.ndarray
+            The ID of the item of each pair
+        categoryIndices : np.ndarray
+            The ID of the category of each pair
+        nitems : int
+            The number of items
+        ncategories : int
+            The number of categories
+        """
+
+        # Return
+        return denseCountMatrix(np.bincount(np.asarray(itemIndices, dtype=np.int64)*ncategories+categoryIndices, minlength=nitems*ncategories).reshape((nitems, ncategories)))
+
+    def getRow(self, iitem: int) -> np.ndarray:
+        """
+        Returns the number of times the specified item falls in each category
+
+        Parameters
+        ----------
+        iitem : int
+            The ID of the item
+        """
+
+        # Return
+        return self.counts[iitem,:]
+
+    def getColumn(self, icategory: int) -> np.ndarray:
+        """
+        Returns the number of times each item falls in the specified category
+
+        Parameters
+        ----------
+        icategory : int
+            The ID of the category
+        """
+
+        # Return
+        return self.counts[:,icategory]
+
+    def getRows(self, start: int, end: int) -> np.ndarray:
+        """
+        Returns the number of times each item of a range falls in each category
+
+        Parameters
+        ----------
+        start : int
+            The ID of the first item of the range
+        end : int
+            The ID past the last item of the range
+        """
+
+        # Return
+        return self.counts[start:end,:]
+
+    def getPairs(self, threshold: int = 1) -> tuple:
+        """
+        Returns the (item, category) pairs with counts of at least the specified threshold, sorted by item and category
+
+        Parameters
+        ----------
+        threshold : int, optional
+            The minimum count of the returned pairs (default is 1)
+        """
+
+        # Return
+        return np.nonzero(self.counts>=max(threshold, 1))
+
+    def getEntries(self) -> tuple:
+        """
+        Returns the rows, columns and values of the non-zero entries, sorted by row and column
+        """
+
+        # Determine the non-zero entries
+        rows, columns=np.nonzero(self.counts)
+
+        # Return
+        return rows, columns, self.counts[rows, columns]
+
+    def toarray(self) -> np.ndarray:
+        """
+        Returns the count matrix as a dense array, which is shared with this matrix
+        """
+
+        # Return
+        return self.counts
+
+    def addRows(self, nrows: int) -> None:
+        """
+        Appends rows of zeros for new items
+
+        Parameters
+        ----------
+        nrows : int
+            The number of rows to be appended
+        """
+
+        # Append the rows
+        self.__resize(self.counts.shape[0]+nrows, self.counts.shape[1])
+
+        # Return
+        return
+
+    def addColumns(self, ncolumns: int) -> None:
+        """
+        Appends columns of zeros for new categories
+
+        Parameters
+        ----------
+        ncolumns : int
+            The number of columns to be appended
+        """
+
+        # Append the columns
+        self.__resize(self.counts.shape[0], self.counts.shape[1]+ncolumns)
+
+        # Return
+        return
+
+    def __resize(self, nrows: int, ncolumns: int) -> None:
+        # Grow the buffer by half whenever it is outgrown, so that appending rows or columns takes amortized time proportional to their size, and view the counts from it
+        buffer=(self.buffer if self.buffer is not None else self.counts)
+        if((nrows>buffer.shape[0])or(ncolumns>buffer.shape[1])):
+            grownShape=tuple((max(size, capacity+capacity//2) if size>capacity else capacity) for size, capacity in zip((nrows, ncolumns), buffer.shape))
+            buffer=np.zeros(grownShape, dtype=self.counts.dtype)
+            buffer[:self.counts.shape[0],:self.counts.shape[1]]=self.counts
+        self.buffer=buffer
+        self.counts=buffer[:nrows,:ncolumns]
+        return
+
+    def addPairs(self, itemIndices: np.ndarray, categoryIndices: np.ndarray, weight: int = 1) -> None:
+        """
+        Adds the specified weight to the counts of (item, category) pairs, which may repeat
+
+        Parameters
+        ----------
+        itemIndices : np.ndarray
+            The ID of the item of each pair
+        categoryIndices : np.ndarray
+            The ID of the category of each pair
+        weight : int, optional
+            The weight added per pair, e.g. -1 to retract pairs (default is 1)
+        """
+
+        # Scatter-add the weights
+        np.add.at(self.counts, (itemIndices, categoryIndices), weight)
+
+        # Return
+        return
+
+#*********************#
+# Sparse count matrix #
+#*********************#
+
+class sparseCountMatrix():
+    """
+    A matrix of the number of times each item falls in each category, stored in compressed sparse row format with plain NumPy arrays
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, shape: tuple):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.indptr=indptr
+        self.indices=indices
+        self.data=data
+        self.shape=tuple(shape)
+
+        # Initialize the pairs added since the stored entries were last merged with them
+        self.pendingPairs=[]
+
+        # Return
+        return
+
+    @property
+    def nnz(self) -> int:
+        self.mergePending()
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        self.mergePending()
+        return self.indptr.nbytes+self.indices.nbytes+self.data.nbytes
+
+    @staticmethod
+    def fromPairs(itemIndices: np.ndarray, categoryIndices: np.ndarray, nitems: int, ncategories: int) -> sparseCountMatrix:
+        """
+        Builds the count matrix from (item, category) pairs, which may repeat
+
+        Parameters
+        ----------
+        itemIndices : np.ndarray
+            The ID of the item of each pair
+        categoryIndices : np.ndarray
+            The ID of the category of each pair
+        nitems : int
+            The number of items
+        ncategories : int
+            The number of categories
+        """
+
+        # Count the repetitions of each pair, sorted by item and category
+        flatIndices, counts=np.unique(np.asarray(itemIndices, dtype=np.int64)*ncategories+categoryIndices, return_counts=True)
+
+        # Determine the offsets of the rows
+        indptr=np.zeros((nitems+1,), dtype=np.int64)
+        np.cumsum(np.bincount(flatIndices//ncategories, minlength=nitems), out=indptr[1:])
+
+        # Return
+        return sparseCountMatrix(indptr, (flatIndices%ncategories).astype(np.int32), counts.astype(np.int32), (nitems, ncategories))
+
+    def getRowIndices(self) -> np.ndarray:
+        """
+        Returns the row of each stored entry
+        """
+
+        # Merge any pending pairs
+        self.mergePending()
+
+        # Return
+        return np.repeat(np.arange(self.shape[0], dtype=np.int64), np.diff(self.indptr))
+
+    def getRow(self, iitem: int) -> np.ndarray:
+        """
+        Returns the number of times the specified item falls in each category
+
+        Parameters
+        ----------
+        iitem : int
+            The ID of the item
+        """
+
+        # Scatter the stored entries of the row
+        self.mergePending()
+        row=np.zeros((self.shape[1],), dtype=np.int64)
+        row[self.indices[self.indptr[iitem]:self.indptr[iitem+1]]]=self.data[self.indptr[iitem]:self.indptr[iitem+1]]
+
+        # Return
+        return row
+
+    def getRows(self, start: int, end: int) -> np.ndarray:
+        """
+        Returns the number of times each item of a range falls in each category
+
+        Parameters
+        ----------
+        start : int
+            The ID of the first item of the range
+        end : int
+            The ID past the last item of the range
+        """
+
+        # Scatter the stored entries of the rows
+        self.mergePending()
+        rows=np.zeros((end-start, self.shape[1]), dtype=np.int64)
+        rows[np.repeat(np.arange(end-start, dtype=np.int64), np.diff(self.indptr[start:end+1])), self.indices[self.indptr[start]:self.indptr[end]]]=self.data[self.indptr[start]:self.indptr[end]]
+
+        # Return
+        return rows
+
+    def getColumn(self, icategory: int) -> np.ndarray:
+        """
+        Returns the number of times each item falls in the specified category
+
+        Parameters
+        ----------
+        icategory : int
+            The ID of the category
+        """
+
+        # Scatter the stored entries of the column
+        self.mergePending()
+        isInColumn=(self.indices==icategory)
+        column=np.zeros((self.shape[0],), dtype=np.int64)
+        column[self.getRowIndices()[isInColumn]]=self.data[isInColumn]
+
+        # Return
+        return column
+
+    def getPairs(self, threshold: int = 1) -> tuple:
+        """
+        Returns the (item, category) pairs with counts of at least the specified threshold, sorted by item and category
+
+        Parameters
+        ----------
+        threshold : int, optional
+            The minimum count of the returned pairs (default is 1)
+        """
+
+        # Select the stored entries
+        self.mergePending()
+        isSelected=(self.data>=max(threshold, 1))
+
+        # Return
+        return self.getRowIndices()[isSelected], self.indices[isSelected].astype(np.int64)
+
+    def getEntries(self) -> tuple:
+        """
+        Returns the rows, columns and values of the non-zero entries, sorted by row and column
+        """
+
+        # Select the non-zero entries
+        self.mergePending()
+        isNonZero=(self.data!=0)
+
+        # Return
+        return self.getRowIndices()[isNonZero], self.indices[isNonZero].astype(np.int64), self.data[isNonZero].astype(np.int64)
+
+    def toarray(self) -> np.ndarray:
+        """
+        Returns the count matrix as a new dense array
+        """
+
+        # Scatter the stored entries
+        self.mergePending()
+        counts=np.zeros(self.shape, dtype=np.int64)
+        counts[self.getRowIndices(), self.indices]=self.data
+
+        # Return
+        return counts
+
+    def addRows(self, nrows: int) -> None:
+        """
+        Appends empty rows for new items
+
+        Parameters
+        ----------
+        nrows : int
+            The number of rows to be appended
+        """
+
+        # Append the offsets of the empty rows
+        self.indptr=np.concatenate((self.indptr, np.full((nrows,), self.indptr[-1], dtype=self.indptr.dtype)))
+        self.shape=(self.shape[0]+nrows, self.shape[1])
+
+        # Return
+        return
+
+    def addColumns(self, ncolumns: int) -> None:
+        """
+        Appends empty columns for new categories
+
+        Parameters
+        ----------
+        ncolumns : int
+            The number of columns to be appended
+        """
+
+        # Widen the matrix
+        self.shape=(self.shape[0], self.shape[1]+ncolumns)
+
+        # Return
+        return
+
+    def addPairs(self, itemIndices: np.ndarray, categoryIndices: np.ndarray, weight: int = 1) -> None:
+        """
+        Adds the specified weight to the counts of (item, category) pairs, which may repeat, deferring the merge with the stored entries until they are next read
+
+        Parameters
+        ----------
+        itemIndices : np.ndarray
+            The ID of the item of each pair
+        categoryIndices : np.ndarray
+            The ID of the category of each pair
+        weight : int, optional
+            The weight added per pair, e.g. -1 to retract pairs (default is 1)
+        """
+
+        # Buffer the pairs
+        self.pendingPairs.append((np.asarray(itemIndices, dtype=np.int64), np.asarray(categoryIndices, dtype=np.int64), weight))
+
+        # Return
+        return
+
+    def mergePending(self) -> None:
+        """
+        Merges the pending pairs into the stored entries at once, inserting the new entries in place rather than sorting all entries again, and dropping the entries that become zero
+        """
+
+        # Check whether there are any pending pairs
+        if(not self.pendingPairs):
+            return
+
+        # Sum the weights of the pending pairs by (item, category)
+        nitems, ncategories=self.shape
+        pendingPairs=self.pendingPairs
+        self.pendingPairs=[]
+        flatIndices=np.concatenate([itemIndices*ncategories+categoryIndices for itemIndices, categoryIndices, weight in pendingPairs])
+        weights=np.concatenate([np.full((len(itemIndices),), weight, dtype=np.int64) for itemIndices, categoryIndices, weight in pendingPairs])
+        pendingFlatIndices, inverseIndices=np.unique(flatIndices, return_inverse=True)
+        pendingCounts=np.bincount(inverseIndices.reshape(-1), weights=weights, minlength=len(pendingFlatIndices)).astype(np.int64)
+
+        # Locate the pending pairs among the stored entries, which are sorted by item and category
+        storedFlatIndices=np.repeat(np.arange(nitems, dtype=np.int64), np.diff(self.indptr))*ncategories+self.indices
+        positions=np.searchsorted(storedFlatIndices, pendingFlatIndices)
+        isStored=np.zeros((len(pendingFlatIndices),), dtype=bool)
+        if(len(storedFlatIndices)>0):
+            isStored=(storedFlatIndices[np.minimum(positions, len(storedFlatIndices)-1)]==pendingFlatIndices)
+
+        # Add the counts of the stored pairs in place and insert the new ones
+        data=self.data.astype(np.int64)
+        data[positions[isStored]]+=pendingCounts[isStored]
+        newFlatIndices=pendingFlatIndices[~isStored]
+        indices=np.insert(self.indices, positions[~isStored], (newFlatIndices%ncategories).astype(self.indices.dtype))
+        data=np.insert(data, positions[~isStored], pendingCounts[~isStored])
+        indptr=self.indptr.copy()
+        indptr[1:]+=np.cumsum(np.bincount(newFlatIndices//ncategories, minlength=nitems))
+
+        # Drop the entries that have become zero
+        isZero=(data==0)
+        if(np.any(isZero)):
+            rowIndices=np.repeat(np.arange(nitems, dtype=np.int64), np.diff(indptr))
+            indptr=np.zeros((nitems+1,), dtype=np.int64)
+            np.cumsum(np.bincount(rowIndices[~isZero], minlength=nitems), out=indptr[1:])
+            indices=indices[~isZero]
+            data=data[~isZero]
+
+        # Store the merged arrays
+        self.indptr=indptr
+        self.indices=indices
+        self.data=data.astype(np.int32)
+
+        # Return
+        return
+
+#*********************#
+# Mapped count matrix #
+#*********************#
+
+class mappedCountMatrix(denseCountMatrix):
+    """
+    A matrix of the number of times each item falls in each category, stored as a dense array in a memory-mapped .npy file that is processed in blocks of rows
+    """
+
+    # Class attributes
+    blockBytes=67108864
+
+    def __init__(self, file: str, mode: str = "r+"):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        file : str
+            The path to the .npy file of the counts
+        mode : str, optional
+            The mode in which the file is memory-mapped, either "r+" or "r" for read-only access (default is "r+")
+        """
+
+        # Evaluate arguments
+        assert (mode in ["r", "r+"]), "the requested mode is not available"
+        self.file=file
+        self.mode=mode
+
+        # Memory-map the counts
+        super().__init__(np.load(file, mmap_mode=mode))
+
+        # Return
+        return
+
+    @staticmethod
+    def create(file: str, nitems: int, ncategories: int, dtype: np.dtype = np.int32) -> mappedCountMatrix:
+        """
+        Creates a count matrix of zeros in the specified .npy file, overwriting any existing file
+
+        Parameters
+        ----------
+        file : str
+            The path to the .npy file of the counts
+        nitems : int
+            The number of items
+        ncategories : int
+            The number of categories
+        dtype : np.dtype, optional
+            The type of the counts (default is np.int32)
+        """
+
+        # Write the file
+        counts=np.lib.format.open_memmap(file, mode='w+', dtype=dtype, shape=(nitems, ncategories))
+        counts.flush()
+        del counts
+
+        # Return
+        return mappedCountMatrix(file)
+
+    def getRowsPerBlock(self) -> int:
+        """
+        Returns the number of rows per block
+        """
+
+        # Return
+        return max(self.blockBytes//max(self.shape[1]*self.counts.itemsize, 1), 1)
+
+    def getColumn(self, icategory: int) -> np.ndarray:
+        """
+        Returns the number of times each item falls in the specified category
+
+        Parameters
+        ----------
+        icategory : int
+            The ID of the category
+        """
+
+        # Gather the column one block of rows at a time
+        column=np.empty((self.shape[0],), dtype=self.counts.dtype)
+        nrows=self.getRowsPerBlock()
+        for start in range(0, self.shape[0], nrows):
+            column[start:start+nrows]=self.counts[start:start+nrows,icategory]
+
+        # Return
+        return column
+
+    def getPairs(self, threshold: int = 1) -> tuple:
+        """
+        Returns the (item, category) pairs with counts of at least the specified threshold, sorted by item and category
+
+        Parameters
+        ----------
+        threshold : int, optional
+            The minimum count of the returned pairs (default is 1)
+        """
+
+        # Select the pairs one block of rows at a time
+        itemIndices=[np.zeros((0,), dtype=np.int64)]
+        categoryIndices=[np.zeros((0,), dtype=np.int64)]
+        nrows=self.getRowsPerBlock()
+        for start in range(0, self.shape[0], nrows):
+            rows, columns=np.nonzero(self.counts[start:start+nrows]>=max(threshold, 1))
+            itemIndices.append(rows+start)
+            categoryIndices.append(columns)
+
+        # Return
+        return np.concatenate(itemIndices), np.concatenate(categoryIndices)
+
+    def getEntries(self) -> tuple:
+        """
+        Returns the rows, columns and values of the non-zero entries, sorted by row and column
+        """
+
+        # Select the entries one block of rows at a time
+        rows=[np.zeros((0,), dtype=np.int64)]
+        columns=[np.zeros((0,), dtype=np.int64)]
+        values=[np.zeros((0,), dtype=np.int64)]
+        nrows=self.getRowsPerBlock()
+        for start in range(0, self.shape[0], nrows):
+            block=np.asarray(self.counts[start:start+nrows])
+            blockRows, blockColumns=np.nonzero(block)
+            rows.append(blockRows+start)
+            columns.append(blockColumns)
+            values.append(block[blockRows, blockColumns].astype(np.int64))
+
+        # Return
+        return np.concatenate(rows), np.concatenate(columns), np.concatenate(values)
+
+    def toarray(self) -> np.ndarray:
+        """
+        Returns the count matrix as the memory-mapped array, which is shared with this matrix
+        """
+
+        # Return
+        return self.counts
+
+    def flush(self) -> None:
+        """
+        Writes any changes of the counts to the file
+        """
+
+        # Flush the memory map
+        if(self.mode=="r+"):
+            self.counts.flush()
+
+        # Return
+        return
+
+    def addRows(self, nrows: int) -> None:
+        """
+        Appends rows of zeros for new items, rewriting the file
+
+        Parameters
+        ----------
+        nrows : int
+            The number of rows to be appended
+        """
+
+        # Resize the file
+        self.counts=resizeMappedArray(self.counts, self.file, (self.shape[0]+nrows, self.shape[1]), blockBytes=self.blockBytes)
+
+        # Return
+        return
+
+    def addColumns(self, ncolumns: int) -> None:
+        """
+        Appends columns of zeros for new categories, rewriting the file
+
+        Parameters
+        ----------
+        ncolumns : int
+            The number of columns to be appended
+        """
+
+        # Resize the file
+        self.counts=resizeMappedArray(self.counts, self.file, (self.shape[0], self.shape[1]+ncolumns), blockBytes=self.blockBytes)
+
+        # Return
+        return
+
+    def addPairs(self, itemIndices: np.ndarray, categoryIndices: np.ndarray, weight: int = 1) -> None:
+        """
+        Adds the specified weight to the counts of (item, category) pairs, which may repeat, one block of rows at a time
+
+        Parameters
+        ----------
+        itemIndices : np.ndarray
+            The ID of the item of each pair
+        categoryIndices : np.ndarray
+            The ID of the category of each pair
+        weight : int, optional
+            The weight added per pair, e.g. -1 to retract pairs (default is 1)
+        """
+
+        # Sort the pairs by item, unless they already are
+        itemIndices=np.asarray(itemIndices, dtype=np.int64)
+        categoryIndices=np.asarray(categoryIndices, dtype=np.int64)
+        if(np.any(itemIndices[1:]<itemIndices[:-1])):
+            order=np.argsort(itemIndices, kind='stable')
+            itemIndices=itemIndices[order]
+            categoryIndices=categoryIndices[order]
+
+        # Scatter-add the weights of the pairs that fall within each block of rows
+        ncategories=self.shape[1]
+        nrows=self.getRowsPerBlock()
+        boundaries=np.searchsorted(itemIndices, np.arange(0, self.shape[0]+nrows, nrows, dtype=np.int64)).tolist()
+        for iblock in range(len(boundaries)-1):
+            start, end=boundaries[iblock], boundaries[iblock+1]
+            if(start==end):
+                continue
+            firstRow=iblock*nrows
+            lastRow=int(itemIndices[end-1])+1
+            increments=np.bincount((itemIndices[start:end]-firstRow)*ncategories+categoryIndices[start:end], minlength=(lastRow-firstRow)*ncategories)
+            self.counts[firstRow:lastRow]+=(weight*increments).reshape((lastRow-firstRow, ncategories)).astype(self.counts.dtype)
+
+        # Return
+        return
+
+#*****************#
+# Threshold index #
+#*****************#
+
+class thresholdIndex():
+    """
+    The items of each category sorted by the number of times they fall in it, along with the number of items at or above each threshold
+    """
+
+    def __init__(self, counts: Union[denseCountMatrix, sparseCountMatrix]):
+        """
+        Constructor
+        """
+
+        # Get metadata
+        self.nitems, self.ncategories=counts.shape
+
+        # Sort the non-zero entries by category, decreasing count and item
+        rows, columns, values=counts.getEntries()
+        order=np.lexsort((rows, -values, columns))
+        self.sortedItemIDs=rows[order]
+        self.sortedCounts=values[order]
+        self.categoryOffsets=np.zeros((self.ncategories+1,), dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=self.ncategories), out=self.categoryOffsets[1:])
+
+        # Count the items at or above each threshold, from 0 to the maximum count, by accumulating the histogram of the counts of each category from the top
+        self.maxCount=(int(values.max()) if len(values)>0 else 0)
+        histogram=np.zeros((self.ncategories, self.maxCount+2), dtype=np.int64)
+        np.add.at(histogram, (columns, values), 1)
+        self.table=np.cumsum(histogram[:,::-1], axis=1)[:,::-1][:,:self.maxCount+1]
+        self.table[:,0]=self.nitems
+
+        # Return
+        return
+
+    def getNumberOf(self, icategory: int, threshold: float) -> int:
+        """
+        Returns the number of items that fall in the specified category at least the specified number of times
+
+        Parameters
+        ----------
+        icategory : int
+            The ID of the category
+        threshold : float
+            The minimum number of times, which need not be an integer
+        """
+
+        # Round the threshold up to the smallest count that reaches it
+        threshold=max(int(np.ceil(threshold)), 0)
+
+        # Return
+        return (int(self.table[icategory, threshold]) if threshold<=self.maxCount else 0)
+
+    def getItemIDsIn(self, icategory: int, threshold: float) -> np.ndarray:
+        """
+        Returns the IDs of the items that fall in the specified category at least the specified number of times, in increasing order
+
+        Parameters
+        ----------
+        icategory : int
+            The ID of the category
+        threshold : float
+            The minimum number of times, which need not be an integer
+        """
+
+        # Every item falls in every category at least zero times
+        if(threshold<=0):
+            return np.arange(self.nitems, dtype=np.int64)
+
+        # Return
+        return np.sort(self.sortedItemIDs[self.categoryOffsets[icategory]:self.categoryOffsets[icategory]+self.getNumberOf(icategory, threshold)])
+
+#*************#
+# Score index #
+#*************#
+
+class scoreIndex(thresholdIndex):
+    """
+    The items of each category sorted by their float scores, along with the number of items at or above each integer threshold
+    """
+
+    def __init__(self, counts: denseCountMatrix):
+        """
+        Constructor
+        """
+
+        # Get metadata
+        self.nitems, self.ncategories=counts.shape
+
+        # Sort the non-zero entries by category, decreasing score and item
+        rows, columns, values=counts.getEntries()
+        order=np.lexsort((rows, -values, columns))
+        self.sortedItemIDs=rows[order]
+        self.sortedCounts=values[order]
+        self.categoryOffsets=np.zeros((self.ncategories+1,), dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=self.ncategories), out=self.categoryOffsets[1:])
+
+        # Count the items at or above each integer threshold, from 0 to the maximum score, a score reaching an integer threshold if its floor does
+        floorValues=np.floor(values).astype(np.int64)
+        self.maxCount=(max(int(floorValues.max()), 0) if len(values)>0 else 0)
+        isPositive=(floorValues>0)
+        histogram=np.zeros((self.ncategories, self.maxCount+2), dtype=np.int64)
+        np.add.at(histogram, (columns[isPositive], floorValues[isPositive]), 1)
+        self.table=np.cumsum(histogram[:,::-1], axis=1)[:,::-1][:,:self.maxCount+1]
+        self.table[:,0]=self.nitems-np.bincount(columns[values<0], minlength=self.ncategories)
+
+        # Return
+        return
+
+    def getNumberOf(self, icategory: int, threshold: float) -> int:
+        """
+        Returns the number of items with a score of at least the specified threshold in the specified category
+
+        Parameters
+        ----------
+        icategory : int
+            The ID of the category
+        threshold : float
+            The minimum score
+        """
+
+        # Count the non-zero scores that reach the threshold by bisecting the decreasing scores of the category
+        start, end=int(self.categoryOffsets[icategory]), int(self.categoryOffsets[icategory+1])
+        nreached=int(np.searchsorted(-self.sortedCounts[start:end], -threshold, side='right'))
+
+        # Return, the zero scores reaching any threshold that is not positive
+        return (nreached if threshold>0 else self.nitems-(end-start-nreached))
+
+    def getItemIDsIn(self, icategory: int, threshold: float) -> np.ndarray:
+        """
+        Returns the IDs of the items with a score of at least the specified threshold in the specified category, in increasing order
+
+        Parameters
+        ----------
+        icategory : int
+            The ID of the category
+        threshold : float
+            The minimum score
+        """
+
+        # Bisect the decreasing scores of the category
+        start, end=int(self.categoryOffsets[icategory]), int(self.categoryOffsets[icategory+1])
+        nreached=int(np.searchsorted(-self.sortedCounts[start:end], -threshold, side='right'))
+
+        # Exclude the items with negative scores below a threshold that is not positive, the zero scores reaching it
+        if(threshold<=0):
+            isReached=np.ones((self.nitems,), dtype=bool)
+            isReached[self.sortedItemIDs[start+nreached:end]]=False
+            return np.flatnonzero(isReached)
+
+        # Return
+        return np.sort(self.sortedItemIDs[start:start+nreached])
+
+#############
+# Functions #
+#############
+
+#*********************#
+# Resize mapped array #
+#*********************#
+
+def resizeMappedArray(array: np.ndarray, file: str, shape: tuple, dtype: Optional[np.dtype] = None, blockBytes: int = 67108864) -> np.ndarray:
+    """
+    Resizes the array of a .npy file by rewriting the file one block of rows at a time, padding it with zeros, and returns the new memory-mapped array
+
+    Parameters
+    ----------
+    array : np.ndarray
+        The memory-mapped array of the file
+    file : str
+        The path to the .npy file
+    shape : tuple
+        The new shape of the array, which is at least as large as the old one along every axis
+    dtype : np.dtype, optional
+        The new type of the array (default is None, to keep the type of the array)
+    blockBytes : int, optional
+        The memory budget of the blocks of rows copied at once, in bytes (default is 67108864)
+    """
+
+    # Write the resized array to a temporary file
+    temporaryFile=file+".tmp"
+    resizedArray=np.lib.format.open_memmap(temporaryFile, mode='w+', dtype=(array.dtype if dtype is None else dtype), shape=tuple(shape))
+    nrows=max(blockBytes//max(array[:1].nbytes, 1), 1)
+    for start in range(0, array.shape[0], nrows):
+        end=min(start+nrows, array.shape[0])
+        resizedArray[(slice(start, end),)+tuple(slice(0, size) for size in array.shape[1:])]=array[start:end]
+    resizedArray.flush()
+    del resizedArray
+
+    # Replace the file
+    del array
+    os.replace(temporaryFile, file)
+
+    # Return
+    return np.load(file, mmap_mode='r+')
+
+#********************#
+# Build count matrix #
+#********************#
+
+def buildCountMatrix(itemIndices: np.ndarray, categoryIndices: np.ndarray, nitems: int, ncategories: int, backend: str = "auto", densityThreshold: float = 0.1) -> Union[denseCountMatrix, sparseCountMatrix]:
+    """
+    Builds the matrix of the number of times each item falls in each category from (item, category) pairs, which may repeat
+
+    Parameters
+    ----------
+    itemIndices : np.ndarray
+        The ID of the item of each pair
+    categoryIndices : np.ndarray
+        The ID of the category of each pair
+    nitems : int
+        The number of items
+    ncategories : int
+        The number of categories
+    backend : str, optional
+        The storage of the matrix, either "dense", "sparse" or "auto" to choose from the density of the matrix (default is "auto")
+    densityThreshold : float, optional
+        The fraction of non-zero entries below which the sparse storage is chosen automatically (default is 0.1)
+    """
+
+    # Evaluate arguments
+    assert (backend in ["auto", "dense", "sparse"]), "the requested count matrix backend is not available"
+
+    # Choose the backend from an upper bound on the density, as pairs may repeat
+    if(backend=="auto"):
+        backend=("sparse" if len(itemIndices)<densityThreshold*nitems*ncategories else "dense")
+
+    # Return
+    return (sparseCountMatrix if backend=="sparse" else denseCountMatrix).fromPairs(itemIndices, categoryIndices, nitems, ncategories)
\ No newline at end of file
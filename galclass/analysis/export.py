@@ -0,0 +1,552 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from itertools import chain, islice
+from typing import BinaryIO, Iterator, Optional
+
+import os
+import csv
+import json
+import shutil
+import zipfile
+import tempfile
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow=None
+
+import numpy as np
+
+# Local #
+
+from .classification import combinedClassification
+from .agreement import getChunkSize
+from .mapped import encodeStrings
+from ..fileio import compressions, getCompressionSuffix, stringTable
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['exportCombinedClassification', 'readCombinedExport']
+
+#############
+# Constants #
+#############
+
+# Export formats, identified by the suffixes of the files
+exportFormats={'.npz': "npz", '.csv': "csv", '.parquet': "parquet", '.arrow': "arrow", '.feather': "arrow"}
+
+#############
+# Functions #
+#############
+
+#*******************#
+# Get export format #
+#*******************#
+
+def getExportFormat(file: str) -> str:
+    """
+    Returns the export format of the specified file ("npz", "csv", "parquet" or "arrow") from its suffix, a CSV file possibly being compressed
+
+    Parameters
+    ----------
+    file : str
+        The path to the file
+    """
+
+    # Strip the compression suffix of the file
+    compressionSuffix=getCompressionSuffix(file)
+    suffix=os.path.splitext(file[:len(file)-len(compressionSuffix)])[1].lower()
+
+    # Make sure that the format is known
+    assert (suffix in exportFormats), "the format of the export file cannot be determined from its suffix"
+    assert ((not compressionSuffix)or(exportFormats[suffix]=="csv")), "only CSV export files can be compressed"
+
+    # Return
+    return exportFormats[suffix]
+
+#********************#
+# Get export columns #
+#********************#
+
+def getExportColumns(categories: Iterable, thresholds: Iterable) -> tuple:
+    """
+    Returns the names of the count columns of the categories and of the consensus columns of the categories at each threshold
+
+    Parameters
+    ----------
+    categories : Iterable
+        The categories
+    thresholds : Iterable
+        The thresholds of the consensus columns
+    """
+
+    # Return
+    return [f"count:{category}" for category in categories], [f"{category}>={threshold}" for threshold in thresholds for category in categories]
+
+#**********************#
+# Parse export columns #
+#**********************#
+
+def parseExportColumns(columns: list) -> tuple:
+    """
+    Recovers the categories and thresholds from the names of the columns of an export file
+
+    Parameters
+    ----------
+    columns : list
+        The names of the columns, between the item column and the comments column
+
+    Returns
+    -------
+    categories : list
+        The categories
+    thresholds : list
+        The thresholds of the consensus columns
+    """
+
+    # Recover the categories from the count columns
+    categories=[column[len("count:"):] for column in columns if(column.startswith("count:"))]
+
+    # Recover the thresholds from the consensus columns of the first category
+    thresholds=[]
+    for column in columns[len(categories):len(columns):max(len(categories), 1)]:
+        threshold=column.rsplit(">=", 1)[1]
+        thresholds.append(int(threshold) if threshold.lstrip('-').isdigit() else float(threshold))
+
+    # Return
+    return categories, thresholds
+
+#***********************#
+# Iterate export blocks #
+#***********************#
+
+def iterateExportBlocks(combined: combinedClassification, thresholds: Iterable = (1,), comments: bool = True, chunkSize: Optional[int] = None) -> Iterator:
+    """
+    Yields the columns of consecutive blocks of items of a combined classification, so that it can be exported without gathering all of its rows at once
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    thresholds : Iterable, optional
+        The thresholds at which the consensus of each category is determined (default is (1,))
+    comments : bool, optional
+        Should the comments on the items be gathered? (default is True)
+    chunkSize : int, optional
+        The number of items per block (default is None, for as many as fit in the memory budget)
+
+    Yields
+    ------
+    block : dict
+        The first and past the last item of the block, the items, the counts, whether the items are in each category at each threshold, with one row per item, one plane per threshold and one column per category, and the comments on each item, or None
+    """
+
+    # Evaluate arguments
+    thresholds=list(thresholds)
+
+    # Sort the item IDs of each classification once, as for the lookup of the comments on single items
+    if(comments):
+        for source in combined.sources:
+            if('order' not in source):
+                source['order']=np.argsort(source['itemIDs'], kind='stable')
+                source['sortedItemIDs']=source['itemIDs'][source['order']]
+
+    # Determine the number of items per block
+    chunkSize=getChunkSize((16+len(thresholds))*combined.ncategories+256, chunkSize)
+
+    # Yield the blocks
+    for start in range(0, combined.nitems, chunkSize):
+        end=min(start+chunkSize, combined.nitems)
+        counts=np.asarray(combined.counts.getRows(start, end))
+        consensus=np.stack([counts>=threshold for threshold in thresholds], axis=1) if(len(thresholds)>0) else np.zeros((end-start, 0, combined.ncategories), dtype=bool)
+        itemComments=None
+        if(comments):
+            # Gather the comments of each classification on the items of the block, in the order of the classifications
+            itemIDs=[np.zeros((0,), dtype=np.int64)]
+            sourceComments=[]
+            for source in combined.sources:
+                first, last=np.searchsorted(source['sortedItemIDs'], [start, end]).tolist()
+                itemIDs.append(source['sortedItemIDs'][first:last]-start)
+                sourceComments.extend([source['comments'][iitem] for iitem in source['order'][first:last].tolist()])
+            # Group the comments by item, keeping the order of the classifications
+            itemIDs=np.concatenate(itemIDs)
+            order=np.argsort(itemIDs, kind='stable')
+            boundaries=np.searchsorted(itemIDs[order], np.arange(end-start+1, dtype=np.int64)).tolist()
+            sourceComments=[sourceComments[icomment] for icomment in order.tolist()]
+            itemComments=[sourceComments[boundaries[iitem]:boundaries[iitem+1]] for iitem in range(end-start)]
+        yield {'start': start, 'end': end, 'items': [str(item) for item in combined.items[start:end]], 'counts': counts, 'consensus': consensus, 'comments': itemComments}
+
+    # Return
+    return
+
+#*****************#
+# Write npz array #
+#*****************#
+
+def writeNPZArray(archive: zipfile.ZipFile, name: str, dtype: np.dtype, shape: tuple, blocks: Iterable) -> None:
+    """
+    Writes an array to an .npz archive one block of rows at a time, without assembling it in memory
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        The archive opened for writing
+    name : str
+        The name of the array
+    dtype : np.dtype
+        The type of the array
+    shape : tuple
+        The shape of the array
+    blocks : Iterable
+        The consecutive blocks of rows of the array
+    """
+
+    # Write the header of the array
+    member=archive.open(name+".npy", mode='w', force_zip64=True)
+    np.lib.format.write_array_header_1_0(member, {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': tuple(shape)})
+
+    # Write the rows of the array
+    for block in blocks:
+        member.write(np.ascontiguousarray(block, dtype=dtype).tobytes())
+    member.close()
+
+    # Return
+    return
+
+#*****************#
+# Write npz spool #
+#*****************#
+
+def writeNPZSpool(archive: zipfile.ZipFile, name: str, dtype: np.dtype, spool: BinaryIO) -> None:
+    """
+    Writes the raw data of an array spooled to a temporary file to an .npz archive as a flat array, and closes the temporary file
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        The archive opened for writing
+    name : str
+        The name of the array
+    dtype : np.dtype
+        The type of the array
+    spool : BinaryIO
+        The temporary file
+    """
+
+    # Write the header of the array, the length of which is given by the size of the spooled data
+    nbytes=spool.tell()
+    spool.seek(0)
+    member=archive.open(name+".npy", mode='w', force_zip64=True)
+    np.lib.format.write_array_header_1_0(member, {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': (nbytes//np.dtype(dtype).itemsize,)})
+
+    # Copy the spooled data
+    shutil.copyfileobj(spool, member)
+    member.close()
+    spool.close()
+
+    # Return
+    return
+
+#************#
+# Export NPZ #
+#************#
+
+def exportNPZ(combined: combinedClassification, file: str, thresholds: list, comments: bool, compress: bool, chunkSize: Optional[int]) -> None:
+    """
+    Exports a combined classification to an .npz archive, one array at a time, see exportCombinedClassification
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    file : str
+        The path to the export file
+    thresholds : list
+        The thresholds at which the consensus of each category is exported
+    comments : bool
+        Should the comments on the items be exported?
+    compress : bool
+        Should the arrays be compressed?
+    chunkSize : int or None
+        The number of items per block, or None for as many as fit in the memory budget
+    """
+
+    # Determine the types of the items and counts
+    nthresholds=len(thresholds)
+    itemDtype=(combined.items.dtype if isinstance(combined.items, np.ndarray) else np.dtype(f"<U{max(max(map(len, combined.items), default=1), 1)}"))
+    countDtype=np.asarray(combined.counts.getRows(0, min(combined.nitems, 1))).dtype
+
+    # Write each array in its own pass over the blocks, as the members of an archive are written one at a time
+    archive=zipfile.ZipFile(os.path.expanduser(file), mode='w', compression=(zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED), allowZip64=True)
+    writeNPZArray(archive, "categories", np.asarray(combined.categories, dtype=str).dtype, (combined.ncategories,), [np.asarray(combined.categories, dtype=str)])
+    writeNPZArray(archive, "thresholds", np.asarray(thresholds).dtype, (nthresholds,), [np.asarray(thresholds)])
+    writeNPZArray(archive, "items", itemDtype, (combined.nitems,), (block['items'] for block in iterateExportBlocks(combined, [], comments=False, chunkSize=chunkSize)))
+    writeNPZArray(archive, "counts", countDtype, (combined.nitems, combined.ncategories), (block['counts'] for block in iterateExportBlocks(combined, [], comments=False, chunkSize=chunkSize)))
+    writeNPZArray(archive, "consensus", bool, (combined.nitems, nthresholds, combined.ncategories), (block['consensus'] for block in iterateExportBlocks(combined, thresholds, comments=False, chunkSize=chunkSize)))
+    if(comments):
+        # Write the comments as a single table of strings along with the offsets of the comments on each item, spooling the strings and their offsets until their numbers are known
+        stringSpool=tempfile.TemporaryFile()
+        offsetSpool=tempfile.TemporaryFile()
+        offsetSpool.write(np.zeros((1,), dtype=np.int64).tobytes())
+        def iterateItemOffsets():
+            ncomments=0
+            nbytes=0
+            yield np.zeros((1,), dtype=np.int64)
+            for block in iterateExportBlocks(combined, [], comments=True, chunkSize=chunkSize):
+                table=encodeStrings(chain.from_iterable(block['comments']))
+                stringSpool.write(table.blob.tobytes())
+                offsetSpool.write((nbytes+table.offsets[1:]).tobytes())
+                nbytes=nbytes+int(table.offsets[-1])
+                itemOffsets=ncomments+np.cumsum(np.fromiter(map(len, block['comments']), dtype=np.int64, count=len(block['comments'])))
+                ncomments=ncomments+table.nstrings
+                yield itemOffsets
+        writeNPZArray(archive, "itemCommentOffsets", np.int64, (combined.nitems+1,), iterateItemOffsets())
+        writeNPZSpool(archive, "comments", np.uint8, stringSpool)
+        writeNPZSpool(archive, "commentOffsets", np.int64, offsetSpool)
+    archive.close()
+
+    # Return
+    return
+
+#************#
+# Export CSV #
+#************#
+
+def exportCSV(combined: combinedClassification, file: str, thresholds: list, comments: bool, chunkSize: Optional[int]) -> None:
+    """
+    Exports a combined classification to a CSV file, one block of rows at a time, see exportCombinedClassification
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    file : str
+        The path to the export file
+    thresholds : list
+        The thresholds at which the consensus of each category is exported
+    comments : bool
+        Should the comments on the items be exported?
+    chunkSize : int or None
+        The number of items per block, or None for as many as fit in the memory budget
+    """
+
+    # Open the file for writing, compressing it according to its suffix
+    compressionSuffix=getCompressionSuffix(file)
+    if(compressionSuffix):
+        stream=compressions[compressionSuffix]['open'](os.path.expanduser(file), mode='wt', encoding='utf-8', newline='')
+    else:
+        stream=open(os.path.expanduser(file), mode='w', encoding='utf-8', newline='')
+
+    # Write the header
+    writer=csv.writer(stream)
+    countColumns, consensusColumns=getExportColumns(combined.categories, thresholds)
+    writer.writerow(["item"]+countColumns+consensusColumns+(["comments"] if comments else []))
+
+    # Write the rows one block at a time, the consensus as 0 or 1 and the comments on each item as a JSON list
+    for block in iterateExportBlocks(combined, thresholds, comments=comments, chunkSize=chunkSize):
+        columns=[block['items']]+block['counts'].T.tolist()+block['consensus'].reshape((block['end']-block['start'], -1)).T.astype(np.int8).tolist()
+        if(comments):
+            # Encode each distinct list of comments once, as most items share the same, mostly empty, comments
+            encodedComments={}
+            for itemComments in map(tuple, block['comments']):
+                if(itemComments not in encodedComments):
+                    encodedComments[itemComments]=json.dumps(itemComments, ensure_ascii=False)
+            columns.append([encodedComments[itemComments] for itemComments in map(tuple, block['comments'])])
+        writer.writerows(zip(*columns))
+    stream.close()
+
+    # Return
+    return
+
+#**************#
+# Export Arrow #
+#**************#
+
+def exportArrow(combined: combinedClassification, file: str, thresholds: list, comments: bool, format: str, chunkSize: Optional[int]) -> None:
+    """
+    Exports a combined classification to a Parquet or Arrow IPC file, one record batch per block, see exportCombinedClassification
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    file : str
+        The path to the export file
+    thresholds : list
+        The thresholds at which the consensus of each category is exported
+    comments : bool
+        Should the comments on the items be exported?
+    format : str
+        The format of the file, either "parquet" or "arrow"
+    chunkSize : int or None
+        The number of items per block, or None for as many as fit in the memory budget
+    """
+
+    # Make sure that pyarrow is available
+    assert (pyarrow is not None), "the Parquet and Arrow formats require pyarrow"
+
+    # Determine the schema, keeping the categories and thresholds in its metadata
+    countColumns, consensusColumns=getExportColumns(combined.categories, thresholds)
+    countType=pyarrow.from_numpy_dtype(np.asarray(combined.counts.getRows(0, min(combined.nitems, 1))).dtype)
+    fields=[pyarrow.field("item", pyarrow.string())]+[pyarrow.field(column, countType) for column in countColumns]+[pyarrow.field(column, pyarrow.bool_()) for column in consensusColumns]
+    if(comments):
+        fields.append(pyarrow.field("comments", pyarrow.list_(pyarrow.string())))
+    schema=pyarrow.schema(fields, metadata={'galclass': json.dumps({'categories': combined.categories, 'thresholds': thresholds})})
+
+    # Write one record batch per block
+    writer=(pyarrow.parquet.ParquetWriter(os.path.expanduser(file), schema) if format=="parquet" else pyarrow.ipc.new_file(os.path.expanduser(file), schema))
+    for block in iterateExportBlocks(combined, thresholds, comments=comments, chunkSize=chunkSize):
+        consensus=block['consensus'].reshape((block['end']-block['start'], -1))
+        arrays=[pyarrow.array(block['items'], type=pyarrow.string())]+[pyarrow.array(block['counts'][:,icategory], type=countType) for icategory in range(combined.ncategories)]+[pyarrow.array(consensus[:,icolumn], type=pyarrow.bool_()) for icolumn in range(consensus.shape[1])]
+        if(comments):
+            arrays.append(pyarrow.array(block['comments'], type=pyarrow.list_(pyarrow.string())))
+        writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+    writer.close()
+
+    # Return
+    return
+
+#********************************#
+# Export combined classification #
+#********************************#
+
+def exportCombinedClassification(combined: combinedClassification, file: str, thresholds: Iterable = (1,), comments: bool = True, compress: bool = False, chunkSize: Optional[int] = None) -> None:
+    """
+    Exports the items, counts, consensus at the specified thresholds and comments of a combined classification to a columnar file, streaming them one block of items at a time
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    file : str
+        The path to the export file, the format of which is determined from its suffix: ".npz", ".csv" (optionally compressed as ".csv.gz", ".csv.xz" or ".csv.bz2"), ".parquet", or ".arrow" or ".feather" for the Arrow IPC format, the last two requiring pyarrow
+    thresholds : Iterable, optional
+        The thresholds at which the consensus of each category is exported (default is (1,))
+    comments : bool, optional
+        Should the comments on the items be exported? (default is True)
+    compress : bool, optional
+        Should the arrays of an .npz file be compressed? (default is False)
+    chunkSize : int, optional
+        The number of items per block (default is None, for as many as fit in the memory budget)
+    """
+
+    # Evaluate arguments
+    format=getExportFormat(file)
+    thresholds=np.asarray(list(thresholds)).tolist()
+
+    # Export the combined classification
+    if(format=="npz"):
+        exportNPZ(combined, file, thresholds, comments, compress, chunkSize)
+    elif(format=="csv"):
+        exportCSV(combined, file, thresholds, comments, chunkSize)
+    else:
+        exportArrow(combined, file, thresholds, comments, format, chunkSize)
+
+    # Return
+    return
+
+#**********************#
+# Read combined export #
+#**********************#
+
+def readCombinedExport(file: str, comments: bool = True, chunkSize: int = 65536) -> dict:
+    """
+    Reads an export file of a combined classification back, without combining the classifications again
+
+    Parameters
+    ----------
+    file : str
+        The path to the export file
+    comments : bool, optional
+        Should the comments on the items be read, if they have been exported? (default is True)
+    chunkSize : int, optional
+        The number of rows of a CSV file parsed at once (default is 65536)
+
+    Returns
+    -------
+    export : dict
+        The items, the categories, the thresholds, the counts with one row per item and one column per category, whether the items are in each category at each threshold with one row per item, one plane per threshold and one column per category, and the comments on each item, or None if they have not been exported or read
+    """
+
+    # Determine the format of the file
+    format=getExportFormat(file)
+    export={'comments': None}
+
+    # Read the arrays of an .npz file
+    if(format=="npz"):
+        archive=np.load(os.path.expanduser(file))
+        export['items']=archive['items']
+        export['categories']=archive['categories'].tolist()
+        export['thresholds']=archive['thresholds'].tolist()
+        export['counts']=archive['counts']
+        export['consensus']=archive['consensus']
+        if(comments and ('comments' in archive.files)):
+            table=stringTable(archive['comments'], archive['commentOffsets'])
+            commentStrings=table.getStrings(np.arange(table.nstrings))
+            itemOffsets=archive['itemCommentOffsets'].tolist()
+            export['comments']=[commentStrings[itemOffsets[iitem]:itemOffsets[iitem+1]] for iitem in range(len(itemOffsets)-1)]
+        archive.close()
+
+    # Parse a CSV file one block of rows at a time
+    elif(format=="csv"):
+        compressionSuffix=getCompressionSuffix(file)
+        if(compressionSuffix):
+            stream=compressions[compressionSuffix]['open'](os.path.expanduser(file), mode='rt', encoding='utf-8', newline='')
+        else:
+            stream=open(os.path.expanduser(file), mode='r', encoding='utf-8', newline='')
+        reader=csv.reader(stream)
+        header=next(reader)
+        hasComments=(header[-1]=="comments")
+        export['categories'], export['thresholds']=parseExportColumns(header[1:len(header)-hasComments])
+        ncategories=len(export['categories'])
+        items=[]
+        counts=[]
+        consensus=[]
+        itemComments=([] if(comments and hasComments) else None)
+        for rows in iter(lambda: list(islice(reader, chunkSize)), []):
+            columns=list(zip(*rows))
+            items.append(np.asarray(columns[0], dtype=str))
+            # The counts are integers unless the combination has been weighted
+            try:
+                counts.append(np.array(columns[1:1+ncategories], dtype=np.int64).T.reshape((len(rows), ncategories)))
+            except ValueError:
+                counts.append(np.array(columns[1:1+ncategories], dtype=np.float64).T.reshape((len(rows), ncategories)))
+            consensus.append(np.array(columns[1+ncategories:len(header)-hasComments], dtype=np.int8).T.reshape((len(rows), len(export['thresholds']), ncategories)).astype(bool))
+            if(itemComments is not None):
+                # Decode each distinct list of comments once
+                decodedComments={encodedComments: json.loads(encodedComments) for encodedComments in set(columns[-1])}
+                itemComments.extend([list(decodedComments[encodedComments]) for encodedComments in columns[-1]])
+        stream.close()
+        export['items']=(np.concatenate(items) if len(items)>0 else np.zeros((0,), dtype=str))
+        export['counts']=(np.concatenate(counts) if len(counts)>0 else np.zeros((0, ncategories), dtype=np.int64))
+        export['consensus']=(np.concatenate(consensus) if len(consensus)>0 else np.zeros((0, len(export['thresholds']), ncategories), dtype=bool))
+        export['comments']=itemComments
+
+    # Read the columns of a Parquet or Arrow file
+    else:
+        assert (pyarrow is not None), "the Parquet and Arrow formats require pyarrow"
+        table=(pyarrow.parquet.read_table(os.path.expanduser(file)) if format=="parquet" else pyarrow.ipc.open_file(pyarrow.memory_map(os.path.expanduser(file))).read_all())
+        metadata=json.loads(table.schema.metadata[b'galclass'])
+        export['categories']=metadata['categories']
+        export['thresholds']=metadata['thresholds']
+        countColumns, consensusColumns=getExportColumns(export['categories'], export['thresholds'])
+        export['items']=np.asarray(table.column("item").to_pylist(), dtype=str)
+        export['counts']=(np.column_stack([table.column(column).to_numpy() for column in countColumns]) if len(countColumns)>0 else np.zeros((table.num_rows, 0), dtype=np.int64))
+        export['consensus']=np.array([table.column(column).to_numpy(zero_copy_only=False) for column in consensusColumns], dtype=bool).T.reshape((table.num_rows, len(export['thresholds']), len(export['categories'])))
+        if(comments and ("comments" in table.column_names)):
+            export['comments']=table.column("comments").to_pylist()
+
+    # Return
+    return export
\ No newline at end of file
@@ -0,0 +1,272 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+
+# Local #
+
+from .classification import packCategories, unpackCategories, buildIndexMap
+from ..fileio import readJSONFile
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['categoryHierarchy', 'readCategoryHierarchy']
+
+###########
+# Classes #
+###########
+
+#********************#
+# Category hierarchy #
+#********************#
+
+class categoryHierarchy():
+    """
+    A category hierarchy compiled from a categories dictionary, with the categories flattened in depth-first order along with their relations as bit matrices
+    """
+
+    def __init__(self, categoriesDict: dict) -> None:
+        """
+        Constructor
+        """
+
+        # Flatten the category tree
+        self.categories=[]
+        self.shortcuts=[]
+        self.isAlso=[]
+        self.isNot=[]
+        depths=[]
+        parentIDs=[]
+        self.__addCategories(categoriesDict, 1, -1, [], [], depths, parentIDs)
+
+        # Get metadata
+        self.ncategories=len(self.categories)
+        self.nwords=max((self.ncategories+63)//64, 1)
+        self.categoryIDs=buildIndexMap(self.categories)
+        self.depths=np.array(depths, dtype=np.int64)
+        self.parentIDs=np.array(parentIDs, dtype=np.int64)
+        self.maxDepth=int(np.max(self.depths, initial=0))
+
+        # Map the names of the categories to the IDs of all categories with that name
+        namedIDs={}
+        for icategory, category in enumerate(self.categories):
+            namedIDs.setdefault(category, []).append(icategory)
+
+        # Pack the structural ancestors of each category
+        categoryIndices=[]
+        ancestorIndices=[]
+        for icategory in range(self.ncategories):
+            iparent=parentIDs[icategory]
+            while(iparent>=0):
+                categoryIndices.append(icategory)
+                ancestorIndices.append(iparent)
+                iparent=parentIDs[iparent]
+        self.ancestorBits=packCategories(np.array(categoryIndices, dtype=np.int64), np.array(ancestorIndices, dtype=np.int64), self.ncategories, self.ncategories, nwords=self.nwords)
+
+        # Pack the categories implied by and mutually exclusive with each category
+        self.impliedBits=self.__packRelation(self.isAlso, namedIDs)
+        self.exclusionBits=self.__packRelation(self.isNot, namedIDs)
+
+        # Return
+        return
+
+    def __addCategories(self, category: dict, depth: int, parentID: int, isAlso: list, isNot: list, depths: list, parentIDs: list) -> None:
+        # Add the subcategories of the category in depth-first order, accumulating the isAlso and isNot of their ancestors
+        for subcategory in category['categories']:
+            subisAlso=isAlso+list(subcategory.get('isAlso', []))
+            subisNot=isNot+list(subcategory.get('isNot', []))
+            icategory=len(self.categories)
+            self.categories.append(subcategory['name'])
+            self.shortcuts.append(subcategory.get('shortcut', ""))
+            self.isAlso.append(subisAlso)
+            self.isNot.append(subisNot)
+            depths.append(depth)
+            parentIDs.append(parentID)
+            self.__addCategories(subcategory, depth+1, icategory, subisAlso+[subcategory['name'],], subisNot, depths, parentIDs)
+        return
+
+    def __packRelation(self, relatedNames: list, namedIDs: dict) -> np.ndarray:
+        # Pack the categories named in the relation of each category, ignoring names that are not part of the hierarchy
+        categoryIndices=[]
+        relatedIndices=[]
+        for icategory, names in enumerate(relatedNames):
+            for name in names:
+                for jcategory in namedIDs.get(name, []):
+                    categoryIndices.append(icategory)
+                    relatedIndices.append(jcategory)
+        return packCategories(np.array(categoryIndices, dtype=np.int64), np.array(relatedIndices, dtype=np.int64), self.ncategories, self.ncategories, nwords=self.nwords)
+
+    def __unpackMatrix(self, bits: np.ndarray) -> np.ndarray:
+        # Expand a bit matrix into a boolean matrix
+        matrix=np.zeros((self.ncategories, self.ncategories), dtype=bool)
+        matrix[unpackCategories(bits, self.ncategories)]=True
+        return matrix
+
+    def __getCategoryID(self, category: str) -> int:
+        # Look up the ID of the category
+        icategory=self.categoryIDs.get(category)
+        if(icategory is None):
+            raise ValueError(f"'{category}' is not part of the category hierarchy")
+        return icategory
+
+    def getAncestorMatrix(self) -> np.ndarray:
+        """
+        Returns a boolean matrix which is true where the category of the column is a structural ancestor of the category of the row
+        """
+
+        # Return
+        return self.__unpackMatrix(self.ancestorBits)
+
+    def getImplicationMatrix(self) -> np.ndarray:
+        """
+        Returns a boolean matrix which is true where the category of the row implies the category of the column, through its ancestors or isAlso
+        """
+
+        # Return
+        return self.__unpackMatrix(self.impliedBits)
+
+    def getExclusionMatrix(self, symmetric: bool = False) -> np.ndarray:
+        """
+        Returns a boolean matrix which is true where the category of the row excludes the category of the column, through its own or its ancestors' isNot
+
+        Parameters
+        ----------
+        symmetric : bool, optional
+            Should the exclusions be made mutual, so that categories exclude each other if either excludes the other? (default is False)
+        """
+
+        # Expand the exclusions
+        matrix=self.__unpackMatrix(self.exclusionBits)
+
+        # Return
+        return ((matrix|matrix.T) if symmetric else matrix)
+
+    def getAncestorsOf(self, category: str) -> list:
+        """
+        Returns the structural ancestors of the specified category, from its parent to the top of the hierarchy
+
+        Parameters
+        ----------
+        category : str
+            The category
+        """
+
+        # Follow the parents of the category
+        ancestors=[]
+        iparent=int(self.parentIDs[self.__getCategoryID(category)])
+        while(iparent>=0):
+            ancestors.append(self.categories[iparent])
+            iparent=int(self.parentIDs[iparent])
+
+        # Return
+        return ancestors
+
+    def getDescendantsOf(self, category: str) -> list:
+        """
+        Returns the structural descendants of the specified category in depth-first order
+
+        Parameters
+        ----------
+        category : str
+            The category
+        """
+
+        # Select the categories that have the category as an ancestor
+        icategory=self.__getCategoryID(category)
+        isDescendant=((self.ancestorBits[:,icategory//64]>>np.uint64(icategory%64))&np.uint64(1)).astype(bool)
+
+        # Return
+        return [self.categories[jcategory] for jcategory in np.flatnonzero(isDescendant)]
+
+    def getImpliedBy(self, category: str) -> list:
+        """
+        Returns the categories implied by the specified category, through its ancestors or isAlso
+
+        Parameters
+        ----------
+        category : str
+            The category
+        """
+
+        # Return
+        return [self.categories[jcategory] for jcategory in unpackCategories(self.impliedBits[[self.__getCategoryID(category)]], self.ncategories)[1]]
+
+    def getExcludedBy(self, category: str) -> list:
+        """
+        Returns the categories excluded by the specified category, through its own or its ancestors' isNot
+
+        Parameters
+        ----------
+        category : str
+            The category
+        """
+
+        # Return
+        return [self.categories[jcategory] for jcategory in unpackCategories(self.exclusionBits[[self.__getCategoryID(category)]], self.ncategories)[1]]
+
+    def mapCategories(self, categories: Iterable) -> np.ndarray:
+        """
+        Returns the IDs in the hierarchy of the specified categories, or -1 for the categories that are not part of it
+
+        Parameters
+        ----------
+        categories : Iterable
+            The categories, e.g. those of a classification
+        """
+
+        # Return
+        return np.array([self.categoryIDs.get(category, -1) for category in categories], dtype=np.int64)
+
+    def alignMatrix(self, matrix: np.ndarray, categories: Iterable) -> np.ndarray:
+        """
+        Returns a boolean matrix of the hierarchy restricted and reordered to the specified categories, which is false for the categories that are not part of the hierarchy
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            The boolean matrix, e.g. the ancestor or exclusion matrix
+        categories : Iterable
+            The categories, e.g. those of a classification
+        """
+
+        # Map the categories to the hierarchy
+        categoryIDs=self.mapCategories(categories)
+        isKnown=(categoryIDs>=0)
+
+        # Select the rows and columns of the known categories
+        alignedMatrix=np.zeros((len(categoryIDs), len(categoryIDs)), dtype=bool)
+        alignedMatrix[np.ix_(isKnown, isKnown)]=matrix[np.ix_(categoryIDs[isKnown], categoryIDs[isKnown])]
+
+        # Return
+        return alignedMatrix
+
+#############
+# Functions #
+#############
+
+#*************************#
+# Read category hierarchy #
+#*************************#
+
+def readCategoryHierarchy(file: str) -> categoryHierarchy:
+    """
+    Reads a categories JSON file and compiles its category hierarchy
+
+    Parameters
+    ----------
+    file : str
+        The path to the categories file
+    """
+
+    # Return
+    return categoryHierarchy(readJSONFile(file, mutable=False))
\ No newline at end of file
@@ -0,0 +1,713 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+import os
+
+import numpy as np
+
+# Local #
+
+from .countmatrix import mappedCountMatrix, resizeMappedArray
+from .classification import classification, combinedClassification, unpackCategories, mergeItems, buildIndexMap
+from ..fileio import readJSONFile, writeJSONFile, iterateGalaxies, stringTable
+
+if(TYPE_CHECKING):
+    from .hierarchy import categoryHierarchy
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['mappedCombinedClassification', 'combineClassificationFiles']
+
+#############
+# Constants #
+#############
+
+# Version of the layout of the directories of mapped combined classifications
+mappedCombinationVersion=1
+
+###########
+# Classes #
+###########
+
+#*******************#
+# Mapped item index #
+#*******************#
+
+class mappedItemIndex(Mapping):
+    """
+    A read-only mapping of the items of a mapped combined classification to their IDs, looked up in the sorted items by bisection and then among the pending items that have not been merged into them yet
+    """
+
+    def __init__(self, sortedItems: np.ndarray, order: np.ndarray) -> None:
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.sortedItems=sortedItems
+        self.order=order
+
+        # Initialize the pending items, in the order of their IDs
+        self.pendingItemIDs={}
+
+        # Return
+        return
+
+    def __len__(self) -> int:
+        return len(self.sortedItems)+len(self.pendingItemIDs)
+
+    def __iter__(self) -> Iterator:
+        return chain(self.sortedItems.tolist(), self.pendingItemIDs)
+
+    def __getitem__(self, item: str) -> int:
+        itemID=int(self.lookup([item,])[0])
+        if(itemID<0):
+            raise KeyError(item)
+        return itemID
+
+    def lookup(self, items: Iterable) -> np.ndarray:
+        """
+        Returns the IDs of the specified items, or -1 for the items that are not present
+
+        Parameters
+        ----------
+        items : Iterable
+            The items to be looked up
+        """
+
+        # Evaluate arguments
+        items=np.asarray(list(items), dtype=str)
+
+        # Bisect the sorted items
+        if(len(self.sortedItems)>0):
+            positions=np.minimum(np.searchsorted(self.sortedItems, items), len(self.sortedItems)-1)
+            itemIDs=np.where(self.sortedItems[positions]==items, self.order[positions], -1).astype(np.int64)
+        else:
+            itemIDs=np.full((len(items),), -1, dtype=np.int64)
+
+        # Look up the items that have not been found among the pending items
+        if(len(self.pendingItemIDs)>0):
+            for iitem in np.flatnonzero(itemIDs<0).tolist():
+                itemIDs[iitem]=self.pendingItemIDs.get(str(items[iitem]), -1)
+
+        # Return
+        return itemIDs
+
+#***************#
+# Mapped source #
+#***************#
+
+class mappedSource(dict):
+    """
+    A classification of a mapped combined classification, the classification object of which is only rebuilt from its memory-mapped arrays on first access
+    """
+
+    def __init__(self, build: Callable, **fields) -> None:
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        super().__init__(**fields)
+        self.build=build
+
+        # Return
+        return
+
+    def __missing__(self, key: str):
+        if(key!='classification'):
+            raise KeyError(key)
+        self['classification']=self.build(self)
+        return self['classification']
+
+#********************************#
+# Mapped combined classification #
+#********************************#
+
+class mappedCombinedClassification(combinedClassification):
+    """
+    A combination of classifications stored out of core in a directory, with the items, the counts and the classifications memory-mapped from .npy files
+    """
+
+    def __init__(self, directory: str, mode: str = "r+") -> None:
+        """
+        Constructor
+
+        Parameters
+        ----------
+        directory : str
+            The path to the directory of the combined classification
+        mode : str, optional
+            The mode in which the arrays are memory-mapped, either "r+" or "r" for read-only access (default is "r+")
+        """
+
+        # Evaluate arguments
+        assert (mode in ["r", "r+"]), "the requested mode is not available"
+        self.directory=os.path.expanduser(directory)
+        self.mode=mode
+
+        # Read the metadata
+        metadata=readJSONFile(self.__getFile("metadata.json"), quiet=True)
+        assert (metadata.get('version')==mappedCombinationVersion), "the combined classification has been written with an incompatible layout"
+
+        # Get metadata
+        self.categories=list(metadata['categories'])
+        self.categoryIDs=buildIndexMap(self.categories)
+        self.ncategories=len(self.categories)
+        self.nextSourceID=metadata['nextSourceID']
+
+        # Memory-map the items along with their sorted index, and the counts
+        self.items=np.load(self.__getFile("items.npy"), mmap_mode=mode)
+        self.itemIDs=mappedItemIndex(np.load(self.__getFile("sortedItems.npy"), mmap_mode='r'), np.load(self.__getFile("itemOrder.npy"), mmap_mode='r'))
+        self.nitems=len(self.items)
+        self.counts=mappedCountMatrix(self.__getFile("counts.npy"), mode=mode)
+        self.thresholdIndex=None
+        self.thresholdTable=None
+        self.modificationCount=0
+
+        # Memory-map the arrays of the classifications
+        self.sources=[self.__openSource(sourceMetadata) for sourceMetadata in metadata['sources']]
+        self.nclassifications=len(self.sources)
+
+        # Return
+        return
+
+    @classmethod
+    def create(cls, directory: str, categories: Iterable = ()) -> mappedCombinedClassification:
+        """
+        Creates an empty combined classification in the specified directory, which must not hold one already
+
+        Parameters
+        ----------
+        directory : str
+            The path to the directory of the combined classification
+        categories : Iterable, optional
+            The initial categories of the combined classification (default is no categories)
+        """
+
+        # Make sure that no combined classification is overwritten
+        directory=os.path.expanduser(directory)
+        assert (not os.path.exists(os.path.join(directory, "metadata.json"))), "the directory already holds a combined classification"
+
+        # Write the empty arrays
+        categories=list(dict.fromkeys(categories))
+        os.makedirs(os.path.join(directory, "sources"), exist_ok=True)
+        np.save(os.path.join(directory, "items.npy"), np.zeros((0,), dtype='<U1'))
+        np.save(os.path.join(directory, "sortedItems.npy"), np.zeros((0,), dtype='<U1'))
+        np.save(os.path.join(directory, "itemOrder.npy"), np.zeros((0,), dtype=np.int64))
+        mappedCountMatrix.create(os.path.join(directory, "counts.npy"), 0, len(categories))
+
+        # Write the metadata
+        writeJSONFile(os.path.join(directory, "metadata.json"), {'version': mappedCombinationVersion, 'categories': categories, 'nextSourceID': 0, 'sources': []}, atomic=True, quiet=True)
+
+        # Return
+        return cls(directory)
+
+    @property
+    def items(self) -> np.ndarray:
+        """
+        The memory-mapped items, into which the pending items are merged first
+        """
+
+        # Merge the pending items
+        self.__mergePendingItems()
+
+        # Return
+        return self.__items
+
+    @items.setter
+    def items(self, items: np.ndarray) -> None:
+        self.__items=items
+
+    @property
+    def counts(self) -> mappedCountMatrix:
+        """
+        The memory-mapped count matrix, into which the rows of the pending items are merged first
+        """
+
+        # Merge the pending items
+        self.__mergePendingItems()
+
+        # Return
+        return self.__counts
+
+    @counts.setter
+    def counts(self, counts: mappedCountMatrix) -> None:
+        self.__counts=counts
+
+    def __getFile(self, *names: str) -> str:
+        # Return the path to a file of the directory
+        return os.path.join(self.directory, *names)
+
+    def __saveArray(self, array: np.ndarray, *names: str) -> None:
+        # Write an array through a temporary file, so that the memory maps of the previous file stay valid
+        file=self.__getFile(*names)
+        temporaryFile=open(file+".tmp", mode='wb')
+        np.save(temporaryFile, array)
+        temporaryFile.close()
+        os.replace(file+".tmp", file)
+        return
+
+    def __openSource(self, sourceMetadata: dict) -> mappedSource:
+        # Memory-map the arrays of a classification
+        sourceID=sourceMetadata['id']
+        return mappedSource(self.__buildSourceClassification, id=sourceID, nitems=sourceMetadata['nitems'], categories=list(sourceMetadata['categories']), file=sourceMetadata['file'], itemIDs=np.load(self.__getFile("sources", f"{sourceID}.itemIDs.npy"), mmap_mode='r'), categoryBits=np.load(self.__getFile("sources", f"{sourceID}.categoryBits.npy"), mmap_mode='r'), comments=stringTable(np.load(self.__getFile("sources", f"{sourceID}.comments.npy"), mmap_mode='r'), np.load(self.__getFile("sources", f"{sourceID}.commentOffsets.npy"), mmap_mode='r')))
+
+    def __buildSourceClassification(self, source: mappedSource) -> classification:
+        # Rebuild a classification from its arrays, with its categories still memory-mapped
+        return classification.fromArrays(self.items[source['itemIDs']].tolist(), source['categoryBits'], source['comments'].getStrings(np.arange(source['nitems'])), source['categories'])
+
+    def __appendItems(self, newItems: list) -> None:
+        # Append the new items to the items, widening them if needed
+        newItems=np.asarray(newItems, dtype=str)
+        nitems=len(self.__items)
+        dtype=np.promote_types(self.__items.dtype, newItems.dtype)
+        self.__items=resizeMappedArray(self.__items, self.__getFile("items.npy"), (nitems+len(newItems),), dtype=dtype)
+        self.__items[nitems:]=newItems
+
+        # Insert the new items into the sorted index
+        order=np.argsort(newItems, kind='stable')
+        positions=np.searchsorted(self.itemIDs.sortedItems, newItems[order])
+        self.__saveArray(np.insert(np.asarray(self.itemIDs.sortedItems, dtype=dtype), positions, newItems[order]), "sortedItems.npy")
+        self.__saveArray(np.insert(np.asarray(self.itemIDs.order), positions, nitems+order), "itemOrder.npy")
+        self.itemIDs=mappedItemIndex(np.load(self.__getFile("sortedItems.npy"), mmap_mode='r'), np.load(self.__getFile("itemOrder.npy"), mmap_mode='r'))
+
+        # Add the rows of the new items to the counts
+        self.__counts.addRows(len(newItems))
+        self.nitems=nitems+len(newItems)
+
+        return
+
+    def __mergePendingItems(self) -> None:
+        # Append the items added one at a time since the last merge, all at once
+        if(len(self.itemIDs.pendingItemIDs)>0):
+            self.__appendItems(list(self.itemIDs.pendingItemIDs))
+        return
+
+    def __addSourcePairs(self, categoryBits: np.ndarray, ncategories: int, itemIDs: np.ndarray, categoryIDs: np.ndarray, weight: int) -> None:
+        # Add the (item, category) pairs of a classification to the counts, one block of its items at a time
+        nrows=self.counts.getRowsPerBlock()
+        for start in range(0, len(categoryBits), nrows):
+            itemIndices, categoryIndices=unpackCategories(np.asarray(categoryBits[start:start+nrows]), ncategories)
+            self.counts.addPairs(itemIDs[itemIndices+start], categoryIDs[categoryIndices], weight=weight)
+        return
+
+    def __invalidate(self) -> None:
+        # Discard the threshold index and table after a change of the counts
+        self.thresholdIndex=None
+        self.thresholdTable=None
+        self.modificationCount=self.modificationCount+1
+        if(os.path.exists(self.__getFile("thresholdTable.npy"))):
+            os.remove(self.__getFile("thresholdTable.npy"))
+        return
+
+    def flush(self) -> None:
+        """
+        Writes any changes of the items and counts to the directory, along with the metadata
+        """
+
+        # Make sure that the combined classification can be modified
+        assert (self.mode=="r+"), "the combined classification has been opened read-only"
+
+        # Flush the memory maps, once the pending items have been merged
+        self.items.flush()
+        self.counts.flush()
+
+        # Write the metadata
+        writeJSONFile(self.__getFile("metadata.json"), {'version': mappedCombinationVersion, 'categories': self.categories, 'nextSourceID': self.nextSourceID, 'sources': [{'id': source['id'], 'nitems': source['nitems'], 'categories': source['categories'], 'file': source['file']} for source in self.sources]}, atomic=True, quiet=True)
+
+        # Return
+        return
+
+    def getItemIDs(self) -> mappedItemIndex:
+        """
+        Returns the mapping of each item to its ID, looked up in the sorted items rather than held in a dictionary
+        """
+
+        # Return
+        return self.itemIDs
+
+    def addCategory(self, category: str) -> int:
+        """
+        Adds the specified category, if it is not already present, and returns its ID
+
+        Parameters
+        ----------
+        category : str
+            The category to be added
+        """
+
+        # Check whether the category is already present
+        if(category in self.categoryIDs):
+            return self.categoryIDs[category]
+
+        # Make sure that the combined classification can be modified
+        assert (self.mode=="r+"), "the combined classification has been opened read-only"
+
+        # Add the category, with no items in it
+        self.categoryIDs[category]=self.ncategories
+        self.categories.append(category)
+        self.ncategories=self.ncategories+1
+        self.counts.addColumns(1)
+        self.__invalidate()
+        self.flush()
+
+        # Return
+        return self.ncategories-1
+
+    def addItem(self, item: str) -> int:
+        """
+        Adds the specified item, if it is not already present, and returns its ID; the item is kept pending and merged into the arrays along with the other pending items on the next access to the items or counts, or on the next flush
+
+        Parameters
+        ----------
+        item : str
+            The item to be added
+        """
+
+        # Check whether the item is already present
+        if(item in self.itemIDs):
+            return self.itemIDs[item]
+
+        # Make sure that the combined classification can be modified
+        assert (self.mode=="r+"), "the combined classification has been opened read-only"
+
+        # Add the item to the pending items, in no categories and with no comments
+        self.itemIDs.pendingItemIDs[str(item)]=self.nitems
+        self.nitems=self.nitems+1
+        self.__invalidate()
+
+        # Return
+        return self.nitems-1
+
+    def addClassification(self, classification: classification, file: Optional[str] = None) -> None:
+        """
+        Folds the specified classification into the combined classification, adding any new items and categories, and writes its arrays to the directory so that it does not need to be kept in memory
+
+        Parameters
+        ----------
+        classification : classification
+            The classification to be added
+        file : str, optional
+            The path to the classification file the classification has been read from, which is recorded in the metadata (default is None)
+        """
+
+        # Make sure that the combined classification can be modified
+        assert (self.mode=="r+"), "the combined classification has been opened read-only"
+
+        # Fold in the classification and write its arrays
+        itemIDs=self.__foldClassification(classification)
+        self.__writeSource(itemIDs, np.asarray(classification.categoryBits), encodeStrings(classification.itemComments), list(classification.categories), file)
+
+        # Return
+        return
+
+    def addClassificationFile(self, file: str, categories: Iterable, blockSize: int = 65536, quiet: bool = False) -> None:
+        """
+        Reads the specified classification file and folds it into the combined classification one block of galaxies at a time, so that only a block of parsed galaxies and the compact arrays of the classification need to be in memory
+
+        Parameters
+        ----------
+        file : str
+            The path to the classification file
+        categories : Iterable
+            The categories of the classification
+        blockSize : int, optional
+            The number of galaxies parsed and folded in at once (default is 65536)
+        quiet : bool, optional
+            Should the console output be suppressed? (default is False)
+        """
+
+        # Make sure that the combined classification can be modified
+        assert (self.mode=="r+"), "the combined classification has been opened read-only"
+
+        # Fold in the galaxies of the file one block at a time, the categories of each block extending those of the previous ones
+        sourceCategories=list(categories)
+        itemIDBlocks=[np.zeros((0,), dtype=np.int64)]
+        categoryBitBlocks=[]
+        commentBlocks=[]
+        galaxies=iterateGalaxies(file, quiet=quiet)
+        while(True):
+            block=list(islice(galaxies, blockSize))
+            if(len(block)==0):
+                break
+            blockClassification=classification([galaxy['name'] for galaxy in block], [galaxy['categories'] for galaxy in block], [galaxy['comments'] for galaxy in block], sourceCategories)
+            sourceCategories=blockClassification.categories
+            itemIDBlocks.append(self.__foldClassification(blockClassification))
+            categoryBitBlocks.append(blockClassification.categoryBits)
+            commentBlocks.append(encodeStrings(blockClassification.itemComments))
+
+        # Join the arrays of the blocks, widening the bit matrices of the blocks that precede any added categories
+        nwords=max((len(sourceCategories)+63)//64, 1)
+        categoryBits=np.concatenate([np.zeros((0, nwords), dtype=np.uint64)]+[np.pad(bits, ((0, 0), (0, nwords-bits.shape[1]))) for bits in categoryBitBlocks])
+        commentOffsets=[np.zeros((1,), dtype=np.int64)]
+        for commentBlock in commentBlocks:
+            commentOffsets.append(commentBlock.offsets[1:]+commentOffsets[-1][-1])
+        comments=stringTable(np.concatenate([np.zeros((0,), dtype=np.uint8)]+[commentBlock.blob for commentBlock in commentBlocks]), np.concatenate(commentOffsets))
+
+        # Write the arrays of the classification
+        self.__writeSource(np.concatenate(itemIDBlocks), categoryBits, comments, sourceCategories, file)
+
+        # Return
+        return
+
+    def __foldClassification(self, classification: classification) -> np.ndarray:
+        # Merge the pending items, so that the new items of the classification follow them
+        self.__mergePendingItems()
+
+        # Add the new categories at once
+        newCategories=[category for category in dict.fromkeys(classification.categories) if(category not in self.categoryIDs)]
+        if(len(newCategories)>0):
+            for category in newCategories:
+                self.categoryIDs[category]=self.ncategories
+                self.categories.append(category)
+                self.ncategories=self.ncategories+1
+            self.counts.addColumns(len(newCategories))
+        categoryIDs=np.array([self.categoryIDs[category] for category in classification.categories], dtype=np.int64)
+
+        # Determine the IDs of the items of the classification, appending the new items at once
+        itemIDs=self.itemIDs.lookup(classification.items)
+        isNew=(itemIDs<0)
+        if(np.any(isNew)):
+            newItems, newItemIDs=mergeItems([[classification.items[iitem] for iitem in np.flatnonzero(isNew).tolist()],])
+            itemIDs[isNew]=self.nitems+newItemIDs[0]
+            self.__appendItems(newItems)
+
+        # Add the (item, category) pairs of the classification
+        self.__addSourcePairs(classification.categoryBits, classification.ncategories, itemIDs, categoryIDs, weight=1)
+        self.__invalidate()
+
+        # Return
+        return itemIDs
+
+    def __writeSource(self, itemIDs: np.ndarray, categoryBits: np.ndarray, comments: stringTable, categories: list, file: Optional[str]) -> None:
+        # Write the arrays of a classification
+        sourceID=self.nextSourceID
+        self.nextSourceID=self.nextSourceID+1
+        self.__saveArray(itemIDs, "sources", f"{sourceID}.itemIDs.npy")
+        self.__saveArray(categoryBits, "sources", f"{sourceID}.categoryBits.npy")
+        self.__saveArray(comments.blob, "sources", f"{sourceID}.comments.npy")
+        self.__saveArray(comments.offsets, "sources", f"{sourceID}.commentOffsets.npy")
+
+        # Keep the memory-mapped arrays of the classification in place of the classification
+        self.sources.append(self.__openSource({'id': sourceID, 'nitems': len(itemIDs), 'categories': categories, 'file': file}))
+        self.nclassifications=self.nclassifications+1
+        self.flush()
+
+        return
+
+    def removeClassification(self, classification: Union[classification, int]) -> None:
+        """
+        Retracts the counts and comments of the specified classification and deletes its arrays, keeping its items and categories
+
+        Parameters
+        ----------
+        classification : classification or int
+            The classification to be removed, or its index among the combined classifications, a classification only being found if it has been rebuilt by this combined classification
+        """
+
+        # Make sure that the combined classification can be modified
+        assert (self.mode=="r+"), "the combined classification has been opened read-only"
+
+        # Determine the index of the classification
+        isource=classification
+        if(not isinstance(classification, (int, np.integer))):
+            isource=next((jsource for jsource in range(len(self.sources)) if(('classification' in self.sources[jsource])and(self.sources[jsource]['classification'] is classification))), -1)
+
+        # Make sure that the classification has been found
+        assert (0<=isource<len(self.sources)), "the specified classification is not part of this combined classification"
+
+        # Retract the (item, category) pairs of the classification
+        source=self.sources.pop(int(isource))
+        categoryIDs=np.array([self.categoryIDs[category] for category in source['categories']], dtype=np.int64)
+        self.__addSourcePairs(source['categoryBits'], len(source['categories']), source['itemIDs'], categoryIDs, weight=-1)
+        self.__invalidate()
+        self.nclassifications=self.nclassifications-1
+        self.flush()
+
+        # Delete the arrays of the classification
+        for name in ["itemIDs", "categoryBits", "comments", "commentOffsets"]:
+            os.remove(self.__getFile("sources", f"{source['id']}.{name}.npy"))
+
+        # Return
+        return
+
+    def getThresholdTable(self, fractions: bool = False) -> np.ndarray:
+        """
+        Returns the number of items in each category for every threshold, as an array with one row per category and one column per threshold from 0 to the maximum count, counting the items one block at a time and keeping the table in the directory
+
+        Parameters
+        ----------
+        fractions : bool, optional
+            Should the fractions of items be returned rather than their numbers? (default is False)
+        """
+
+        # Get the table
+        table=self.__getThresholdTable()
+
+        # Return
+        return (table/max(self.nitems, 1) if fractions else table.copy())
+
+    def __getThresholdTable(self) -> np.ndarray:
+        # Read the table from the directory, or count the items if it is not there
+        if(self.thresholdTable is None):
+            if(os.path.exists(self.__getFile("thresholdTable.npy"))):
+                self.thresholdTable=np.load(self.__getFile("thresholdTable.npy"))
+            else:
+                # Accumulate the histogram of the counts of each category, widening it whenever a block holds a larger count than it covers, as an item listed more than once by a classification is counted every time
+                nbins=self.nclassifications+1
+                histogram=np.zeros((self.ncategories, nbins), dtype=np.int64)
+                offsets=np.arange(self.ncategories, dtype=np.int64)
+                nrows=self.counts.getRowsPerBlock()
+                for start in range(0, self.nitems, nrows):
+                    counts=np.asarray(self.counts.getRows(start, start+nrows), dtype=np.int64)
+                    if(counts.size==0):
+                        continue
+                    if(int(counts.max())>=nbins):
+                        histogram=np.pad(histogram, ((0, 0), (0, int(counts.max())+1-nbins)))
+                        nbins=histogram.shape[1]
+                    histogram+=np.bincount((offsets*nbins+counts).reshape(-1), minlength=self.ncategories*nbins).reshape((self.ncategories, nbins))
+
+                # Count the items at or above each threshold up to the maximum count
+                isPopulated=np.any(histogram[:,1:]>0, axis=0)
+                maxCount=(int(np.flatnonzero(isPopulated)[-1])+1 if np.any(isPopulated) else 0)
+                self.thresholdTable=np.cumsum(histogram[:,::-1], axis=1)[:,::-1][:,:maxCount+1]
+                self.thresholdTable[:,0]=self.nitems
+                if(self.mode=="r+"):
+                    self.__saveArray(self.thresholdTable, "thresholdTable.npy")
+
+        # Return
+        return self.thresholdTable
+
+    def getNumberOf(self, category: str, threshold: int = 1) -> int:
+        """
+        Determine the number of items in the specified category
+
+        Parameters
+        ----------
+        category : str
+            The category the number of items in which to determine
+        threshold : int
+            The number of times an item must have fallen within the category in order to be taken into account
+        """
+
+        # Look up the number of items in the table, rounding the threshold up to the smallest count that reaches it
+        table=self.__getThresholdTable()
+        icategory=self._classification__getCategoryID(category)
+        threshold=max(int(np.ceil(threshold)), 0)
+
+        # Return
+        return (int(table[icategory, threshold]) if threshold<table.shape[1] else 0)
+
+    def getItemsIn(self, category: str, threshold: int = 1) -> list:
+        """
+        Return the items in the specified category
+
+        Parameters
+        ----------
+        category : str
+            The category the items in which to return
+        threshold : int
+            The number of times an item must have fallen within the category in order to be taken into account
+        """
+
+        # Return
+        return self.items[np.flatnonzero(self.getMembershipOf(category, threshold=threshold))].tolist()
+
+    def rollUp(self, hierarchy: categoryHierarchy, directory: Optional[str] = None) -> combinedClassification:
+        """
+        Returns the combination of the classifications rolled up to the ancestors of their categories, so that every classification that puts an item in a category also counts towards the ancestors of that category, once
+
+        Parameters
+        ----------
+        hierarchy : categoryHierarchy
+            The category hierarchy
+        directory : str, optional
+            The path to the directory in which the rolled-up combination is stored out of core (default is None, for a combination in memory)
+        """
+
+        # Combine the rolled-up classifications in memory
+        if(directory is None):
+            return super().rollUp(hierarchy)
+
+        # Fold the rolled-up classifications into a new directory one at a time
+        rolledUp=mappedCombinedClassification.create(directory)
+        for source in self.sources:
+            rolledUp.addClassification(source['classification'].rollUp(hierarchy), file=source['file'])
+
+        # Return
+        return rolledUp
+
+#############
+# Functions #
+#############
+
+#****************#
+# Encode strings #
+#****************#
+
+def encodeStrings(strings: Iterable) -> stringTable:
+    """
+    Encodes strings, without interning them, as a table with one entry per string
+
+    Parameters
+    ----------
+    strings : Iterable
+        The strings to be encoded
+    """
+
+    # Encode all strings at once, their lengths in bytes only being those in characters if they are all ASCII
+    strings=list(strings)
+    blob=''.join(strings).encode('utf-8')
+    lengths=np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    if(len(blob)!=np.sum(lengths)):
+        lengths=np.fromiter((len(string.encode('utf-8')) for string in strings), dtype=np.int64, count=len(strings))
+
+    # Determine the offsets of the strings
+    offsets=np.zeros((len(strings)+1,), dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    # Return
+    return stringTable(np.frombuffer(blob, dtype=np.uint8), offsets)
+
+#******************************#
+# Combine classification files #
+#******************************#
+
+def combineClassificationFiles(files: list, categories: list, directory: str, quiet: bool = False) -> mappedCombinedClassification:
+    """
+    Combines classification files out of core, streaming the galaxies of one file at a time in blocks so that only the combined classification, a block of parsed galaxies and the compact arrays of a single classification need to be in memory
+
+    Parameters
+    ----------
+    files : list
+        The paths to the classification files
+    categories : list
+        The categories of the classification
+    directory : str
+        The path to the directory of the combined classification, which must not hold one already
+    quiet : bool, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Create the combined classification
+    combined=mappedCombinedClassification.create(directory, categories)
+
+    # Fold in the classification files, streaming the galaxies of each one block at a time
+    for file in files:
+        combined.addClassificationFile(file, categories, quiet=quiet)
+
+    # Return
+    return combined
\ No newline at end of file
@@ -0,0 +1,503 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+import re
+
+import numpy as np
+
+# Local #
+
+from .classification import classification, combinedClassification
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['categoryQuery', 'categoryTerm', 'andQuery', 'orQuery', 'notQuery', 'queryParser', 'queryEngine', 'parseQuery', 'selectItems']
+
+#############
+# Constants #
+#############
+
+# Pattern of the tokens of category queries
+queryTokenPattern=re.compile(r'\s*(?:(?P<open>\()|(?P<close>\))|(?P<and>&)|(?P<or>\|)|(?P<not>[~!])|(?:>=|≥)\s*(?P<threshold>-?\d+(?:\.\d*)?)|"(?P<quoted>[^"]*)"|(?P<word>[^\s()&|~!"≥>=]+))')
+
+# Words of the operators of category queries, which are case-insensitive
+queryOperators=['and', 'or', 'not']
+
+###########
+# Classes #
+###########
+
+#****************#
+# Category query #
+#****************#
+
+class categoryQuery(ABC):
+    """
+    A Boolean expression over the categories of the items of a classification, which can be combined through the &, | and ~ operators
+    """
+
+    def __and__(self, other: categoryQuery) -> andQuery:
+        return andQuery(self, other)
+
+    def __or__(self, other: categoryQuery) -> orQuery:
+        return orQuery(self, other)
+
+    def __invert__(self) -> notQuery:
+        return notQuery(self)
+
+    @abstractmethod
+    def getKey(self, threshold: int) -> tuple:
+        """
+        Returns a hashable key of the expression, under which its result is cached
+
+        Parameters
+        ----------
+        threshold : int
+            The vote threshold of the terms that do not specify their own
+        """
+
+    @abstractmethod
+    def evaluate(self, engine: queryEngine) -> np.ndarray:
+        """
+        Evaluates the expression for all items at once, evaluating its subexpressions through the engine
+
+        Parameters
+        ----------
+        engine : queryEngine
+            The engine of the classification
+        """
+
+#***************#
+# Category term #
+#***************#
+
+class categoryTerm(categoryQuery):
+    """
+    The membership of a single category, optionally with its own vote threshold, e.g. categoryTerm("Bar")>=3
+    """
+
+    def __init__(self, category: str, threshold: Optional[Union[int, float]] = None) -> None:
+        """
+        Constructor
+
+        Parameters
+        ----------
+        category : str
+            The category
+        threshold : int or float, optional
+            The number of times an item must have fallen within the category (default is None, for the threshold of the engine)
+        """
+
+        # Evaluate arguments
+        self.category=category
+        self.threshold=threshold
+
+        # Return
+        return
+
+    def __ge__(self, threshold: Union[int, float]) -> categoryTerm:
+        return categoryTerm(self.category, threshold=threshold)
+
+    def __repr__(self) -> str:
+        return (f'"{self.category}"' if self.threshold is None else f'"{self.category}">={self.threshold}')
+
+    def getKey(self, threshold: int) -> tuple:
+        return ('term', self.category, (self.threshold if self.threshold is not None else threshold))
+
+    def evaluate(self, engine: queryEngine) -> np.ndarray:
+        return engine.getMembershipOf(self.category, (self.threshold if self.threshold is not None else engine.threshold))
+
+#***********#
+# And query #
+#***********#
+
+class andQuery(categoryQuery):
+    """
+    The conjunction of expressions
+    """
+
+    def __init__(self, *operands: categoryQuery) -> None:
+        """
+        Constructor
+        """
+
+        # Flatten nested conjunctions
+        self.operands=tuple(operand for query in operands for operand in (query.operands if isinstance(query, andQuery) else (query,)))
+
+        # Return
+        return
+
+    def __repr__(self) -> str:
+        return '('+' AND '.join(map(repr, self.operands))+')'
+
+    def getKey(self, threshold: int) -> tuple:
+        return ('and',)+tuple(operand.getKey(threshold) for operand in self.operands)
+
+    def evaluate(self, engine: queryEngine) -> np.ndarray:
+        result=engine.evaluate(self.operands[0]).copy()
+        for operand in self.operands[1:]:
+            result&=engine.evaluate(operand)
+        return result
+
+#**********#
+# Or query #
+#**********#
+
+class orQuery(categoryQuery):
+    """
+    The disjunction of expressions
+    """
+
+    def __init__(self, *operands: categoryQuery) -> None:
+        """
+        Constructor
+        """
+
+        # Flatten nested disjunctions
+        self.operands=tuple(operand for query in operands for operand in (query.operands if isinstance(query, orQuery) else (query,)))
+
+        # Return
+        return
+
+    def __repr__(self) -> str:
+        return '('+' OR '.join(map(repr, self.operands))+')'
+
+    def getKey(self, threshold: int) -> tuple:
+        return ('or',)+tuple(operand.getKey(threshold) for operand in self.operands)
+
+    def evaluate(self, engine: queryEngine) -> np.ndarray:
+        result=engine.evaluate(self.operands[0]).copy()
+        for operand in self.operands[1:]:
+            result|=engine.evaluate(operand)
+        return result
+
+#***********#
+# Not query #
+#***********#
+
+class notQuery(categoryQuery):
+    """
+    The negation of an expression
+    """
+
+    def __init__(self, operand: categoryQuery) -> None:
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.operand=operand
+
+        # Return
+        return
+
+    def __repr__(self) -> str:
+        return 'NOT '+repr(self.operand)
+
+    def getKey(self, threshold: int) -> tuple:
+        return ('not', self.operand.getKey(threshold))
+
+    def evaluate(self, engine: queryEngine) -> np.ndarray:
+        return ~engine.evaluate(self.operand)
+
+#**************#
+# Query parser #
+#**************#
+
+class queryParser():
+    """
+    A recursive descent parser of category queries such as 'Disk AND Bar>=3 AND NOT ("Interacting" OR Merger)', with NOT binding tighter than AND and AND tighter than OR
+    """
+
+    def __init__(self, text: str) -> None:
+        """
+        Constructor
+
+        Parameters
+        ----------
+        text : str
+            The text of the query
+        """
+
+        # Evaluate arguments
+        self.text=text
+
+        # Split the text into tokens
+        self.tokens=[]
+        position=0
+        while(position<len(text)):
+            match=queryTokenPattern.match(text, position)
+            if((match is None)or(match.end()==position)):
+                if(text[position:].strip()):
+                    raise ValueError(f"invalid category query at position {position}: {text!r}")
+                break
+            position=match.end()
+            kind=match.lastgroup
+            if((kind=='word')and(match.group('word').lower() in queryOperators)):
+                self.tokens.append((match.group('word').lower(), None))
+            elif(kind=='quoted'):
+                self.tokens.append(('word', match.group('quoted')))
+            else:
+                self.tokens.append((kind, match.group(kind)))
+        self.itoken=0
+
+        # Return
+        return
+
+    def __peek(self) -> Optional[str]:
+        return (self.tokens[self.itoken][0] if self.itoken<len(self.tokens) else None)
+
+    def __expect(self, kind: str) -> Optional[str]:
+        if(self.__peek()!=kind):
+            raise ValueError(f"invalid category query, expected {kind} at token {self.itoken}: {self.text!r}")
+        self.itoken=self.itoken+1
+        return self.tokens[self.itoken-1][1]
+
+    def __parseOr(self) -> categoryQuery:
+        operands=[self.__parseAnd()]
+        while(self.__peek()=='or'):
+            self.__expect('or')
+            operands.append(self.__parseAnd())
+        return (orQuery(*operands) if len(operands)>1 else operands[0])
+
+    def __parseAnd(self) -> categoryQuery:
+        operands=[self.__parseNot()]
+        while(self.__peek()=='and'):
+            self.__expect('and')
+            operands.append(self.__parseNot())
+        return (andQuery(*operands) if len(operands)>1 else operands[0])
+
+    def __parseNot(self) -> categoryQuery:
+        if(self.__peek()=='not'):
+            self.__expect('not')
+            return notQuery(self.__parseNot())
+        return self.__parseAtom()
+
+    def __parseAtom(self) -> categoryQuery:
+        if(self.__peek()=='open'):
+            self.__expect('open')
+            query=self.__parseOr()
+            self.__expect('close')
+            return query
+        term=categoryTerm(self.__expect('word'))
+        if(self.__peek()=='threshold'):
+            threshold=self.__expect('threshold')
+            term=(term>=(float(threshold) if '.' in threshold else int(threshold)))
+        return term
+
+    def parse(self) -> categoryQuery:
+        """
+        Parses the query
+        """
+
+        # Parse the whole text
+        query=self.__parseOr()
+        if(self.__peek() is not None):
+            raise ValueError(f"invalid category query, unexpected {self.__peek()} at token {self.itoken}: {self.text!r}")
+
+        # Return
+        return query
+
+#**************#
+# Query engine #
+#**************#
+
+class queryEngine():
+    """
+    Evaluates category queries over all items of a classification at once, caching the results of their subexpressions
+    """
+
+    def __init__(self, classification: Union[classification, combinedClassification], threshold: Optional[Union[int, float]] = None) -> None:
+        """
+        Constructor
+
+        Parameters
+        ----------
+        classification : classification or combinedClassification
+            The classification
+        threshold : int or float, optional
+            The vote threshold of the terms that do not specify their own (default is None, for the default threshold of the classification, 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+        """
+
+        # Evaluate arguments
+        self.classification=classification
+        self.threshold=(getattr(classification, 'defaultThreshold', 1) if threshold is None else threshold)
+
+        # Initialize the cache of the results of the subexpressions
+        self.cache={}
+        self.state=self.__getState()
+
+        # Return
+        return
+
+    def __getState(self) -> int:
+        # Track the modifications of the classification, so that the cache is discarded when items, categories or classifications are added or removed
+        return self.classification.modificationCount
+
+    def clear(self) -> None:
+        """
+        Discards the cached results, which is needed if the categories or counts of existing items have been changed in place rather than through the methods of the classification
+        """
+
+        # Discard the cache
+        self.cache.clear()
+        self.state=self.__getState()
+
+        # Return
+        return
+
+    def getMembershipOf(self, category: str, threshold: int) -> np.ndarray:
+        """
+        Returns whether each item has fallen within the specified category at least the specified number of times
+
+        Parameters
+        ----------
+        category : str
+            The category
+        threshold : int
+            The number of times an item must have fallen within the category
+        """
+
+        # Make sure that the category is present
+        assert (category in self.classification.categoryIDs), f"the category '{category}' of the query is not part of the classification"
+
+        # Threshold the counts of a combined classification
+        if(isinstance(self.classification, combinedClassification)):
+            return self.classification.getMembershipOf(category, threshold=threshold)
+
+        # Each item of a single classification falls within each of its categories once
+        if(threshold<=0):
+            return np.ones((self.classification.nitems,), dtype=bool)
+        elif(threshold>1):
+            return np.zeros((self.classification.nitems,), dtype=bool)
+
+        # Return
+        return self.classification.getMembershipOf(category)
+
+    def evaluate(self, query: Union[categoryQuery, str]) -> np.ndarray:
+        """
+        Returns whether each item satisfies the specified query
+
+        Parameters
+        ----------
+        query : categoryQuery or str
+            The query, either as an expression or as text to be parsed
+        """
+
+        # Evaluate arguments
+        if(isinstance(query, str)):
+            query=parseQuery(query)
+
+        # Discard the cache if the classification has changed
+        if(self.__getState()!=self.state):
+            self.clear()
+
+        # Evaluate the query unless its result has been cached
+        key=query.getKey(self.threshold)
+        if(key not in self.cache):
+            result=query.evaluate(self)
+            result.flags.writeable=False
+            self.cache[key]=result
+
+        # Return
+        return self.cache[key]
+
+    def getItemsIn(self, query: Union[categoryQuery, str]) -> list:
+        """
+        Returns the items that satisfy the specified query
+
+        Parameters
+        ----------
+        query : categoryQuery or str
+            The query, either as an expression or as text to be parsed
+        """
+
+        # Determine the IDs of the items that satisfy the query
+        itemIDs=np.flatnonzero(self.evaluate(query))
+
+        # Gather the items at once from the array of a mapped combination, as Python strings
+        items=self.classification.items
+        if(isinstance(items, np.ndarray)):
+            return items[itemIDs].tolist()
+
+        # Return
+        return [items[iitem] for iitem in itemIDs.tolist()]
+
+    def getNumberOf(self, query: Union[categoryQuery, str]) -> int:
+        """
+        Returns the number of items that satisfy the specified query
+
+        Parameters
+        ----------
+        query : categoryQuery or str
+            The query, either as an expression or as text to be parsed
+        """
+
+        # Return
+        return int(np.count_nonzero(self.evaluate(query)))
+
+    def getFractionOf(self, query: Union[categoryQuery, str]) -> float:
+        """
+        Returns the fraction of items that satisfy the specified query
+
+        Parameters
+        ----------
+        query : categoryQuery or str
+            The query, either as an expression or as text to be parsed
+        """
+
+        # Return
+        return float(self.getNumberOf(query)/self.classification.nitems)
+
+#############
+# Functions #
+#############
+
+#*************#
+# Parse query #
+#*************#
+
+def parseQuery(text: str) -> categoryQuery:
+    """
+    Parses a category query such as 'Disk AND Bar>=3 AND NOT ("Interacting" OR Merger)', in which categories with spaces or operator characters are quoted and AND, OR and NOT may also be written as &, | and ~
+
+    Parameters
+    ----------
+    text : str
+        The text of the query
+    """
+
+    # Return
+    return queryParser(text).parse()
+
+#**************#
+# Select items #
+#**************#
+
+def selectItems(classification: Union[classification, combinedClassification], query: Union[categoryQuery, str], threshold: Optional[Union[int, float]] = None) -> list:
+    """
+    Returns the items of a classification that satisfy the specified query; use a queryEngine to cache subexpressions across queries
+
+    Parameters
+    ----------
+    classification : classification or combinedClassification
+        The classification
+    query : categoryQuery or str
+        The query, either as an expression or as text to be parsed
+    threshold : int or float, optional
+        The vote threshold of the terms that do not specify their own (default is None, for the default threshold of the classification, 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+    """
+
+    # Return
+    return queryEngine(classification, threshold=threshold).getItemsIn(query)
\ No newline at end of file
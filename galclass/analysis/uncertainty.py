@@ -0,0 +1,386 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import math
+
+import numpy as np
+
+# Local #
+
+from .classification import classification, combinedClassification, unpackCategories
+from .agreement import getChunkSize, iterateMembershipBlocks
+from .weighting import collectVotes
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['getWilsonIntervals', 'bootstrapFractions', 'jackknifeFractions']
+
+#############
+# Constants #
+#############
+
+# Number of classifications whose votes are encoded per word of the vote patterns, so that the codes are exact as float64 sums
+patternWordSize=52
+
+# Coefficients of the rational approximations of the inverse of the normal cumulative distribution function by Acklam, in its central region and in its tails
+acklamCentralNumerator=(-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02, 1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+acklamCentralDenominator=(-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02, 6.680131188771972e+01, -1.328068155288572e+01, 1.0)
+acklamTailNumerator=(-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00, -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+acklamTailDenominator=(7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00, 1.0)
+
+#############
+# Functions #
+#############
+
+#*************************#
+# Get membership patterns #
+#*************************#
+
+def getMembershipPatterns(classification: Union[classification, combinedClassification], threshold: Union[int, float] = 1, chunkSize: Optional[int] = None) -> tuple:
+    """
+    Groups the items by the set of categories they are in, as the fractions of any resample of the items only depend on how many items of each group it draws
+
+    Parameters
+    ----------
+    classification : classification or combinedClassification
+        The classification
+    threshold : int or float, optional
+        The number of times an item of a combined classification must have fallen within a category to be in it (default is 1)
+    chunkSize : int, optional
+        The number of items processed at once (default is None, for as many as fit in the memory budget)
+
+    Returns
+    -------
+    patterns : np.ndarray
+        Whether the items of each group are in each category, with one row per group and one column per category
+    counts : np.ndarray
+        The number of items of each group
+    """
+
+    # Pack the membership of each block of items into words of 64 bits
+    nwords=max((classification.ncategories+63)//64, 1)
+    codes=[]
+    for start, end, membership in iterateMembershipBlocks(classification, threshold=threshold, chunkSize=chunkSize):
+        packedMembership=np.zeros((end-start, 8*nwords), dtype=np.uint8)
+        packedMembership[:,:(classification.ncategories+7)//8]=np.packbits(membership, axis=1, bitorder='little')
+        codes.append(packedMembership.view('<u8'))
+    codes=(np.concatenate(codes) if codes else np.zeros((0, nwords), dtype='<u8'))
+
+    # Count the distinct sets of categories
+    if(nwords==1):
+        codes, counts=np.unique(codes[:,0], return_counts=True)
+        codes=codes[:,np.newaxis]
+    else:
+        codes, counts=np.unique(codes, axis=0, return_counts=True)
+
+    # Expand the sets of categories
+    patterns=np.zeros((len(codes), classification.ncategories), dtype=bool)
+    patterns[unpackCategories(codes.astype(np.uint64), classification.ncategories)]=True
+
+    # Return
+    return patterns, counts
+
+#*******************#
+# Get vote patterns #
+#*******************#
+
+def getVotePatterns(combined: combinedClassification, chunkSize: Optional[int] = None) -> tuple:
+    """
+    Groups the (item, category) entries of a combined classification by the set of classifications that voted for them, as the counts of any reweighting of the classifications only depend on these sets
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    chunkSize : int, optional
+        The number of items processed at once (default is None, for as many as fit in the memory budget)
+
+    Returns
+    -------
+    patterns : np.ndarray
+        Whether each classification voted for the entries of each group, with one row per group and one column per classification
+    categoryIndices : np.ndarray
+        The category of the entries of each group
+    counts : np.ndarray
+        The number of entries of each group, including the entries without votes
+    """
+
+    # Collect the votes, each item counting once per classification
+    votes=collectVotes(combined, distinct=True)
+    nclassifications=len(combined.sources)
+    nwords=max((nclassifications+patternWordSize-1)//patternWordSize, 1)
+    voteKeys=votes['itemIndices']*combined.ncategories+votes['categoryIndices']
+    voteValues=np.ldexp(1.0, votes['sourceIndices']%patternWordSize)
+    voteWords=votes['sourceIndices']//patternWordSize
+
+    # Encode the set of classifications that voted for each entry with votes, one block of items at a time
+    chunkSize=getChunkSize(8*nwords*combined.ncategories, chunkSize)
+    codes=[]
+    categoryIndices=[]
+    for start in range(0, combined.nitems, chunkSize):
+        end=min(start+chunkSize, combined.nitems)
+        isInBlock=((voteKeys>=start*combined.ncategories)&(voteKeys<end*combined.ncategories))
+        blockCodes=np.zeros(((end-start)*combined.ncategories, nwords), dtype=np.int64)
+        for iword in range(nwords):
+            isInWord=isInBlock&(voteWords==iword)
+            blockCodes[:,iword]=np.bincount(voteKeys[isInWord]-start*combined.ncategories, weights=voteValues[isInWord], minlength=(end-start)*combined.ncategories).astype(np.int64)
+        isVoted=np.any(blockCodes!=0, axis=1)
+        codes.append(blockCodes[isVoted])
+        categoryIndices.append(np.flatnonzero(isVoted)%combined.ncategories)
+    codes=np.concatenate(codes)
+    categoryIndices=np.concatenate(categoryIndices)
+
+    # Count the distinct sets of classifications per category, along with the entries without votes
+    patterns=[]
+    patternCategories=[]
+    counts=[]
+    for icategory in range(combined.ncategories):
+        categoryCodes, categoryCounts=np.unique(codes[categoryIndices==icategory], axis=0, return_counts=True)
+        patterns.append(np.concatenate((np.zeros((1, nwords), dtype=np.int64), categoryCodes)))
+        patternCategories.append(np.full(len(categoryCodes)+1, icategory, dtype=np.int64))
+        counts.append(np.concatenate(([combined.nitems-np.sum(categoryCounts)], categoryCounts)))
+    codes=np.concatenate(patterns)
+
+    # Expand the sets of classifications
+    isVoter=np.zeros((len(codes), nclassifications), dtype=bool)
+    for isource in range(nclassifications):
+        isVoter[:,isource]=((codes[:,isource//patternWordSize]>>(isource%patternWordSize))&1).astype(bool)
+
+    # Return
+    return isVoter, np.concatenate(patternCategories), np.concatenate(counts)
+
+#************************#
+# Evaluate vote patterns #
+#************************#
+
+def evaluateVotePatterns(patterns: tuple, weights: np.ndarray, threshold: Union[int, float], nitems: int, chunkSize: Optional[int] = None) -> np.ndarray:
+    """
+    Returns the fraction of items in each category for each reweighting of the classifications, e.g. a resample of them
+
+    Parameters
+    ----------
+    patterns : tuple
+        The vote patterns, as returned by getVotePatterns
+    weights : np.ndarray
+        The weight of each classification in each reweighting, with one row per reweighting and one column per classification
+    threshold : int or float
+        The weighted number of votes an item must have in a category to be in it
+    nitems : int
+        The number of items
+    chunkSize : int, optional
+        The number of reweightings processed at once (default is None, for as many as fit in the memory budget)
+    """
+
+    # Get the patterns, along with the number of entries of each pattern in each category
+    isVoter, categoryIndices, counts=patterns
+    ncategories=int(np.max(categoryIndices, initial=-1))+1
+    patternCounts=np.zeros((len(counts), ncategories), dtype=np.float64)
+    patternCounts[np.arange(len(counts)), categoryIndices]=counts
+    isVoter=isVoter.astype(np.float64)
+
+    # Count the items in each category for each block of reweightings
+    chunkSize=getChunkSize(8*len(counts), chunkSize)
+    fractions=np.zeros((len(weights), ncategories), dtype=np.float64)
+    for start in range(0, len(weights), chunkSize):
+        end=min(start+chunkSize, len(weights))
+        isMember=((weights[start:end]@isVoter.T)>=threshold)
+        fractions[start:end]=(isMember@patternCounts)/nitems
+
+    # Return
+    return fractions
+
+#*************#
+# Get z score #
+#*************#
+
+def getZScore(confidence: float) -> float:
+    """
+    Returns the number of standard deviations of a two-sided normal interval with the specified confidence
+
+    Parameters
+    ----------
+    confidence : float
+        The confidence level, e.g. 0.95
+    """
+
+    # Determine the upper quantile of the interval
+    probability=0.5+confidence/2
+    assert (0<probability<1), "the confidence level must lie between 0 and 1"
+
+    # Approximate the inverse of the normal cumulative distribution function through the rational functions of Acklam
+    def evaluate(coefficients, x):
+        return sum(coefficient*x**(len(coefficients)-1-icoefficient) for icoefficient, coefficient in enumerate(coefficients))
+    tailProbability=min(probability, 1-probability)
+    if(tailProbability>=0.02425):
+        q=probability-0.5
+        zscore=q*evaluate(acklamCentralNumerator, q*q)/evaluate(acklamCentralDenominator, q*q)
+    else:
+        q=math.sqrt(-2*math.log(tailProbability))
+        zscore=evaluate(acklamTailNumerator, q)/evaluate(acklamTailDenominator, q)
+        if(probability>0.5):
+            zscore=-zscore
+
+    # Refine the approximation to full precision with a step of the method of Halley
+    error=0.5*math.erfc(-zscore/math.sqrt(2))-probability
+    u=error*math.sqrt(2*math.pi)*math.exp(zscore*zscore/2)
+    zscore=zscore-u/(1+zscore*u/2)
+
+    # Return
+    return zscore
+
+#**********************#
+# Get Wilson intervals #
+#**********************#
+
+def getWilsonIntervals(classification: Union[classification, combinedClassification], threshold: Union[int, float] = 1, confidence: float = 0.95) -> dict:
+    """
+    Returns the fraction of items in each category along with its Wilson score interval
+
+    Parameters
+    ----------
+    classification : classification or combinedClassification
+        The classification
+    threshold : int or float, optional
+        The number of times an item of a combined classification must have fallen within a category to be in it (default is 1)
+    confidence : float, optional
+        The confidence level of the intervals (default is 0.95)
+
+    Returns
+    -------
+    estimates : dict
+        The fractions along with the lower and upper bounds of their intervals, one per category
+    """
+
+    # Count the items in each category
+    patterns, counts=getMembershipPatterns(classification, threshold=threshold)
+    fractions=(counts@patterns)/classification.nitems
+
+    # Determine the intervals
+    z=getZScore(confidence)
+    n=classification.nitems
+    center=(fractions+z**2/(2*n))/(1+z**2/n)
+    halfWidth=z/(1+z**2/n)*np.sqrt(fractions*(1-fractions)/n+z**2/(4*n**2))
+
+    # Return
+    return {'fractions': fractions, 'lower': center-halfWidth, 'upper': center+halfWidth}
+
+#*********************#
+# Bootstrap fractions #
+#*********************#
+
+def bootstrapFractions(classification: Union[classification, combinedClassification], threshold: Union[int, float] = 1, nresamples: int = 10000, over: str = "items", confidence: float = 0.95, seed: Optional[int] = None, chunkSize: Optional[int] = None) -> dict:
+    """
+    Estimates the uncertainty of the fraction of items in each category by resampling the items or the combined classifications with replacement
+
+    Parameters
+    ----------
+    classification : classification or combinedClassification
+        The classification
+    threshold : int or float, optional
+        The number of times an item of a combined classification must have fallen within a category to be in it (default is 1)
+    nresamples : int, optional
+        The number of resamples (default is 10000)
+    over : str, optional
+        What to resample, either "items" or "classifications" (default is "items")
+    confidence : float, optional
+        The confidence level of the percentile intervals (default is 0.95)
+    seed : int, optional
+        The seed of the random number generator (default is None)
+    chunkSize : int, optional
+        The number of resamples drawn at once (default is None, for as many as fit in the memory budget)
+
+    Returns
+    -------
+    estimates : dict
+        The fractions, their standard errors and the lower and upper bounds of their percentile intervals, one per category, along with the fractions of each resample
+    """
+
+    # Evaluate arguments
+    assert (over in ["items", "classifications"]), "the requested resampling is not available"
+    generator=np.random.default_rng(seed)
+
+    # Determine the fractions of each resample
+    if(over=="items"):
+        # Draw the number of items of each group of items with the same categories, rather than the items themselves
+        patterns, counts=getMembershipPatterns(classification, threshold=threshold)
+        fractions=(counts@patterns)/classification.nitems
+        patterns=patterns.astype(np.float64)
+        chunkSize=getChunkSize(8*len(counts), chunkSize)
+        samples=np.zeros((nresamples, classification.ncategories), dtype=np.float64)
+        for start in range(0, nresamples, chunkSize):
+            end=min(start+chunkSize, nresamples)
+            samples[start:end]=(generator.multinomial(classification.nitems, counts/classification.nitems, size=end-start)@patterns)/classification.nitems
+    else:
+        # Draw the number of times each classification is part of the resample
+        assert isinstance(classification, combinedClassification), "the classifications can only be resampled for a combined classification"
+        nclassifications=len(classification.sources)
+        votePatterns=getVotePatterns(classification)
+        fractions=evaluateVotePatterns(votePatterns, np.ones((1, nclassifications)), threshold, classification.nitems)[0]
+        weights=generator.multinomial(nclassifications, np.full(nclassifications, 1/nclassifications), size=nresamples).astype(np.float64)
+        samples=evaluateVotePatterns(votePatterns, weights, threshold, classification.nitems, chunkSize=chunkSize)
+
+    # Return
+    return {'fractions': fractions, 'standardErrors': np.std(samples, axis=0, ddof=1), 'lower': np.quantile(samples, (1-confidence)/2, axis=0), 'upper': np.quantile(samples, (1+confidence)/2, axis=0), 'samples': samples}
+
+#*********************#
+# Jackknife fractions #
+#*********************#
+
+def jackknifeFractions(classification: Union[classification, combinedClassification], threshold: Union[int, float] = 1, over: str = "items", confidence: float = 0.95) -> dict:
+    """
+    Estimates the uncertainty of the fraction of items in each category by leaving out one item or one combined classification at a time
+
+    Parameters
+    ----------
+    classification : classification or combinedClassification
+        The classification
+    threshold : int or float, optional
+        The number of times an item of a combined classification must have fallen within a category to be in it (default is 1)
+    over : str, optional
+        What to leave out, either "items" or "classifications" (default is "items")
+    confidence : float, optional
+        The confidence level of the normal intervals (default is 0.95)
+
+    Returns
+    -------
+    estimates : dict
+        The fractions, their standard errors and the lower and upper bounds of their normal intervals, one per category
+    """
+
+    # Evaluate arguments
+    assert (over in ["items", "classifications"]), "the requested resampling is not available"
+
+    # Determine the standard errors
+    if(over=="items"):
+        # Leaving out an item only changes the fractions by whether it is in each category, so the items in and out of each category are taken together
+        patterns, counts=getMembershipPatterns(classification, threshold=threshold)
+        n=classification.nitems
+        nin=(counts@patterns).astype(np.float64)
+        fractions=nin/n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance=(n-1)/n*(nin*((nin-1)/(n-1)-fractions)**2+(n-nin)*(nin/(n-1)-fractions)**2)
+    else:
+        # Leave out each classification through a weight of zero
+        assert isinstance(classification, combinedClassification), "the classifications can only be left out for a combined classification"
+        nclassifications=len(classification.sources)
+        votePatterns=getVotePatterns(classification)
+        fractions=evaluateVotePatterns(votePatterns, np.ones((1, nclassifications)), threshold, classification.nitems)[0]
+        samples=evaluateVotePatterns(votePatterns, 1-np.eye(nclassifications), threshold, classification.nitems)
+        variance=(nclassifications-1)/nclassifications*np.sum((samples-np.mean(samples, axis=0))**2, axis=0)
+
+    # Determine the normal intervals
+    standardErrors=np.sqrt(variance)
+    z=getZScore(confidence)
+
+    # Return
+    return {'fractions': fractions, 'standardErrors': standardErrors, 'lower': np.clip(fractions-z*standardErrors, 0, 1), 'upper': np.clip(fractions+z*standardErrors, 0, 1)}
\ No newline at end of file
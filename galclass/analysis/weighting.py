@@ -0,0 +1,449 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+
+# Local #
+
+from .countmatrix import denseCountMatrix, scoreIndex
+from .classification import classification, combinedClassification
+from ..misc import Console
+
+if(TYPE_CHECKING):
+    from .hierarchy import categoryHierarchy
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['weightedCombinedClassification', 'collectVotes', 'estimateDawidSkene']
+
+###########
+# Classes #
+###########
+
+#**********************************#
+# Weighted combined classification #
+#**********************************#
+
+class weightedCombinedClassification(combinedClassification):
+    """
+    A combination of classifications in which the vote of each classification is weighted by its reliability, with float consensus scores in place of the integer counts
+    """
+
+    # Class attributes
+    maxIterations=100
+    tolerance=1e-6
+
+    def __init__(self, classifications: Iterable, weights: Union[Iterable, str, None] = None) -> None:
+        """
+        Constructor
+
+        Parameters
+        ----------
+        classifications : Iterable
+            The classifications to be combined
+        weights : Iterable or str, optional
+            The weight of each classification, the score of an item in a category being the sum of the weights of the classifications that put it there, or "dawid-skene" to estimate the sensitivity and specificity of each classification in each category, the score being the posterior probability of the item being in the category (default is None, for unit weights, which give the integer counts back)
+        """
+
+        # Evaluate arguments
+        if(isinstance(weights, str)):
+            assert (weights=="dawid-skene"), "the requested weighting method is not available"
+            self.method=weights
+            self.classificationWeights=None
+        else:
+            self.method="fixed"
+            self.classificationWeights=(np.ones((len(classifications),), dtype=np.float64) if weights is None else np.array(list(weights), dtype=np.float64))
+            assert (len(self.classificationWeights)==len(classifications)), "the number of weights does not match the number of classifications"
+
+        # Determine the default threshold of the scores, the posteriors being probabilities
+        self.defaultThreshold=(0.5 if self.method=="dawid-skene" else 1)
+
+        # Initialize the reliability of the classifications
+        self.sensitivity=None
+        self.specificity=None
+        self.prior=None
+        self.niterations=0
+        self.converged=True
+
+        # Combine the items, categories and classifications, determining the scores in place of the counts
+        super().__init__(classifications)
+
+        # Return
+        return
+
+    def buildCounts(self, backend: str = "auto") -> denseCountMatrix:
+        """
+        Builds the matrix of the scores from the classifications, always stored as a dense array
+
+        Parameters
+        ----------
+        backend : str, optional
+            Ignored, as the scores are not integer counts (default is "auto")
+        """
+
+        # Collect the votes of the classifications, each item counting once per classification in the estimation of their reliability
+        votes=collectVotes(self, distinct=(self.method!="fixed"))
+
+        # Determine the scores
+        if(self.method=="fixed"):
+            scores=np.bincount(votes['itemIndices']*self.ncategories+votes['categoryIndices'], weights=self.classificationWeights[votes['sourceIndices']], minlength=self.nitems*self.ncategories).reshape((self.nitems, self.ncategories))
+        else:
+            estimate=estimateDawidSkene(votes, self.nitems, self.ncategories, len(self.sources), maxIterations=self.maxIterations, tolerance=self.tolerance)
+            scores=estimate['posteriors']
+            self.sensitivity=estimate['sensitivity']
+            self.specificity=estimate['specificity']
+            self.prior=estimate['prior']
+            self.niterations=estimate['niterations']
+            self.converged=estimate['converged']
+            if(not self.converged):
+                Console.printWarning(f"The Dawid-Skene estimation has not converged within {self.maxIterations} iterations")
+            # Weight each classification by its log diagnostic odds ratio, averaged over the categories
+            self.classificationWeights=np.mean(np.log(self.sensitivity*self.specificity)-np.log((1-self.sensitivity)*(1-self.specificity)), axis=1)
+
+        # Return
+        return denseCountMatrix(scores)
+
+    def __combine(self) -> None:
+        # Recompute the scores in place of the counts
+        self.counts=self.buildCounts()
+        self.thresholdIndex=None
+        self.modificationCount=self.modificationCount+1
+
+        # Return
+        return
+
+    def addClassification(self, classification: classification, weight: float = 1.0) -> None:
+        """
+        Folds the specified classification into the combination and recomputes the scores
+
+        Parameters
+        ----------
+        classification : classification
+            The classification to be added
+        weight : float, optional
+            The weight of the classification, if the weights are fixed (default is 1.0)
+        """
+
+        # Add the items, categories and classification
+        super().addClassification(classification)
+
+        # Add the weight of the classification and recompute the scores
+        if(self.method=="fixed"):
+            self.classificationWeights=np.append(self.classificationWeights, float(weight))
+        self.__combine()
+
+        # Return
+        return
+
+    def removeClassification(self, classification: Union[classification, int]) -> None:
+        """
+        Removes the specified classification from the combination and recomputes the scores
+
+        Parameters
+        ----------
+        classification : classification or int
+            The classification to be removed, or its index among the combined classifications
+        """
+
+        # Determine the index of the classification
+        isource=classification
+        if(not isinstance(classification, (int, np.integer))):
+            isource=next((jsource for jsource in range(len(self.sources)) if self.sources[jsource]['classification'] is classification), -1)
+
+        # Make sure that the classification has been found
+        assert (0<=isource<len(self.sources)), "the specified classification is not part of this combined classification"
+
+        # Remove the classification along with its weight and recompute the scores
+        super().removeClassification(int(isource))
+        if(self.method=="fixed"):
+            self.classificationWeights=np.delete(self.classificationWeights, int(isource))
+        self.__combine()
+
+        # Return
+        return
+
+    def getThresholdIndex(self) -> scoreIndex:
+        """
+        Returns the index of the items of each category sorted by their scores, building it on first use after any change of the scores
+        """
+
+        # Build the index if needed
+        if(self.thresholdIndex is None):
+            self.thresholdIndex=scoreIndex(self.counts)
+
+        # Return
+        return self.thresholdIndex
+
+    def encode(self, threshold: Optional[float] = None) -> tuple:
+        """
+        Encodes the categories in which the items have a positive score of at least the specified threshold as integer arrays of (item, category) pairs, sorted by item and category
+
+        Parameters
+        ----------
+        threshold : float, optional
+            The minimum score of the returned pairs (default is None, for 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+        """
+
+        # Evaluate arguments
+        threshold=(self.defaultThreshold if threshold is None else threshold)
+
+        # Get the scores
+        scores=self.counts.toarray()
+
+        # Return
+        return np.nonzero((scores>=threshold)&(scores>0))
+
+    def getMembershipOf(self, category: str, threshold: Optional[float] = None) -> np.ndarray:
+        """
+        Returns whether each item has a score of at least the specified threshold in the specified category
+
+        Parameters
+        ----------
+        category : str
+            The category the membership of which to return
+        threshold : float, optional
+            The minimum score of an item in the category (default is None, for 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+        """
+
+        # Return
+        return super().getMembershipOf(category, threshold=(self.defaultThreshold if threshold is None else threshold))
+
+    def getCategoriesOf(self, item: str, threshold: Optional[float] = None) -> list:
+        """
+        Return the categories in which the specified item has a score of at least the specified threshold
+
+        Parameters
+        ----------
+        item : str
+            The item the categories of which to return
+        threshold : float, optional
+            The minimum score of the item in a category (default is None, for 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+        """
+
+        # Return
+        return super().getCategoriesOf(item, threshold=(self.defaultThreshold if threshold is None else threshold))
+
+    def getNumberOf(self, category: str, threshold: Optional[float] = None) -> int:
+        """
+        Determine the number of items with a score of at least the specified threshold in the specified category
+
+        Parameters
+        ----------
+        category : str
+            The category the number of items in which to determine
+        threshold : float, optional
+            The minimum score of an item in the category (default is None, for 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+        """
+
+        # Return
+        return super().getNumberOf(category, threshold=(self.defaultThreshold if threshold is None else threshold))
+
+    def getFractionOf(self, category: str, threshold: Optional[float] = None) -> float:
+        """
+        Determines the fraction of items with a score of at least the specified threshold in the specified category
+
+        Parameters
+        ----------
+        category : str
+            The category the fraction of items in which to determine
+        threshold : float, optional
+            The minimum score of an item in the category (default is None, for 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+        """
+
+        # Return
+        return super().getFractionOf(category, threshold=(self.defaultThreshold if threshold is None else threshold))
+
+    def getItemsIn(self, category: str, threshold: Optional[float] = None) -> list:
+        """
+        Return the items with a score of at least the specified threshold in the specified category
+
+        Parameters
+        ----------
+        category : str
+            The category the items in which to return
+        threshold : float, optional
+            The minimum score of an item in the category (default is None, for 0.5 with the posteriors of Dawid-Skene and 1 otherwise)
+        """
+
+        # Return
+        return super().getItemsIn(category, threshold=(self.defaultThreshold if threshold is None else threshold))
+
+    def rollUp(self, hierarchy: categoryHierarchy) -> weightedCombinedClassification:
+        """
+        Returns the weighted combination of the classifications rolled up to the ancestors of their categories
+
+        Parameters
+        ----------
+        hierarchy : categoryHierarchy
+            The category hierarchy
+        """
+
+        # Return
+        return weightedCombinedClassification([source['classification'].rollUp(hierarchy) for source in self.sources], weights=(self.method if self.method!="fixed" else self.classificationWeights))
+
+#############
+# Functions #
+#############
+
+#***************#
+# Collect votes #
+#***************#
+
+def collectVotes(combined: combinedClassification, distinct: bool = True) -> dict:
+    """
+    Collects the votes of the classifications of a combination as flat arrays, along with the items each classification has rated
+
+    Parameters
+    ----------
+    combined : combinedClassification
+        The combined classification
+    distinct : bool, optional
+        Should the repeated votes and ratings of items that appear more than once in a classification be discarded? (default is True)
+
+    Returns
+    -------
+    votes : dict
+        The classification, item and category of each vote, and the classification and item of each rating
+    """
+
+    # Collect the (item, category) pairs and the rated items of each classification
+    sourceIndices=[]
+    itemIndices=[]
+    categoryIndices=[]
+    ratedSourceIndices=[]
+    ratedItemIndices=[]
+    for isource, source in enumerate(combined.sources):
+        # Map the pairs the classification had when it was added to the combined items and categories
+        localItemIndices, localCategoryIndices=source['classification'].encode()
+        categoryIDs=np.array([combined.categoryIDs.get(category, -1) for category in source['classification'].categories], dtype=np.int64)
+        isKept=(localItemIndices<source['nitems'])
+        isKept[isKept]=(categoryIDs[localCategoryIndices[isKept]]>=0)
+        keys=source['itemIDs'][localItemIndices[isKept]]*combined.ncategories+categoryIDs[localCategoryIndices[isKept]]
+        ratedItems=source['itemIDs']
+        # Discard the repeated votes and ratings of items that appear more than once in the classification
+        if(distinct and np.any(np.bincount(ratedItems, minlength=combined.nitems)>1)):
+            isVoted=np.zeros((combined.nitems*combined.ncategories,), dtype=bool)
+            isVoted[keys]=True
+            keys=np.flatnonzero(isVoted)
+            isRated=np.zeros((combined.nitems,), dtype=bool)
+            isRated[ratedItems]=True
+            ratedItems=np.flatnonzero(isRated)
+        sourceIndices.append(np.full(len(keys), isource, dtype=np.int64))
+        itemIndices.append(keys//combined.ncategories)
+        categoryIndices.append(keys%combined.ncategories)
+        ratedSourceIndices.append(np.full(len(ratedItems), isource, dtype=np.int64))
+        ratedItemIndices.append(ratedItems)
+
+    # Return
+    return {'sourceIndices': np.concatenate(sourceIndices), 'itemIndices': np.concatenate(itemIndices), 'categoryIndices': np.concatenate(categoryIndices), 'ratedSourceIndices': np.concatenate(ratedSourceIndices), 'ratedItemIndices': np.concatenate(ratedItemIndices)}
+
+#**********************#
+# Estimate Dawid-Skene #
+#**********************#
+
+def estimateDawidSkene(votes: dict, nitems: int, ncategories: int, nclassifications: int, maxIterations: int = 100, tolerance: float = 1e-6) -> dict:
+    """
+    Estimates the sensitivity and specificity of each classification in each category along with the posterior probability of each item being in each category, through the expectation-maximization of Dawid and Skene applied to each category as a binary label, accelerated by squared extrapolation (SQUAREM)
+
+    Parameters
+    ----------
+    votes : dict
+        The votes of the classifications, as returned by collectVotes
+    nitems : int
+        The number of items
+    ncategories : int
+        The number of categories
+    nclassifications : int
+        The number of classifications
+    maxIterations : int, optional
+        The maximum number of iterations, each of which extrapolates two expectation-maximization steps (default is 100)
+    tolerance : float, optional
+        The relative increase of the log-likelihood of the votes below which the iterations have converged (default is 1e-6)
+
+    Returns
+    -------
+    estimate : dict
+        The posteriors, with one row per item and one column per category, the sensitivity and specificity of each classification in each category, the prior of each category, the number of iterations and whether the iterations have converged
+    """
+
+    # Get the votes
+    sourceIndices=votes['sourceIndices']
+    itemIndices=votes['itemIndices']
+    categoryIndices=votes['categoryIndices']
+    voteKeys=itemIndices*ncategories+categoryIndices
+    sourceKeys=sourceIndices*ncategories+categoryIndices
+    nvotes=np.bincount(sourceKeys, minlength=nclassifications*ncategories).reshape((nclassifications, ncategories))
+
+    # Build the matrix of the items rated by each classification
+    rated=np.zeros((nitems, nclassifications), dtype=np.float32)
+    rated[votes['ratedItemIndices'], votes['ratedSourceIndices']]=1
+    nraters=np.sum(rated, axis=1, dtype=np.float64)
+    nratings=np.sum(rated, axis=0, dtype=np.float64)[:,np.newaxis]
+
+    def maximize(posteriors):
+        # Estimate the sensitivity and specificity of each classification in each category, with add-one smoothing, and the prior of each category, stacked as the rows of a single array
+        positive=rated.T@posteriors
+        negative=rated.T@(1-posteriors)
+        truePositive=np.bincount(sourceKeys, weights=posteriors.ravel()[voteKeys], minlength=nclassifications*ncategories).reshape((nclassifications, ncategories))
+        falsePositive=nvotes-truePositive
+        sensitivity=(truePositive+1)/(positive+2)
+        specificity=(negative-falsePositive+1)/(negative+2)
+        prior=(np.sum(posteriors, axis=0, dtype=np.float64)+1)/(nitems+2)
+        return np.concatenate([sensitivity, specificity, prior[np.newaxis]])
+
+    def expect(parameters):
+        # Accumulate the log-odds of each item being in each category, from the missing votes of the rating classifications and then from their votes
+        sensitivity, specificity, prior=parameters[:nclassifications], parameters[nclassifications:-1], parameters[-1]
+        missingWeights=np.log(1-sensitivity)-np.log(specificity)
+        voteWeights=np.log(sensitivity)-np.log(1-specificity)-missingWeights
+        logOdds=(np.log(prior)-np.log(1-prior)).astype(np.float32)+rated@missingWeights.astype(np.float32)
+        logOdds+=np.bincount(voteKeys, weights=voteWeights.ravel()[sourceKeys], minlength=nitems*ncategories).reshape((nitems, ncategories)).astype(np.float32)
+        # Determine the posteriors through the exponential of minus the absolute log-odds, which cannot overflow
+        odds=np.exp(-np.abs(logOdds))
+        posteriors=np.where(logOdds>=0, 1, odds)/(1+odds)
+        # Add the log-likelihood of the votes given that no item is in any category to that of the log-odds
+        logLikelihood=nitems*np.sum(np.log(1-prior))+np.sum(nratings*np.log(specificity))+np.sum(nvotes*(np.log(1-specificity)-np.log(specificity)))
+        logLikelihood=float(logLikelihood+np.sum(np.maximum(logOdds, 0), dtype=np.float64)+np.sum(np.log1p(odds), dtype=np.float64))
+        return posteriors, logLikelihood
+
+    # Initialize the parameters from the majority vote, as the fractions of the rating classifications that put each item in each category
+    parameters=maximize((np.bincount(voteKeys, minlength=nitems*ncategories).reshape((nitems, ncategories))/np.maximum(nraters, 1)[:,np.newaxis]).astype(np.float32))
+    posteriors, logLikelihood=expect(parameters)
+
+    # Iterate
+    converged=False
+    for iiteration in range(1, maxIterations+1):
+        # Take two expectation-maximization steps
+        parameters1=maximize(posteriors)
+        posteriors1, logLikelihood1=expect(parameters1)
+        parameters2=maximize(posteriors1)
+        posteriors2, logLikelihood2=expect(parameters2)
+
+        # Extrapolate the parameters along the steps, keeping the second step if the extrapolation lowers the log-likelihood
+        step=parameters1-parameters
+        curvature=parameters2-parameters1-step
+        stepLength=min(-np.sqrt(np.sum(step**2)/max(np.sum(curvature**2), np.finfo(np.float64).tiny)), -1.0)
+        parameters3=np.clip(parameters-2*stepLength*step+stepLength**2*curvature, 1e-9, 1-1e-9)
+        posteriors3, logLikelihood3=expect(parameters3)
+        if(logLikelihood3<logLikelihood2):
+            parameters3, posteriors3, logLikelihood3=parameters2, posteriors2, logLikelihood2
+
+        # Check whether the log-likelihood of the votes has converged
+        converged=(logLikelihood3-logLikelihood<=tolerance*abs(logLikelihood3))
+        parameters, posteriors, logLikelihood=parameters3, posteriors3, logLikelihood3
+        if(converged):
+            break
+
+    # Return
+    return {'posteriors': posteriors, 'sensitivity': parameters[:nclassifications], 'specificity': parameters[nclassifications:-1], 'prior': parameters[-1], 'niterations': iiteration, 'converged': converged}
\ No newline at end of file
@@ -8,4 +8,10 @@ A submodule for file input/output operations.
 
 # Local #
 
-from .jsonio import *
\ No newline at end of file
+from .cacheio import *
+from .jsonio import *
+from .jsonlinesio import *
+from .journalio import *
+from .sqliteio import *
+from .catalogio import *
+from .indexio import *
\ No newline at end of file
@@ -0,0 +1,344 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from typing import Callable, Optional
+
+import os
+import threading
+
+from collections import OrderedDict
+
+# Local #
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['fileCache', 'enableFileCache', 'disableFileCache', 'getFileCacheStats', 'readCachedFile']
+
+###########
+# Classes #
+###########
+
+#****************#
+# Read-only dict #
+#****************#
+
+class readOnlyDict(dict):
+    """
+    A dictionary that cannot be modified, shared between the readers of a cached file
+    """
+
+    def __readOnly(self, *args, **kwargs):
+        raise TypeError("this dictionary is shared by the file cache and cannot be modified; read the file with mutable=True to get a private copy")
+
+    __setitem__=__delitem__=__ior__=clear=pop=popitem=setdefault=update=__readOnly
+
+    def __reduce__(self):
+        return (readOnlyDict, (dict(self),))
+
+#****************#
+# Read-only list #
+#****************#
+
+class readOnlyList(list):
+    """
+    A list that cannot be modified, shared between the readers of a cached file
+    """
+
+    def __readOnly(self, *args, **kwargs):
+        raise TypeError("this list is shared by the file cache and cannot be modified; read the file with mutable=True to get a private copy")
+
+    __setitem__=__delitem__=__iadd__=__imul__=append=extend=insert=pop=remove=clear=sort=reverse=__readOnly
+
+    def __reduce__(self):
+        return (readOnlyList, (list(self),))
+
+#************#
+# File cache #
+#************#
+
+class fileCache():
+    """
+    A least-recently-used cache of the parsed contents of files, which are validated against the size and modification time of the files
+    """
+
+    def __init__(self, maxBytes: int):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.maxBytes=maxBytes
+
+        # Initialize the entries, by absolute path, along with the total size of the cached files
+        self.entries=OrderedDict()
+        self.nbytes=0
+
+        # Initialize the counters
+        self.nhits=0
+        self.nmisses=0
+        self.nevictions=0
+
+        # Initialize the lock, as files may be read from worker threads
+        self.lock=threading.Lock()
+
+        # Return
+        return
+
+    def get(self, path: str, stat: os.stat_result):
+        """
+        Returns the cached contents of the specified file, or None if they are missing or out of date
+
+        Parameters
+        ----------
+        path : str
+            The absolute path to the file
+        stat : os.stat_result
+            The current status of the file
+        """
+
+        with self.lock:
+            # Look up the entry of the file
+            entry=self.entries.get(path)
+            if((entry is None)or(entry['size']!=stat.st_size)or(entry['mtime']!=stat.st_mtime_ns)):
+                self.nmisses=self.nmisses+1
+                return None
+            # Mark the entry as the most recently used one
+            self.entries.move_to_end(path)
+            self.nhits=self.nhits+1
+
+        # Return
+        return entry['data']
+
+    def put(self, path: str, stat: os.stat_result, data, nbytes: int) -> None:
+        """
+        Caches the contents of the specified file, evicting the least recently used entries to stay within the size budget
+
+        Parameters
+        ----------
+        path : str
+            The absolute path to the file
+        stat : os.stat_result
+            The status of the file before it was read
+        data : object
+            The read-only contents of the file
+        nbytes : int
+            The size of the contents of the file that counts towards the size budget
+        """
+
+        with self.lock:
+            # Discard the previous entry of the file
+            self.__discard(path)
+            # Check whether the file fits in the cache at all
+            if(nbytes>self.maxBytes):
+                return
+            # Cache the contents of the file
+            self.entries[path]={'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'nbytes': nbytes, 'data': data}
+            self.nbytes=self.nbytes+nbytes
+            # Evict the least recently used entries
+            while(self.nbytes>self.maxBytes):
+                self.__discard(next(iter(self.entries)))
+                self.nevictions=self.nevictions+1
+
+        # Return
+        return
+
+    def __discard(self, path: str) -> None:
+        # Remove the entry of the file, if any
+        entry=self.entries.pop(path, None)
+        if(entry is not None):
+            self.nbytes=self.nbytes-entry['nbytes']
+        return
+
+    def resize(self, maxBytes: int) -> None:
+        """
+        Changes the size budget of the cache, evicting the least recently used entries that no longer fit
+
+        Parameters
+        ----------
+        maxBytes : int
+            The size budget of the cache in bytes
+        """
+
+        with self.lock:
+            self.maxBytes=maxBytes
+            while(self.nbytes>self.maxBytes):
+                self.__discard(next(iter(self.entries)))
+                self.nevictions=self.nevictions+1
+
+        # Return
+        return
+
+    def clear(self) -> None:
+        """
+        Discards all entries of the cache, keeping the counters
+        """
+
+        with self.lock:
+            self.entries.clear()
+            self.nbytes=0
+
+        # Return
+        return
+
+    def getStats(self) -> dict:
+        """
+        Returns the counters and the current occupancy of the cache
+        """
+
+        with self.lock:
+            stats={'hits': self.nhits, 'misses': self.nmisses, 'evictions': self.nevictions, 'entries': len(self.entries), 'bytes': self.nbytes, 'maxBytes': self.maxBytes}
+
+        # Return
+        return stats
+
+#############
+# Functions #
+#############
+
+#*************#
+# Freeze JSON #
+#*************#
+
+def freezeJSON(data):
+    """
+    Returns a read-only copy of parsed JSON data, in which dictionaries and lists cannot be modified
+
+    Parameters
+    ----------
+    data : object
+        The parsed JSON data
+    """
+
+    # Freeze containers recursively
+    if(isinstance(data, dict)):
+        return readOnlyDict({key: freezeJSON(value) for key, value in data.items()})
+    elif(isinstance(data, list)):
+        return readOnlyList([freezeJSON(value) for value in data])
+
+    # Return
+    return data
+
+#***********#
+# Thaw JSON #
+#***********#
+
+def thawJSON(data):
+    """
+    Returns a modifiable copy of read-only JSON data
+
+    Parameters
+    ----------
+    data : object
+        The read-only JSON data
+    """
+
+    # Copy containers recursively
+    if(isinstance(data, dict)):
+        return {key: thawJSON(value) for key, value in data.items()}
+    elif(isinstance(data, list)):
+        return [thawJSON(value) for value in data]
+
+    # Return
+    return data
+
+#*******************#
+# Enable file cache #
+#*******************#
+
+def enableFileCache(maxBytes: int = 268435456) -> None:
+    """
+    Enables the cache of the parsed contents of the files read by readJSONFile and readGalaxiesFile
+
+    Parameters
+    ----------
+    maxBytes : int, optional
+        The size budget of the cache, as the total size of the cached files in bytes (default is 268435456)
+    """
+
+    global activeFileCache
+
+    # Create the cache, or resize it if it is already enabled
+    if(activeFileCache is None):
+        activeFileCache=fileCache(maxBytes)
+    else:
+        activeFileCache.resize(maxBytes)
+
+    # Return
+    return
+
+#********************#
+# Disable file cache #
+#********************#
+
+def disableFileCache() -> None:
+    """
+    Disables the cache of the parsed contents of files and discards its entries
+    """
+
+    global activeFileCache
+
+    # Discard the cache
+    activeFileCache=None
+
+    # Return
+    return
+
+#**********************#
+# Get file cache stats #
+#**********************#
+
+def getFileCacheStats() -> Optional[dict]:
+    """
+    Returns the hit, miss and eviction counters along with the occupancy of the file cache, or None if it is disabled
+    """
+
+    # Return
+    return (activeFileCache.getStats() if activeFileCache is not None else None)
+
+#******************#
+# Read cached file #
+#******************#
+
+def readCachedFile(inputFile: str, read: Callable, mutable: bool = True):
+    """
+    Reads a file through the file cache, if it is enabled
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the file
+    read : Callable
+        A function that reads and parses the file, returning its contents along with the size that counts towards the size budget
+    mutable : bool, optional
+        Should a private, modifiable copy be returned rather than the read-only contents shared with the cache? (default is True)
+    """
+
+    # Read the file directly if the cache is disabled
+    cache=activeFileCache
+    if(cache is None):
+        return read()[0]
+
+    # Look up the file, determining its status before it is read so that any concurrent change invalidates the entry
+    path=os.path.abspath(os.path.expanduser(inputFile))
+    stat=os.stat(path)
+    data=cache.get(path, stat)
+    if(data is None):
+        data, nbytes=read()
+        data=freezeJSON(data)
+        cache.put(path, stat, data, nbytes)
+
+    # Return
+    return (thawJSON(data) if mutable else data)
+
+#####################
+# Active file cache #
+#####################
+
+# Active file cache, which is enabled through the GALCLASS_FILE_CACHE environment variable (with the size budget in bytes) or enableFileCache
+activeFileCache=(fileCache(int(os.environ['GALCLASS_FILE_CACHE'])) if os.environ.get('GALCLASS_FILE_CACHE') else None)
\ No newline at end of file
@@ -0,0 +1,553 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from typing import Optional
+
+import os
+import json
+import hashlib
+
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import numpy as np
+
+# Local #
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['stringTable', 'compiledCatalog', 'getGalaxyNames', 'getGalaxyAliases', 'computeFileHash', 'writeCatalogCache', 'readCatalogCache']
+
+#############
+# Constants #
+#############
+
+# Suffix of the catalog cache directories
+catalogCacheSuffix=".cache"
+
+# Version of the layout of the catalog caches
+catalogCacheVersion=2
+
+# Fields of the galaxy entries that are stored as strings
+catalogStringFields=['name', 'preview']
+
+# Fields of the galaxy entries that are stored as lists of strings, each with its own offsets
+catalogStringListFields=['aliases', 'filters', 'files']
+
+# Fields of the galaxy entries that are stored as JSON encoded strings
+catalogJSONFields=['info']
+
+# Fields of the galaxy entries that are stored as lists of JSON encoded strings, each with its own offsets
+catalogJSONListFields=['fileInfo']
+
+###########
+# Classes #
+###########
+
+#**************#
+# String table #
+#**************#
+
+class stringTable():
+    """
+    A table of interned strings stored as a single UTF-8 blob along with the offsets of each string
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.blob=blob
+        self.offsets=offsets
+
+        # Get metadata
+        self.nstrings=len(offsets)-1
+
+        # Return
+        return
+
+    def __len__(self) -> int:
+        return self.nstrings
+
+    def __getitem__(self, istring: int) -> str:
+        """
+        Returns the string with the specified ID
+
+        Parameters
+        ----------
+        istring : int
+            The ID of the string to return
+        """
+
+        # Return
+        return self.blob[self.offsets[istring]:self.offsets[istring+1]].tobytes().decode('utf-8')
+
+    def getStrings(self, istrings: np.ndarray) -> list:
+        """
+        Returns the strings with the specified IDs
+
+        Parameters
+        ----------
+        istrings : np.ndarray
+            The IDs of the strings to return
+        """
+
+        # Decode the whole blob once and slice it
+        blob=self.blob.tobytes()
+        offsets=self.offsets.tolist()
+
+        # Return
+        return [blob[offsets[istring]:offsets[istring+1]].decode('utf-8') for istring in np.asarray(istrings).tolist()]
+
+    @staticmethod
+    def build(strings: list) -> tuple:
+        """
+        Interns a list of strings
+
+        Parameters
+        ----------
+        strings : list
+            The strings to intern
+
+        Returns
+        -------
+        table : stringTable
+            The table of the unique strings
+        istrings : np.ndarray
+            The IDs of the specified strings in the table
+        """
+
+        # Intern the strings
+        stringIDs={}
+        istrings=np.empty((len(strings),), dtype=np.int32)
+        for index, string in enumerate(strings):
+            istring=stringIDs.get(string)
+            if(istring is None):
+                istring=len(stringIDs)
+                stringIDs[string]=istring
+            istrings[index]=istring
+
+        # Encode the unique strings
+        encodedStrings=[string.encode('utf-8') for string in stringIDs.keys()]
+        offsets=np.zeros((len(encodedStrings)+1,), dtype=np.int64)
+        offsets[1:]=np.cumsum([len(encodedString) for encodedString in encodedStrings], dtype=np.int64)
+        blob=np.frombuffer(b''.join(encodedStrings), dtype=np.uint8)
+
+        # Return
+        return stringTable(blob, offsets), istrings
+
+#******************#
+# Compiled catalog #
+#******************#
+
+class compiledCatalog(Sequence):
+    """
+    A read-only sequence of the validated and augmented galaxy entries of an input list, backed by the arrays of a catalog cache
+    """
+
+    # Class attributes
+    maxCachedGalaxies=64
+
+    def __init__(self, arrays: dict):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.arrays=arrays
+        self.strings=stringTable(arrays['strings'], arrays['stringOffsets'])
+
+        # Get metadata
+        self.ngalaxies=len(arrays['name'])
+
+        # Initialize the cache of recently accessed galaxy entries
+        self.cachedGalaxies=OrderedDict()
+
+        # Return
+        return
+
+    def __len__(self) -> int:
+        return self.ngalaxies
+
+    def __getitem__(self, igalaxy: int) -> dict:
+        """
+        Returns the galaxy entry with the specified ID
+
+        Parameters
+        ----------
+        igalaxy : int
+            The ID of the galaxy entry to return
+        """
+
+        # Evaluate arguments
+        if(isinstance(igalaxy, slice)):
+            return [self[jgalaxy] for jgalaxy in range(*igalaxy.indices(self.ngalaxies))]
+        if(igalaxy<0):
+            igalaxy=igalaxy+self.ngalaxies
+        if((igalaxy<0)or(igalaxy>=self.ngalaxies)):
+            raise IndexError("galaxy index out of range")
+
+        # Check whether the galaxy entry has been recently accessed
+        if(igalaxy in self.cachedGalaxies):
+            self.cachedGalaxies.move_to_end(igalaxy)
+            return self.cachedGalaxies[igalaxy]
+
+        # Decode the galaxy entry
+        galaxy=json.loads(self.strings[self.arrays['extra'][igalaxy]])
+        for field in catalogStringFields:
+            galaxy[field]=self.strings[self.arrays[field][igalaxy]]
+        for field in catalogStringListFields:
+            offsets=self.arrays[field+'Offsets']
+            galaxy[field]=[self.strings[istring] for istring in self.arrays[field][offsets[igalaxy]:offsets[igalaxy+1]]]
+        for field in catalogJSONFields:
+            galaxy[field]=json.loads(self.strings[self.arrays[field][igalaxy]])
+        for field in catalogJSONListFields:
+            offsets=self.arrays[field+'Offsets']
+            galaxy[field]=[json.loads(self.strings[istring]) for istring in self.arrays[field][offsets[igalaxy]:offsets[igalaxy+1]]]
+
+        # Cache the galaxy entry
+        self.cachedGalaxies[igalaxy]=galaxy
+        if(len(self.cachedGalaxies)>self.maxCachedGalaxies):
+            self.cachedGalaxies.popitem(last=False)
+
+        # Return
+        return galaxy
+
+    def getNames(self) -> list:
+        """
+        Returns the names of all galaxies
+        """
+
+        # Return
+        return self.strings.getStrings(self.arrays['name'])
+
+    def getAliases(self) -> list:
+        """
+        Returns the aliases of all galaxies
+        """
+
+        # Decode the aliases of all galaxies at once
+        aliases=self.strings.getStrings(self.arrays['aliases'])
+        offsets=self.arrays['aliasesOffsets'].tolist()
+
+        # Return
+        return [aliases[offsets[igalaxy]:offsets[igalaxy+1]] for igalaxy in range(self.ngalaxies)]
+
+#############
+# Functions #
+#############
+
+#******************#
+# Get galaxy names #
+#******************#
+
+def getGalaxyNames(galaxies: Sequence) -> list:
+    """
+    Returns the names of the specified galaxy entries
+
+    Parameters
+    ----------
+    galaxies : Sequence
+        The galaxy entries
+    """
+
+    # Use the bulk accessor of catalogs
+    if(hasattr(galaxies, 'getNames')):
+        return galaxies.getNames()
+
+    # Return
+    return [galaxy['name'] for galaxy in galaxies]
+
+#********************#
+# Get galaxy aliases #
+#********************#
+
+def getGalaxyAliases(galaxies: Sequence) -> list:
+    """
+    Returns the aliases of the specified galaxy entries
+
+    Parameters
+    ----------
+    galaxies : Sequence
+        The galaxy entries
+    """
+
+    # Use the bulk accessor of catalogs
+    if(hasattr(galaxies, 'getAliases')):
+        return galaxies.getAliases()
+
+    # Return
+    return [galaxy['aliases'] for galaxy in galaxies]
+
+#***********************#
+# Get catalog cache dir #
+#***********************#
+
+def getCatalogCacheDir(inputFile: str) -> str:
+    """
+    Returns the path to the catalog cache directory of the specified input file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    """
+
+    # Return
+    return os.path.expanduser(inputFile)+catalogCacheSuffix
+
+#*******************#
+# Compute file hash #
+#*******************#
+
+def computeFileHash(inputFile: str, chunkSize: int = 16777216) -> str:
+    """
+    Computes the hash of the contents of a file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the file
+    chunkSize : int, optional
+        The number of bytes hashed at once (default is 16777216)
+    """
+
+    # Hash the file in chunks
+    fileHash=hashlib.blake2b(digest_size=32)
+    file=open(os.path.expanduser(inputFile), mode='rb')
+    while(True):
+        chunk=file.read(chunkSize)
+        if(not chunk):
+            break
+        fileHash.update(chunk)
+    file.close()
+
+    # Return
+    return fileHash.hexdigest()
+
+#***********************#
+# Get catalog cache key #
+#***********************#
+
+def getCatalogCacheKey(inputFile: str, fileHash: Optional[str] = None) -> dict:
+    """
+    Returns the key that identifies the current contents of an input file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    fileHash : str, optional
+        The hash of the contents of the input file, if it has already been computed (default is None)
+    """
+
+    # Determine the status of the input file
+    inputFileStat=os.stat(os.path.expanduser(inputFile))
+
+    # Return
+    return {'version': catalogCacheVersion, 'path': os.path.abspath(os.path.expanduser(inputFile)), 'size': inputFileStat.st_size, 'mtime': inputFileStat.st_mtime_ns, 'hash': (fileHash if fileHash is not None else computeFileHash(inputFile))}
+
+#********************#
+# Write cache arrays #
+#********************#
+
+def writeCacheArrays(cacheDir: str, key: dict, arrays: dict) -> bool:
+    """
+    Writes the arrays of a cache directory, invalidating any previous cache until its key has been written
+
+    Parameters
+    ----------
+    cacheDir : str
+        The path to the cache directory
+    key : dict
+        The key that identifies the contents of the input file the cache has been compiled from
+    arrays : dict
+        The arrays of the cache, by name
+
+    Returns
+    -------
+    isCacheWritten : bool
+        Has the cache been written?
+    """
+
+    # Write the arrays, followed by the key
+    try:
+        os.makedirs(cacheDir, exist_ok=True)
+        keyFile=os.path.join(cacheDir, "key.json")
+        if(os.path.exists(keyFile)):
+            os.remove(keyFile)
+        for name, array in arrays.items():
+            np.save(os.path.join(cacheDir, name+".npy"), array)
+        file=open(keyFile, mode='w')
+        json.dump(key, file)
+        file.close()
+    except OSError:
+        return False
+
+    # Return
+    return True
+
+#*******************#
+# Read cache arrays #
+#*******************#
+
+def readCacheArrays(cacheDir: str, inputFile: str, names: list) -> Optional[dict]:
+    """
+    Memory-maps the arrays of a cache directory, if its key is up to date with the contents of the input file
+
+    Parameters
+    ----------
+    cacheDir : str
+        The path to the cache directory
+    inputFile : str
+        The path to the input file the cache has been compiled from
+    names : list
+        The names of the arrays to be memory-mapped
+
+    Returns
+    -------
+    arrays : dict or None
+        The arrays of the cache, by name, or None if there is no up-to-date cache
+    """
+
+    # Read the key of the cache
+    keyFile=os.path.join(cacheDir, "key.json")
+    try:
+        file=open(keyFile, mode='r')
+        key=json.load(file)
+        file.close()
+    except (OSError, ValueError):
+        return None
+
+    # Compare the key of the cache with the status of the input file
+    inputFileStat=os.stat(os.path.expanduser(inputFile))
+    if((key.get('version')!=catalogCacheVersion)or(key.get('path')!=os.path.abspath(os.path.expanduser(inputFile)))or(key.get('size')!=inputFileStat.st_size)):
+        return None
+    if(key.get('mtime')!=inputFileStat.st_mtime_ns):
+        # The input file has been touched, so compare the contents
+        if(key.get('hash')!=computeFileHash(inputFile)):
+            return None
+        # Refresh the key of the cache
+        key['mtime']=inputFileStat.st_mtime_ns
+        try:
+            file=open(keyFile, mode='w')
+            json.dump(key, file)
+            file.close()
+        except OSError:
+            pass
+
+    # Memory-map the arrays of the cache
+    arrays={}
+    try:
+        for name in names:
+            arrays[name]=np.load(os.path.join(cacheDir, name+".npy"), mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+
+    # Return
+    return arrays
+
+#*********************#
+# Write catalog cache #
+#*********************#
+
+def writeCatalogCache(inputFile: str, galaxies: list) -> bool:
+    """
+    Compiles the validated and augmented galaxy entries of an input file into a catalog cache
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    galaxies : list
+        The validated and augmented galaxy entries of the input file
+
+    Returns
+    -------
+    isCacheWritten : bool
+        Has the catalog cache been written?
+    """
+
+    # Determine the key of the input file
+    key=getCatalogCacheKey(inputFile)
+
+    # Collect the strings of the galaxy entries
+    strings=[]
+    fieldSlices={}
+    offsets={field: [0,] for field in catalogStringListFields+catalogJSONListFields}
+    for field in catalogStringFields:
+        fieldSlices[field]=(len(strings), len(strings)+len(galaxies))
+        for galaxy in galaxies:
+            if(not isinstance(galaxy[field], str)):
+                return False
+            strings.append(galaxy[field])
+    for field in catalogStringListFields:
+        fieldStart=len(strings)
+        for galaxy in galaxies:
+            if(not all(isinstance(string, str) for string in galaxy[field])):
+                return False
+            strings.extend(galaxy[field])
+            offsets[field].append(offsets[field][-1]+len(galaxy[field]))
+        fieldSlices[field]=(fieldStart, len(strings))
+    for field in catalogJSONFields:
+        fieldSlices[field]=(len(strings), len(strings)+len(galaxies))
+        for galaxy in galaxies:
+            strings.append(json.dumps(galaxy[field]))
+    for field in catalogJSONListFields:
+        fieldStart=len(strings)
+        for galaxy in galaxies:
+            strings.extend([json.dumps(value) for value in galaxy[field]])
+            offsets[field].append(offsets[field][-1]+len(galaxy[field]))
+        fieldSlices[field]=(fieldStart, len(strings))
+    knownFields=set(catalogStringFields+catalogStringListFields+catalogJSONFields+catalogJSONListFields)
+    fieldSlices['extra']=(len(strings), len(strings)+len(galaxies))
+    for galaxy in galaxies:
+        strings.append(json.dumps({field: value for field, value in galaxy.items() if field not in knownFields}))
+
+    # Intern the strings
+    table, istrings=stringTable.build(strings)
+
+    # Assemble the arrays of the catalog
+    arrays={'strings': table.blob, 'stringOffsets': table.offsets}
+    for field, (fieldStart, fieldEnd) in fieldSlices.items():
+        arrays[field]=istrings[fieldStart:fieldEnd]
+    for field, fieldOffsets in offsets.items():
+        arrays[field+'Offsets']=np.array(fieldOffsets, dtype=np.int64)
+
+    # Return
+    return writeCacheArrays(getCatalogCacheDir(inputFile), key, arrays)
+
+#********************#
+# Read catalog cache #
+#********************#
+
+def readCatalogCache(inputFile: str) -> Optional[compiledCatalog]:
+    """
+    Loads the catalog cache of an input file, if it is up to date with the contents of the file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+
+    Returns
+    -------
+    catalog : compiledCatalog or None
+        The catalog, or None if there is no up-to-date catalog cache
+    """
+
+    # Memory-map the arrays of the catalog cache if it is up to date
+    arrays=readCacheArrays(getCatalogCacheDir(inputFile), inputFile, ['strings', 'stringOffsets', 'extra']+catalogStringFields+catalogStringListFields+catalogJSONFields+catalogJSONListFields+[field+'Offsets' for field in catalogStringListFields+catalogJSONListFields])
+    if(arrays is None):
+        return None
+
+    # Return
+    return compiledCatalog(arrays)
\ No newline at end of file
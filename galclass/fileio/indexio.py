@@ -0,0 +1,372 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from typing import Callable, Iterator, Optional
+
+import os
+import re
+import mmap
+
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import numpy as np
+
+# Local #
+
+from .jsonio import jsonBackends, getJSONBackend, getCompressionSuffix, iterateJSONArray
+from .jsonlinesio import isJSONLinesFile
+from .catalogio import stringTable, getCatalogCacheKey, writeCacheArrays, readCacheArrays
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['indexedCatalog', 'isInputFileIndexable', 'iterateGalaxyOffsets', 'buildOffsetIndex', 'writeOffsetIndex', 'readOffsetIndex']
+
+#############
+# Constants #
+#############
+
+# Suffix of the offset index directories
+offsetIndexSuffix=".index"
+
+# Names of the arrays of the offset indices
+offsetIndexArrays=['offsets', 'lengths', 'name', 'aliases', 'aliasesOffsets', 'strings', 'stringOffsets']
+
+# Pattern of the non-ASCII bytes, which require the entries to be reparsed as UTF-8
+nonASCIIPattern=re.compile(rb'[\x80-\xff]')
+
+###########
+# Classes #
+###########
+
+#*****************#
+# Indexed catalog #
+#*****************#
+
+class indexedCatalog(Sequence):
+    """
+    A read-only sequence of the galaxy entries of an input list, which are parsed on demand from a memory map of the input file
+    """
+
+    # Class attributes
+    maxCachedGalaxies=64
+    windowSize=8
+
+    def __init__(self, inputFile: str, arrays: dict, transform: Optional[Callable] = None):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.inputFile=inputFile
+        self.arrays=arrays
+        self.transform=transform
+        self.strings=stringTable(arrays['strings'], arrays['stringOffsets'])
+
+        # Get metadata
+        self.ngalaxies=len(arrays['offsets'])
+
+        # Memory-map the input file
+        file=open(os.path.expanduser(inputFile), mode='rb')
+        self.map=mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        file.close()
+
+        # Initialize the cache of recently accessed galaxy entries and the IDs of the galaxies by name
+        self.cachedGalaxies=OrderedDict()
+        self.galaxyIDs=None
+
+        # Return
+        return
+
+    def __len__(self) -> int:
+        return self.ngalaxies
+
+    def __getitem__(self, igalaxy: int) -> dict:
+        """
+        Returns the galaxy entry with the specified ID, parsing it along with its neighbours if it has not been recently accessed
+
+        Parameters
+        ----------
+        igalaxy : int
+            The ID of the galaxy entry to return
+        """
+
+        # Evaluate arguments
+        if(isinstance(igalaxy, slice)):
+            return [self[jgalaxy] for jgalaxy in range(*igalaxy.indices(self.ngalaxies))]
+        if(igalaxy<0):
+            igalaxy=igalaxy+self.ngalaxies
+        if((igalaxy<0)or(igalaxy>=self.ngalaxies)):
+            raise IndexError("galaxy index out of range")
+
+        # Check whether the galaxy entry has been recently accessed
+        if(igalaxy in self.cachedGalaxies):
+            self.cachedGalaxies.move_to_end(igalaxy)
+            return self.cachedGalaxies[igalaxy]
+
+        # Parse the galaxy entries of the window around the galaxy, the galaxy itself last so that it is the most recent
+        loads=jsonBackends[getJSONBackend()]['loads']
+        offsets=self.arrays['offsets']
+        lengths=self.arrays['lengths']
+        jgalaxies=[jgalaxy for jgalaxy in range(max(igalaxy-self.windowSize, 0), min(igalaxy+self.windowSize+1, self.ngalaxies)) if((jgalaxy!=igalaxy)and(jgalaxy not in self.cachedGalaxies))]+[igalaxy,]
+        for jgalaxy in jgalaxies:
+            galaxy=loads(self.map[offsets[jgalaxy]:offsets[jgalaxy]+lengths[jgalaxy]])
+            if(self.transform is not None):
+                galaxy=self.transform(galaxy)
+            self.cachedGalaxies[jgalaxy]=galaxy
+
+        # Evict the least recently accessed galaxy entries
+        while(len(self.cachedGalaxies)>self.maxCachedGalaxies):
+            self.cachedGalaxies.popitem(last=False)
+
+        # Return
+        return self.cachedGalaxies[igalaxy]
+
+    def getNames(self) -> list:
+        """
+        Returns the names of all galaxies
+        """
+
+        # Return
+        return self.strings.getStrings(self.arrays['name'])
+
+    def getAliases(self) -> list:
+        """
+        Returns the aliases of all galaxies
+        """
+
+        # Decode the aliases of all galaxies at once
+        aliases=self.strings.getStrings(self.arrays['aliases'])
+        offsets=self.arrays['aliasesOffsets'].tolist()
+
+        # Return
+        return [aliases[offsets[igalaxy]:offsets[igalaxy+1]] for igalaxy in range(self.ngalaxies)]
+
+    def getGalaxyID(self, name: str) -> Optional[int]:
+        """
+        Returns the ID of the first galaxy with the specified name
+
+        Parameters
+        ----------
+        name : str
+            The name of the galaxy
+        """
+
+        # Map the names of the galaxies to their IDs on first use
+        if(self.galaxyIDs is None):
+            self.galaxyIDs={}
+            for igalaxy, galaxyName in enumerate(self.getNames()):
+                self.galaxyIDs.setdefault(galaxyName, igalaxy)
+
+        # Return
+        return self.galaxyIDs.get(name)
+
+    def getByteRange(self, igalaxy: int) -> tuple:
+        """
+        Returns the byte offset and length of the specified galaxy entry in the input file
+
+        Parameters
+        ----------
+        igalaxy : int
+            The ID of the galaxy entry
+        """
+
+        # Return
+        return int(self.arrays['offsets'][igalaxy]), int(self.arrays['lengths'][igalaxy])
+
+    def close(self) -> None:
+        """
+        Closes the memory map of the input file
+        """
+
+        # Close the memory map
+        self.map.close()
+
+        # Return
+        return
+
+#############
+# Functions #
+#############
+
+#**********************#
+# Get offset index dir #
+#**********************#
+
+def getOffsetIndexDir(inputFile: str) -> str:
+    """
+    Returns the path to the offset index directory of the specified input file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    """
+
+    # Return
+    return os.path.expanduser(inputFile)+offsetIndexSuffix
+
+#*************************#
+# Is input file indexable #
+#*************************#
+
+def isInputFileIndexable(inputFile: str) -> bool:
+    """
+    Checks whether the galaxy entries of the specified input file can be accessed through an offset index, i.e. whether it is not compressed
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    """
+
+    # Return
+    return (not getCompressionSuffix(inputFile))
+
+#************************#
+# Iterate galaxy offsets #
+#************************#
+
+def iterateGalaxyOffsets(inputFile: str, quiet: bool = False) -> Iterator:
+    """
+    Yields the galaxy entries of an uncompressed input list, either JSON or JSON Lines, one at a time along with their byte offsets and lengths
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Make sure that the input file is not compressed
+    assert isInputFileIndexable(inputFile), "compressed input files cannot be indexed"
+
+    # Check whether the file is a JSON Lines file
+    if(isJSONLinesFile(inputFile)):
+        loads=jsonBackends[getJSONBackend()]['loads']
+        file=open(os.path.expanduser(inputFile), mode='rb')
+        try:
+            offset=0
+            for line in file:
+                if(line.strip()):
+                    yield loads(line), offset, len(line.rstrip())
+                offset=offset+len(line)
+        finally:
+            file.close()
+        return
+
+    # Parse the JSON file as Latin-1, so that the offsets of the characters are the offsets of the bytes, and reparse the entries with any non-ASCII bytes as UTF-8
+    loads=jsonBackends[getJSONBackend()]['loads']
+    file=open(os.path.expanduser(inputFile), mode='rb')
+    fileMap=mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    file.close()
+    try:
+        for galaxy, start, end in iterateJSONArray(inputFile, key='galaxies', encoding='latin-1', withOffsets=True, quiet=quiet):
+            data=fileMap[start:end]
+            if(nonASCIIPattern.search(data) is not None):
+                galaxy=loads(data)
+            yield galaxy, start, end-start
+    finally:
+        fileMap.close()
+
+    # Return
+    return
+
+#********************#
+# Build offset index #
+#********************#
+
+def buildOffsetIndex(offsets: list, lengths: list, names: list, aliases: list) -> Optional[dict]:
+    """
+    Assembles the arrays of an offset index
+
+    Parameters
+    ----------
+    offsets : list
+        The byte offsets of the galaxy entries
+    lengths : list
+        The byte lengths of the galaxy entries
+    names : list
+        The names of the galaxies
+    aliases : list
+        The lists of aliases of the galaxies
+
+    Returns
+    -------
+    arrays : dict or None
+        The arrays of the offset index, or None if the names or aliases are not all strings
+    """
+
+    # Make sure that the names and aliases are strings
+    if(not all(isinstance(name, str) for name in names)):
+        return None
+    if(not all(isinstance(alias, str) for galaxyAliases in aliases for alias in galaxyAliases)):
+        return None
+
+    # Intern the names and aliases
+    table, istrings=stringTable.build(names+[alias for galaxyAliases in aliases for alias in galaxyAliases])
+    aliasesOffsets=np.zeros((len(aliases)+1,), dtype=np.int64)
+    aliasesOffsets[1:]=np.cumsum([len(galaxyAliases) for galaxyAliases in aliases], dtype=np.int64)
+
+    # Return
+    return {'offsets': np.array(offsets, dtype=np.int64), 'lengths': np.array(lengths, dtype=np.int64), 'name': istrings[:len(names)], 'aliases': istrings[len(names):], 'aliasesOffsets': aliasesOffsets, 'strings': table.blob, 'stringOffsets': table.offsets}
+
+#********************#
+# Write offset index #
+#********************#
+
+def writeOffsetIndex(inputFile: str, arrays: dict) -> bool:
+    """
+    Writes the offset index of an input file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    arrays : dict
+        The arrays of the offset index
+
+    Returns
+    -------
+    isIndexWritten : bool
+        Has the offset index been written?
+    """
+
+    # Return
+    return writeCacheArrays(getOffsetIndexDir(inputFile), getCatalogCacheKey(inputFile), arrays)
+
+#*******************#
+# Read offset index #
+#*******************#
+
+def readOffsetIndex(inputFile: str, transform: Optional[Callable] = None) -> Optional[indexedCatalog]:
+    """
+    Loads the offset index of an input file, if it is up to date with the contents of the file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    transform : Callable, optional
+        A function applied to each galaxy entry once it has been parsed (default is None)
+
+    Returns
+    -------
+    catalog : indexedCatalog or None
+        The catalog, or None if there is no up-to-date offset index
+    """
+
+    # Memory-map the arrays of the offset index if it is up to date
+    arrays=readCacheArrays(getOffsetIndexDir(inputFile), inputFile, offsetIndexArrays)
+    if(arrays is None):
+        return None
+
+    # Return
+    return indexedCatalog(inputFile, arrays, transform=transform)
\ No newline at end of file
@@ -0,0 +1,224 @@
+###########
+# Imports #
+###########
+
+# System #
+
+import os
+import json
+
+# Local #
+
+from .jsonlinesio import writeGalaxiesFile
+from ..misc import Console
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['getJournalFile', 'appendJournalRecord', 'appendJournalRecords', 'readJournalFile', 'replayJournal', 'compactJournal']
+
+#############
+# Constants #
+#############
+
+# Suffix of the journal files
+journalFileSuffix=".journal"
+
+#############
+# Functions #
+#############
+
+#******************#
+# Get journal file #
+#******************#
+
+def getJournalFile(outputFile: str) -> str:
+    """
+    Returns the path to the journal file of the specified output file
+
+    Parameters
+    ----------
+    outputFile : str
+        The path to the output file
+    """
+
+    # Return
+    return outputFile+journalFileSuffix
+
+#***********************#
+# Append journal record #
+#***********************#
+
+def appendJournalRecord(journalFile: str, record: dict) -> None:
+    """
+    Appends a single record to a journal file
+
+    Parameters
+    ----------
+    journalFile : str
+        The path to the journal file
+    record : dict
+        The record to be appended
+    """
+
+    # Append the record
+    appendJournalRecords(journalFile, [record,])
+
+    # Return
+    return
+
+#************************#
+# Append journal records #
+#************************#
+
+def appendJournalRecords(journalFile: str, records: list) -> None:
+    """
+    Appends a batch of records to a journal file with a single write
+
+    Parameters
+    ----------
+    journalFile : str
+        The path to the journal file
+    records : list
+        The records to be appended, in the order in which they should be replayed
+    """
+
+    # Check whether there are any records to be appended
+    if(not records):
+        return
+
+    # Open file for appending
+    file=open(os.path.expanduser(journalFile), mode='a')
+
+    # Write each record as a single line
+    file.write(''.join([json.dumps(record, separators=(',', ':'))+'\n' for record in records]))
+
+    # Close the file
+    file.close()
+
+    # Return
+    return
+
+#*******************#
+# Read journal file #
+#*******************#
+
+def readJournalFile(journalFile: str, quiet: bool = False) -> list:
+    """
+    Reads the records of a journal file
+
+    Parameters
+    ----------
+    journalFile : str
+        The path to the journal file
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Check whether the journal file exists
+    if(not os.path.exists(os.path.expanduser(journalFile))):
+        return []
+
+    if(not quiet):
+        Console.pushJob("Reading journal file...")
+
+    # Open file for reading
+    file=open(os.path.expanduser(journalFile), mode='r')
+
+    # Parse the records of the file
+    records=[]
+    for line in file:
+        # Skip empty lines
+        if(not line.strip()):
+            continue
+        # Parse the record, ignoring a record that has been cut short by a crash
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+
+    # Close the file
+    file.close()
+
+    if(not quiet):
+        Console.popJob(success=True)
+
+    # Return
+    return records
+
+#****************#
+# Replay journal #
+#****************#
+
+def replayJournal(propertyDict: dict, records: list) -> int:
+    """
+    Applies the records of a journal to a property dictionary
+
+    Parameters
+    ----------
+    propertyDict : dict
+        The property dictionary to be updated in place
+    records : list
+        The journal records to be applied, in the order in which they were written
+
+    Returns
+    -------
+    nreplayed : int
+        The number of records that have been applied
+    """
+
+    # Get metadata
+    galaxies=propertyDict['galaxies']
+    ngalaxies=len(galaxies)
+
+    # Apply the records
+    galaxyIDs=None
+    nreplayed=0
+    for record in records:
+        # Determine the galaxy the record refers to
+        igalaxy=record['igalaxy']
+        if((igalaxy<0)or(igalaxy>=ngalaxies)or(galaxies[igalaxy]['name']!=record['name'])):
+            if(galaxyIDs is None):
+                galaxyIDs={galaxies[jgalaxy]['name']: jgalaxy for jgalaxy in range(ngalaxies)}
+            if(record['name'] not in galaxyIDs):
+                continue
+            igalaxy=galaxyIDs[record['name']]
+        # Update the properties of the galaxy
+        galaxies[igalaxy]['categories']=record['categories']
+        galaxies[igalaxy]['comments']=record['comments']
+        nreplayed=nreplayed+1
+
+    # Return
+    return nreplayed
+
+#*****************#
+# Compact journal #
+#*****************#
+
+def compactJournal(outputFile: str, propertyDict: dict, journalFile: str, quiet: bool = False) -> None:
+    """
+    Writes the property dictionary to the output file and discards the journal file
+
+    Parameters
+    ----------
+    outputFile : str
+        The path to the output file
+    propertyDict : dict
+        The property dictionary including all the journaled updates
+    journalFile : str
+        The path to the journal file
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Write the property dictionary to file
+    writeGalaxiesFile(outputFile, propertyDict, atomic=True, quiet=quiet)
+
+    # Discard the journal file
+    if(os.path.exists(os.path.expanduser(journalFile))):
+        os.remove(os.path.expanduser(journalFile))
+
+    # Return
+    return
\ No newline at end of file
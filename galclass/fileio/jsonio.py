@@ -4,56 +4,412 @@
 
 # System #
 
+from typing import Iterator, Optional
+
 import os
+import re
+import bz2
+import gzip
 import json
+import lzma
+
+try:
+    import orjson
+except ImportError:
+    orjson=None
+
+try:
+    import ujson
+except ImportError:
+    ujson=None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson=None
 
 # Local #
 
+from .cacheio import readCachedFile
 from ..misc import Console
 
+#################
+# JSON backends #
+#################
+
+def stdlibLoads(data: bytes):
+    return json.loads(data)
+
+def stdlibDumps(data, indent: Optional[int] = None) -> bytes:
+    if(indent is None):
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, indent=indent).encode('utf-8')
+
+def orjsonDumps(data, indent: Optional[int] = None) -> bytes:
+    # orjson only supports an indentation of two spaces, so other indentations fall back to the standard library
+    if(indent is None):
+        return orjson.dumps(data)
+    elif(indent!=2):
+        return stdlibDumps(data, indent=indent)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+def ujsonDumps(data, indent: Optional[int] = None) -> bytes:
+    return ujson.dumps(data, indent=(indent if indent is not None else 0), escape_forward_slashes=False).encode('utf-8')
+
+# Available JSON backends, in order of preference
+jsonBackends={}
+if(orjson is not None):
+    jsonBackends['orjson']={'loads': orjson.loads, 'dumps': orjsonDumps}
+if(ujson is not None):
+    jsonBackends['ujson']={'loads': ujson.loads, 'dumps': ujsonDumps}
+if(simdjson is not None):
+    jsonBackends['simdjson']={'loads': simdjson.loads, 'dumps': stdlibDumps}
+jsonBackends['json']={'loads': stdlibLoads, 'dumps': stdlibDumps}
+
+# Selected JSON backend
+jsonBackend=os.environ.get('GALCLASS_JSON_BACKEND', next(iter(jsonBackends)))
+if(jsonBackend not in jsonBackends):
+    jsonBackend='json'
+
+################
+# Compressions #
+################
+
+# Compression formats, identified by the suffixes of the files
+compressions={'.gz': {'open': gzip.open, 'wrap': lambda file, level: gzip.GzipFile(fileobj=file, mode='wb', compresslevel=level), 'level': 6},
+              '.xz': {'open': lzma.open, 'wrap': lambda file, level: lzma.LZMAFile(file, mode='wb', preset=level), 'level': 6},
+              '.bz2': {'open': bz2.open, 'wrap': lambda file, level: bz2.BZ2File(file, mode='wb', compresslevel=level), 'level': 9}}
+
 #############
 # Functions #
 #############
 
+#************************#
+# Get compression suffix #
+#************************#
+
+def getCompressionSuffix(file: str) -> str:
+    """
+    Returns the compression suffix of the specified file (".gz", ".xz" or ".bz2"), or an empty string if the file is not compressed
+
+    Parameters
+    ----------
+    file : str
+        The path to the file
+    """
+
+    # Check the suffix of the file
+    for compressionSuffix in compressions.keys():
+        if(file.endswith(compressionSuffix)):
+            return compressionSuffix
+
+    # Return
+    return ""
+
+#***********#
+# Open file #
+#***********#
+
+def openFile(file: str, mode: str = 'rb', encoding: Optional[str] = None, newline: Optional[str] = None):
+    """
+    Opens a file for reading, decompressing it on the fly according to its suffix
+
+    Parameters
+    ----------
+    file : str
+        The path to the file
+    mode : str, optional
+        The mode in which to open the file, either 'rb' or 'rt' (default is 'rb')
+    encoding : str, optional
+        The encoding of the file in text mode (default is None, for the locale encoding)
+    newline : str, optional
+        The translation of the line endings of the file in text mode, '' leaving them untranslated (default is None, for universal newlines)
+    """
+
+    # Determine the compression of the file
+    compressionSuffix=getCompressionSuffix(file)
+
+    # Open the file
+    if(compressionSuffix):
+        return compressions[compressionSuffix]['open'](os.path.expanduser(file), mode=mode, encoding=encoding, newline=newline)
+
+    # Return
+    return open(os.path.expanduser(file), mode=mode.replace('t', ''), encoding=encoding, newline=newline)
+
+#*******************#
+# Get JSON backends #
+#*******************#
+
+def getJSONBackends() -> list:
+    """
+    Returns the names of the available JSON backends, in order of preference
+    """
+
+    # Return
+    return list(jsonBackends.keys())
+
+#******************#
+# Get JSON backend #
+#******************#
+
+def getJSONBackend() -> str:
+    """
+    Returns the name of the selected JSON backend
+    """
+
+    # Return
+    return jsonBackend
+
+#******************#
+# Set JSON backend #
+#******************#
+
+def setJSONBackend(backend: str) -> None:
+    """
+    Selects the JSON backend used for the reading and writing of JSON files
+
+    Parameters
+    ----------
+    backend : str
+        The name of the JSON backend ("orjson", "ujson", "simdjson" or "json"), which must be available
+    """
+
+    global jsonBackend
+
+    # Make sure that the backend is available
+    assert (backend in jsonBackends), "the requested JSON backend is not available"
+
+    # Select the backend
+    jsonBackend=backend
+
+    # Return
+    return
+
+#************#
+# Write file #
+#************#
+
+def writeFile(outputFile: str, data: bytes, atomic: bool = False, compressionLevel: Optional[int] = None) -> None:
+    """
+    Writes raw data to a file, compressing them according to the suffix of the file
+
+    Parameters
+    ----------
+    outputFile : str
+        The path to the output file
+    data : bytes
+        The data to be written
+    atomic : bool, optional
+        Should the data be written to a temporary file that then replaces the output file? (default is False)
+    compressionLevel : int, optional
+        The compression level used if the suffix of the output file is ".gz", ".xz" or ".bz2" (default is None, for 6, 6 and 9 respectively)
+    """
+
+    # Determine the path to the file to be written
+    outputFile=os.path.expanduser(outputFile)
+    if(atomic):
+        writtenFile=outputFile+".tmp"
+    else:
+        writtenFile=outputFile
+
+    # Open file for writing
+    file=open(writtenFile, mode='wb')
+
+    # Write the data to the file, compressing them according to the suffix of the output file
+    compressionSuffix=getCompressionSuffix(outputFile)
+    if(compressionSuffix):
+        compression=compressions[compressionSuffix]
+        compressedFile=compression['wrap'](file, (compressionLevel if compressionLevel is not None else compression['level']))
+        compressedFile.write(data)
+        compressedFile.close()
+    else:
+        file.write(data)
+
+    # Make sure that the data have reached the disk before replacing the output file
+    if(atomic):
+        file.flush()
+        os.fsync(file.fileno())
+
+    # Close the file
+    file.close()
+
+    # Replace the output file
+    if(atomic):
+        os.replace(writtenFile, outputFile)
+
+    # Return
+    return
+
 #****************#
 # Read JSON file #
 #****************#
 
-def readJSONFile(inputFile: str, quiet: bool = False) -> dict:
+def readJSONFile(inputFile: str, quiet: bool = False, mutable: bool = True) -> dict:
+    """
+    Reads the data of an input JSON file as a dictionary, through the file cache if it is enabled
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    mutable : bool, optional
+        Should a private, modifiable copy be returned rather than the read-only data shared with the file cache? (default is True)
+    """
+
+    def read():
+        if(not quiet):
+            Console.pushJob("Reading JSON file...")
+
+        # Open file for reading
+        file=openFile(inputFile, mode='rb')
+
+        # Read the JSON data of the file
+        raw=file.read()
+        data=jsonBackends[jsonBackend]['loads'](raw)
+
+        # Close the file
+        file.close()
+
+        if(not quiet):
+            Console.popJob(success=True)
+
+        return data, len(raw)
+
+    # Return
+    return readCachedFile(inputFile, read, mutable=mutable)
+
+#********************#
+# Iterate JSON array #
+#********************#
+
+def iterateJSONArray(inputFile: str, key: str = "galaxies", chunkSize: int = 1048576, encoding: Optional[str] = None, withOffsets: bool = False, quiet: bool = False) -> Iterator:
     """
-    Reads the data of an input JSON file as a dictionary
+    Yields the entries of an array of the top-level object of an input JSON file one at a time, as they are parsed
 
     Parameters
     ----------
     inputFile : str
         The path to the input file
+    key : str, optional
+        The key of the array in the top-level object (default is "galaxies")
+    chunkSize : int, optional
+        The minimum number of characters read from the file at once (default is 1048576)
+    encoding : str, optional
+        The encoding of the file (default is None, for the locale encoding)
+    withOffsets : bool, optional
+        Should each entry be yielded along with the offsets of its first and past-the-last characters in the file? (default is False)
     quiet : str, optional
         Should the console output be suppressed? (default is False)
     """
 
     if(not quiet):
         Console.pushJob("Reading JSON file...")
-    
-    # Open file for reading
-    file=open(os.path.expanduser(inputFile), mode='r')
 
-    # Read the JSON data of the file
-    data=json.load(file)
+    # Open file for reading, decompressing it chunk by chunk, without translating line endings so that the offsets count every character
+    file=openFile(inputFile, mode='rt', encoding=encoding, newline='')
 
-    # Close the file
-    file.close()
+    # Initialize the parser
+    decoder=json.JSONDecoder()
+    whitespace=re.compile(r'[ \t\n\r]*')
+    state={'buffer': "", 'position': 0, 'offset': 0, 'eof': False}
+
+    def readMore():
+        # Drop the consumed part of the buffer and append a new chunk, at least as large as the pending part
+        buffer=state['buffer'][state['position']:]
+        chunk=file.read(max(chunkSize, len(buffer)))
+        state['eof']=(not chunk)
+        state['buffer']=buffer+chunk
+        state['offset']=state['offset']+state['position']
+        state['position']=0
+        return
+
+    def peek():
+        # Skip whitespace and return the next character ("" at the end of the file)
+        while(True):
+            buffer=state['buffer']
+            position=whitespace.match(buffer, state['position']).end()
+            state['position']=position
+            if(position<len(buffer)):
+                return buffer[position]
+            if(state['eof']):
+                return ""
+            readMore()
+
+    def expect(character):
+        # Consume the expected character
+        if(peek()!=character):
+            raise ValueError(f"Expected '{character}' at position {state['position']} of the current chunk of {inputFile}")
+        state['position']=state['position']+1
+        return
+
+    def decode():
+        # Decode the next value, making sure that it has not been cut short by the end of the buffer
+        peek()
+        while(True):
+            try:
+                value, end=decoder.raw_decode(state['buffer'], state['position'])
+            except json.JSONDecodeError:
+                if(state['eof']):
+                    raise
+                readMore()
+                continue
+            if((end==len(state['buffer']))and(not state['eof'])):
+                readMore()
+                continue
+            state['position']=end
+            return value
+
+    success=False
+    try:
+        # Look up the array in the top-level object
+        expect('{')
+        while(True):
+            character=peek()
+            if(character=='}'):
+                break
+            elif(character==','):
+                state['position']=state['position']+1
+                continue
+            objectKey=decode()
+            expect(':')
+            if(objectKey!=key):
+                decode()
+                continue
+            # Yield the entries of the array
+            expect('[')
+            while(True):
+                character=peek()
+                if(character==']'):
+                    break
+                elif(character==','):
+                    state['position']=state['position']+1
+                    continue
+                elif(character==""):
+                    raise ValueError(f"Unexpected end of {inputFile}")
+                if(withOffsets):
+                    start=state['offset']+state['position']
+                    value=decode()
+                    yield value, start, state['offset']+state['position']
+                else:
+                    yield decode()
+            break
+        success=True
+    finally:
+        # Close the file
+        file.close()
+        if(not quiet):
+            Console.popJob(success=success)
 
-    if(not quiet):
-        Console.popJob(success=True)
-    
     # Return
-    return data
+    return
 
 #*****************#
 # Write JSON file #
 #*****************#
 
-def writeJSONFile(outputFile: str, data: dict, indent: int = 4, quiet: bool = False) -> None:
+def writeJSONFile(outputFile: str, data: dict, indent: int = 4, atomic: bool = False, compressionLevel: Optional[int] = None, quiet: bool = False) -> None:
     """
     Writes the data of a dictionary as a JSON file
 
@@ -61,6 +417,14 @@ def writeJSONFile(outputFile: str, data: dict, indent: int = 4, quiet: bool = Fa
     ----------
     outputFile : str
         The path to the output file
+    data : dict
+        The data to be written
+    indent : int, optional
+        The indentation of the JSON data, or None for compact JSON data without any whitespace (default is 4)
+    atomic : bool, optional
+        Should the data be written to a temporary file that then replaces the output file? (default is False)
+    compressionLevel : int, optional
+        The compression level used if the suffix of the output file is ".gz", ".xz" or ".bz2" (default is None, for 6, 6 and 9 respectively)
     quiet : str, optional
         Should the console output be suppressed? (default is False)
     """
@@ -68,14 +432,8 @@ def writeJSONFile(outputFile: str, data: dict, indent: int = 4, quiet: bool = Fa
     if(not quiet):
         Console.pushJob("Writing output file...")
     
-    # Open file for writing
-    file=open(os.path.expanduser(outputFile), mode='w')
-
     # Write the JSON data to the file
-    json.dump(data, file, indent=indent)
-
-    # Close the file
-    file.close()
+    writeFile(outputFile, jsonBackends[jsonBackend]['dumps'](data, indent=indent), atomic=atomic, compressionLevel=compressionLevel)
 
     if(not quiet):
         Console.popJob(success=True)
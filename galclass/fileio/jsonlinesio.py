@@ -0,0 +1,342 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from typing import Iterator, Optional
+
+import os
+import json
+
+from concurrent.futures import ProcessPoolExecutor
+
+# Local #
+
+from .jsonio import jsonBackends, getJSONBackend, getCompressionSuffix, compressions, openFile, writeFile, readJSONFile, iterateJSONArray, writeJSONFile
+from .cacheio import readCachedFile
+from ..misc import Console
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['isJSONLinesFile', 'iterateJSONLines', 'readJSONLinesFile', 'writeJSONLinesFile', 'appendJSONLinesFile', 'iterateGalaxies', 'readGalaxiesFile', 'writeGalaxiesFile']
+
+#############
+# Constants #
+#############
+
+# Suffixes of the JSON Lines files
+jsonLinesSuffixes=[".jsonl", ".ndjson"]
+
+#############
+# Functions #
+#############
+
+#********************#
+# Is JSON Lines file #
+#********************#
+
+def isJSONLinesFile(file: str, peekSize: int = 65536) -> bool:
+    """
+    Checks whether the specified file is a JSON Lines file, with one galaxy entry per line
+
+    Parameters
+    ----------
+    file : str
+        The path to the file
+    peekSize : int, optional
+        The number of characters read from the beginning of the file when the suffix of the file is not conclusive (default is 65536)
+    """
+
+    # Check the suffix of the file
+    strippedFile=file
+    compressionSuffix=getCompressionSuffix(strippedFile)
+    if(compressionSuffix):
+        strippedFile=strippedFile[:-len(compressionSuffix)]
+    for jsonLinesSuffix in jsonLinesSuffixes:
+        if(strippedFile.endswith(jsonLinesSuffix)):
+            return True
+    if(strippedFile.endswith(".json")):
+        return False
+
+    # Check whether the file does not exist (yet)
+    if(not os.path.exists(os.path.expanduser(file))):
+        return False
+
+    # Peek at the beginning of the file
+    handle=openFile(file, mode='rt')
+    head=handle.read(peekSize)
+    handle.close()
+
+    # Check whether the first line of the file holds a complete galaxy entry
+    head=head.lstrip()
+    if((not head.startswith('{'))or('\n' not in head)):
+        return False
+    try:
+        entry=json.loads(head[:head.index('\n')])
+    except ValueError:
+        return False
+
+    # Return
+    return (isinstance(entry, dict) and ('galaxies' not in entry))
+
+#********************#
+# Iterate JSON Lines #
+#********************#
+
+def iterateJSONLines(inputFile: str, start: int = 0, end: Optional[int] = None) -> Iterator:
+    """
+    Yields the entries of a JSON Lines file one at a time
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    start : int, optional
+        The byte offset from which to start; the line in progress at this offset is skipped, as it belongs to the previous range (default is 0)
+    end : int, optional
+        The byte offset up to which to read; the line in progress at this offset is still yielded (default is None, for the end of the file)
+    """
+
+    # Open file for reading
+    file=openFile(inputFile, mode='rb')
+
+    # Skip to the beginning of the first line of the byte range
+    if(start>0):
+        file.seek(start-1)
+        file.readline()
+
+    # Yield the entries of the lines that begin within the byte range
+    loads=jsonBackends[getJSONBackend()]['loads']
+    try:
+        while((end is None)or(file.tell()<end)):
+            line=file.readline()
+            if(not line):
+                break
+            if(line.strip()):
+                yield loads(line)
+    finally:
+        # Close the file
+        file.close()
+
+    # Return
+    return
+
+#***********************#
+# Read JSON Lines chunk #
+#***********************#
+
+def readJSONLinesChunk(inputFile: str, start: int, end: int) -> list:
+    """
+    Reads the entries of the lines of a JSON Lines file that begin within a byte range
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    start : int
+        The byte offset from which to start
+    end : int
+        The byte offset up to which to read
+    """
+
+    # Return
+    return list(iterateJSONLines(inputFile, start=start, end=end))
+
+#**********************#
+# Read JSON Lines file #
+#**********************#
+
+def readJSONLinesFile(inputFile: str, nworkers: int = 1, quiet: bool = False) -> list:
+    """
+    Reads the entries of a JSON Lines file
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    nworkers : int, optional
+        The number of processes among which the byte ranges of an uncompressed file are split (default is 1)
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    if(not quiet):
+        Console.pushJob("Reading JSON Lines file...")
+
+    # Read the entries of the file
+    if((nworkers>1)and(not getCompressionSuffix(inputFile))):
+        # Split the file into byte ranges
+        fileSize=os.path.getsize(os.path.expanduser(inputFile))
+        boundaries=[(fileSize*iworker)//nworkers for iworker in range(nworkers+1)]
+        # Parse the byte ranges in parallel
+        with ProcessPoolExecutor(max_workers=nworkers) as executor:
+            chunks=executor.map(readJSONLinesChunk, [inputFile,]*nworkers, boundaries[:-1], boundaries[1:])
+            entries=[entry for chunk in chunks for entry in chunk]
+    else:
+        entries=list(iterateJSONLines(inputFile))
+
+    if(not quiet):
+        Console.popJob(success=True)
+
+    # Return
+    return entries
+
+#***********************#
+# Write JSON Lines file #
+#***********************#
+
+def writeJSONLinesFile(outputFile: str, entries: list, atomic: bool = False, compressionLevel: Optional[int] = None, quiet: bool = False) -> None:
+    """
+    Writes a list of entries as a JSON Lines file
+
+    Parameters
+    ----------
+    outputFile : str
+        The path to the output file
+    entries : list
+        The entries to be written, one per line
+    atomic : bool, optional
+        Should the data be written to a temporary file that then replaces the output file? (default is False)
+    compressionLevel : int, optional
+        The compression level used if the suffix of the output file is ".gz", ".xz" or ".bz2" (default is None, for 6, 6 and 9 respectively)
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    if(not quiet):
+        Console.pushJob("Writing output file...")
+
+    # Encode the entries
+    dumps=jsonBackends[getJSONBackend()]['dumps']
+    data=b''.join([dumps(entry)+b'\n' for entry in entries])
+
+    # Write the entries to the file
+    writeFile(outputFile, data, atomic=atomic, compressionLevel=compressionLevel)
+
+    if(not quiet):
+        Console.popJob(success=True)
+
+    # Return
+    return
+
+#************************#
+# Append JSON Lines file #
+#************************#
+
+def appendJSONLinesFile(outputFile: str, entries: list, compressionLevel: Optional[int] = None) -> None:
+    """
+    Appends a list of entries to a JSON Lines file, which may be compressed as concatenated compressed streams
+
+    Parameters
+    ----------
+    outputFile : str
+        The path to the output file
+    entries : list
+        The entries to be appended, one per line
+    compressionLevel : int, optional
+        The compression level used if the suffix of the output file is ".gz", ".xz" or ".bz2" (default is None, for 6, 6 and 9 respectively)
+    """
+
+    # Encode the entries
+    dumps=jsonBackends[getJSONBackend()]['dumps']
+    data=b''.join([dumps(entry)+b'\n' for entry in entries])
+
+    # Append the entries to the file
+    file=open(os.path.expanduser(outputFile), mode='ab')
+    compressionSuffix=getCompressionSuffix(outputFile)
+    if(compressionSuffix):
+        compression=compressions[compressionSuffix]
+        compressedFile=compression['wrap'](file, (compressionLevel if compressionLevel is not None else compression['level']))
+        compressedFile.write(data)
+        compressedFile.close()
+    else:
+        file.write(data)
+    file.close()
+
+    # Return
+    return
+
+#******************#
+# Iterate galaxies #
+#******************#
+
+def iterateGalaxies(inputFile: str, quiet: bool = False) -> Iterator:
+    """
+    Yields the galaxy entries of an input list or classification file, either JSON or JSON Lines, one at a time
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Check whether the file is a JSON Lines file
+    if(isJSONLinesFile(inputFile)):
+        return iterateJSONLines(inputFile)
+
+    # Return
+    return iterateJSONArray(inputFile, key='galaxies', quiet=quiet)
+
+#********************#
+# Read galaxies file #
+#********************#
+
+def readGalaxiesFile(inputFile: str, nworkers: int = 1, quiet: bool = False, mutable: bool = True) -> dict:
+    """
+    Reads an input list or classification file, either JSON or JSON Lines, as a dictionary with a 'galaxies' key, through the file cache if it is enabled
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the input file
+    nworkers : int, optional
+        The number of processes among which the byte ranges of an uncompressed JSON Lines file are split (default is 1)
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    mutable : bool, optional
+        Should a private, modifiable copy be returned rather than the read-only data shared with the file cache? (default is True)
+    """
+
+    # Check whether the file is a JSON Lines file
+    if(isJSONLinesFile(inputFile)):
+        return readCachedFile(inputFile, lambda: ({'galaxies': readJSONLinesFile(inputFile, nworkers=nworkers, quiet=quiet)}, os.path.getsize(os.path.expanduser(inputFile))), mutable=mutable)
+
+    # Return
+    return readJSONFile(inputFile, mutable=mutable, quiet=quiet)
+
+#*********************#
+# Write galaxies file #
+#*********************#
+
+def writeGalaxiesFile(outputFile: str, data: dict, atomic: bool = False, compressionLevel: Optional[int] = None, quiet: bool = False) -> None:
+    """
+    Writes a dictionary with a 'galaxies' key as a JSON Lines file if the suffix of the output file says so, or as a JSON file otherwise
+
+    Parameters
+    ----------
+    outputFile : str
+        The path to the output file
+    data : dict
+        The data to be written
+    atomic : bool, optional
+        Should the data be written to a temporary file that then replaces the output file? (default is False)
+    compressionLevel : int, optional
+        The compression level used if the suffix of the output file is ".gz", ".xz" or ".bz2" (default is None, for 6, 6 and 9 respectively)
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Write the file
+    if(isJSONLinesFile(outputFile)):
+        writeJSONLinesFile(outputFile, data['galaxies'], atomic=atomic, compressionLevel=compressionLevel, quiet=quiet)
+    else:
+        writeJSONFile(outputFile, data, atomic=atomic, compressionLevel=compressionLevel, quiet=quiet)
+
+    # Return
+    return
\ No newline at end of file
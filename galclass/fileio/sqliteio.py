@@ -0,0 +1,293 @@
+###########
+# Imports #
+###########
+
+# System #
+
+from typing import Optional
+
+import os
+import json
+import sqlite3
+
+# Local #
+
+from .jsonio import getCompressionSuffix
+from .jsonlinesio import jsonLinesSuffixes, readGalaxiesFile, writeGalaxiesFile
+
+###########
+# Exports #
+###########
+
+# Names exported by the module
+__all__=['propertyStore', 'getDatabaseFile', 'importClassificationFile', 'exportClassificationFile']
+
+#############
+# Constants #
+#############
+
+# Suffix of the property database files
+databaseFileSuffix=".sqlite"
+
+###########
+# Classes #
+###########
+
+#****************#
+# Property store #
+#****************#
+
+class propertyStore():
+    """
+    A SQLite database with the properties of the galaxies of an input list
+    """
+
+    def __init__(self, databaseFile: str):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.databaseFile=os.path.expanduser(databaseFile)
+
+        # Open the database, which is accessed by one thread at a time but not always by the same thread
+        self.connection=sqlite3.connect(self.databaseFile, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        # Initialize the schema
+        self.connection.execute("CREATE TABLE IF NOT EXISTS galaxies (igalaxy INTEGER PRIMARY KEY, name TEXT NOT NULL, categories TEXT NOT NULL, comments TEXT NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS galaxiesName ON galaxies (name)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.connection.commit()
+
+        # Return
+        return
+
+    def getMetadata(self, key: str) -> Optional[str]:
+        """
+        Returns the value of the specified metadata entry
+
+        Parameters
+        ----------
+        key : str
+            The key of the metadata entry
+        """
+
+        # Query the metadata entry
+        row=self.connection.execute("SELECT value FROM metadata WHERE key=?", (key,)).fetchone()
+
+        # Return
+        return (row[0] if row is not None else None)
+
+    def setMetadata(self, key: str, value: str) -> None:
+        """
+        Sets the value of the specified metadata entry
+
+        Parameters
+        ----------
+        key : str
+            The key of the metadata entry
+        value : str
+            The value of the metadata entry
+        """
+
+        # Set the metadata entry
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, value))
+
+        # Return
+        return
+
+    def getNumberOfGalaxies(self) -> int:
+        """
+        Returns the number of galaxies in the database
+        """
+
+        # Return
+        return self.connection.execute("SELECT COUNT(*) FROM galaxies").fetchone()[0]
+
+    def getGalaxy(self, igalaxy: int) -> dict:
+        """
+        Returns the properties of the specified galaxy
+
+        Parameters
+        ----------
+        igalaxy : int
+            The ID of the galaxy the properties of which to return
+        """
+
+        # Query the galaxy
+        row=self.connection.execute("SELECT name, categories, comments FROM galaxies WHERE igalaxy=?", (igalaxy,)).fetchone()
+
+        # Make sure that the galaxy has been found
+        assert (row is not None), "the specified galaxy is not part of this database"
+
+        # Return
+        return {'name': row[0], 'categories': json.loads(row[1]), 'comments': row[2]}
+
+    def upsertGalaxy(self, igalaxy: int, name: str, categories: list, comments: str) -> None:
+        """
+        Inserts or updates the properties of a single galaxy
+
+        Parameters
+        ----------
+        igalaxy : int
+            The ID of the galaxy
+        name : str
+            The name of the galaxy
+        categories : list
+            A list with the categories of which the galaxy is a part
+        comments : str
+            Comments about the galaxy
+        """
+
+        # Upsert the galaxy
+        self.upsertGalaxies({igalaxy: {'name': name, 'categories': categories, 'comments': comments}})
+
+        # Return
+        return
+
+    def upsertGalaxies(self, galaxyUpdates: dict) -> None:
+        """
+        Inserts or updates the properties of a batch of galaxies in a single transaction
+
+        Parameters
+        ----------
+        galaxyUpdates : dict
+            A dictionary with the IDs of the galaxies as keys and their properties as values
+        """
+
+        # Upsert the galaxies
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO galaxies (igalaxy, name, categories, comments) VALUES (?, ?, ?, ?)", [(igalaxy, galaxy['name'], json.dumps(galaxy['categories']), galaxy['comments']) for igalaxy, galaxy in galaxyUpdates.items()])
+
+        # Return
+        return
+
+    def importPropertyDict(self, propertyDict: dict) -> None:
+        """
+        Replaces the contents of the database with the specified property dictionary
+
+        Parameters
+        ----------
+        propertyDict : dict
+            A dictionary with the properties of the galaxies, in the layout of the output classification files
+        """
+
+        # Replace the galaxies
+        with self.connection:
+            self.connection.execute("DELETE FROM galaxies")
+            self.connection.executemany("INSERT INTO galaxies (igalaxy, name, categories, comments) VALUES (?, ?, ?, ?)", [(igalaxy, galaxy['name'], json.dumps(galaxy['categories']), galaxy['comments']) for igalaxy, galaxy in enumerate(propertyDict['galaxies'])])
+
+        # Return
+        return
+
+    def exportPropertyDict(self) -> dict:
+        """
+        Returns the contents of the database as a property dictionary, in the layout of the output classification files
+        """
+
+        # Query all galaxies
+        rows=self.connection.execute("SELECT name, categories, comments FROM galaxies ORDER BY igalaxy")
+
+        # Return
+        return {'galaxies': [{'name': row[0], 'categories': json.loads(row[1]), 'comments': row[2]} for row in rows]}
+
+    def close(self) -> None:
+        """
+        Closes the database
+        """
+
+        # Close the connection
+        self.connection.close()
+
+        # Return
+        return
+
+#############
+# Functions #
+#############
+
+#*******************#
+# Get database file #
+#*******************#
+
+def getDatabaseFile(outputFile: str) -> str:
+    """
+    Returns the path to the property database of the specified output file
+
+    Parameters
+    ----------
+    outputFile : str
+        The path to the output file
+    """
+
+    # Strip the compression and JSON suffixes of the output file
+    compressionSuffix=getCompressionSuffix(outputFile)
+    if(compressionSuffix):
+        outputFile=outputFile[:-len(compressionSuffix)]
+    for outputFileSuffix in [".json",]+jsonLinesSuffixes:
+        if(outputFile.endswith(outputFileSuffix)):
+            outputFile=outputFile[:-len(outputFileSuffix)]
+
+    # Return
+    return outputFile+databaseFileSuffix
+
+#****************************#
+# Import classification file #
+#****************************#
+
+def importClassificationFile(inputFile: str, databaseFile: str, quiet: bool = False) -> None:
+    """
+    Imports an output classification JSON or JSON Lines file into a property database
+
+    Parameters
+    ----------
+    inputFile : str
+        The path to the classification JSON file
+    databaseFile : str
+        The path to the property database
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Read the classification file
+    propertyDict=readGalaxiesFile(inputFile, quiet=quiet)
+
+    # Import the classification into the database
+    store=propertyStore(databaseFile)
+    store.importPropertyDict(propertyDict)
+    store.close()
+
+    # Return
+    return
+
+#****************************#
+# Export classification file #
+#****************************#
+
+def exportClassificationFile(databaseFile: str, outputFile: str, quiet: bool = False) -> None:
+    """
+    Exports a property database as an output classification JSON or JSON Lines file
+
+    Parameters
+    ----------
+    databaseFile : str
+        The path to the property database
+    outputFile : str
+        The path to the classification JSON file
+    quiet : str, optional
+        Should the console output be suppressed? (default is False)
+    """
+
+    # Export the classification of the database
+    store=propertyStore(databaseFile)
+    propertyDict=store.exportPropertyDict()
+    store.close()
+
+    # Write the classification file
+    writeGalaxiesFile(outputFile, propertyDict, atomic=True, quiet=quiet)
+
+    # Return
+    return
\ No newline at end of file
@@ -20,7 +20,7 @@ from .substrate import QtSubstrate
 # Start #
 #*******#
 
-def start(categoriesFile: Optional[str] = None, inputFile: Optional[str] = None, outputFileSuffix: Optional[str] = "_classified.json") -> None:
+def start(categoriesFile: Optional[str] = None, inputFile: Optional[str] = None, outputFileSuffix: Optional[str] = "_classified.json", outputBackend: str = "json") -> None:
     """
     Initializes the Qt application
 
@@ -32,10 +32,12 @@ def start(categoriesFile: Optional[str] = None, inputFile: Optional[str] = None,
         The path to the input list file (default is None)
     outputFileSuffix : str, optional
         The suffix to be added to the input file path in order to form the filename of the output classification file (default is "_classified.json")
+    outputBackend : str, optional
+        The backend used for the storage of the classification while classifying, either "json" or "sqlite" (default is "json")
     """
 
     # Initialize the Qt substrate
-    substrate=QtSubstrate(outputFileSuffix=outputFileSuffix)
+    substrate=QtSubstrate(outputFileSuffix=outputFileSuffix, outputBackend=outputBackend)
 
     # Initialize the Qt application
     application=QApplication(["galclass"])
@@ -44,7 +46,7 @@ def start(categoriesFile: Optional[str] = None, inputFile: Optional[str] = None,
     if(categoriesFile==""):
         # Open the file dialog
         fileDialog=QFileDialog()
-        categoriesFile=fileDialog.getOpenFileName(None, "Open categories JSON File", "", "JSON Files (*.json)")[0]
+        categoriesFile=fileDialog.getOpenFileName(None, "Open categories JSON File", "", "JSON Files (*.json *.json.gz *.json.xz *.json.bz2)")[0]
         # Parse the path to the categories file
         if(categoriesFile==""):
             categoriesFile=None
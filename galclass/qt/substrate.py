@@ -6,23 +6,25 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Union
 
 import os
+import sqlite3
 
 from functools import partial
 
 import numpy as np
 
-from PyQt6.QtCore import QSize, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import QSize, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QAction, QKeySequence
 from PyQt6.QtWidgets import QStyle, QCommonStyle, QFileDialog
 
 # Local #
 
 from .window import MainWindow
-from ..fileio import readJSONFile, writeJSONFile
+from ..fileio import readJSONFile, readGalaxiesFile, iterateGalaxies, getCompressionSuffix, readCatalogCache, writeCatalogCache, getGalaxyNames, isInputFileIndexable, iterateGalaxyOffsets, buildOffsetIndex, writeOffsetIndex, readOffsetIndex, indexedCatalog, getJournalFile, appendJournalRecords, readJournalFile, replayJournal, compactJournal, propertyStore, getDatabaseFile
 from ..misc import Console
+from ..analysis import categoryHierarchy
 
 ###########
 # Classes #
@@ -38,7 +40,8 @@ class inputFileLoaderSignals(QObject):
     """
 
     # Class attributes
-    finished=pyqtSignal(dict, dict, str, str)
+    loaded=pyqtSignal(int)
+    finished=pyqtSignal(dict, dict, str, str, object)
 
 class inputFileLoader(QRunnable):
     """
@@ -50,8 +53,10 @@ class inputFileLoader(QRunnable):
     filterFields={'required': ['files'], 'optional': ['fileInfo']}
     galaxyFieldPlaceholder=[[], "", {}]
     filterFieldPlaceholder=[{},]
+    progressInterval=10000
+    indexingThreshold=268435456
 
-    def __init__(self, inputFile: str, outputFile: str):
+    def __init__(self, inputFile: str, outputFile: str, outputBackend: str = "json"):
         """
         Constructor
         """
@@ -65,10 +70,48 @@ class inputFileLoader(QRunnable):
         # Evaluate arguments
         self.inputFile=inputFile
         self.outputFile=outputFile
+        self.outputBackend=outputBackend
 
         # Return
         return
     
+    def isGalaxyValid(self, galaxy: dict) -> bool:
+        """
+        Checks whether the specified galaxy entry is valid
+
+        Parameters
+        ----------
+        galaxy : dict
+            the galaxy entry the validity of which is to be determined
+        
+        Returns
+        -------
+        isGalaxyValid : bool
+            Is the specified galaxy entry valid?
+        """
+
+        # Check whether the galaxy entry is a dictionary
+        if(not isinstance(galaxy, dict)):
+            return False
+
+        # Check whether all required galaxy fields are present
+        for galaxyField in self.galaxyFields['required']:
+            if(galaxyField not in galaxy.keys()):
+                return False
+        
+        # Get the number of filters of the galaxy
+        nfilters=len(galaxy['filters'])
+
+        # Check whether all required filter fields are present
+        for filterField in self.filterFields['required']:
+            if(filterField not in galaxy.keys()):
+                return False
+            elif(len(galaxy[filterField])!=nfilters):
+                return False
+        
+        # Return
+        return True
+    
     def isFileDictValid(self, fileDict: dict) -> bool:
         """
         Checks whether the specified file dict is valid
@@ -96,34 +139,55 @@ class inputFileLoader(QRunnable):
         # Evaluate the validity of each galaxy entry
         isFileDictValid=True
         for igalaxy in range(ngalaxies):
-            # Get the entry of the galaxy
-            galaxy=fileDict['galaxies'][igalaxy]
-            # Check whether all required galaxy fields are present
-            for galaxyField in self.galaxyFields['required']:
-                if(galaxyField not in galaxy.keys()):
-                    isFileDictValid=False
-                    break
-            # Check whether the file dictionary is still valid
-            if(not isFileDictValid):
-                break
-            # Get the number of filters of the galaxy
-            nfilters=len(galaxy['filters'])
-            # Check whether all required filter fields are present
-            for filterField in self.filterFields['required']:
-                if(filterField not in galaxy.keys()):
-                    isFileDictValid=False
-                    break
-                else:
-                    if(len(galaxy[filterField])!=nfilters):
-                        isFileDictValid=False
-                        break
-            # Check whether the file dictionary is still valid
-            if(not isFileDictValid):
+            if(not self.isGalaxyValid(fileDict['galaxies'][igalaxy])):
+                isFileDictValid=False
                 break
         
         # Return
         return isFileDictValid
     
+    @classmethod
+    def augmentGalaxy(cls, galaxy: dict) -> dict:
+        """
+        Fills in the missing optional fields of the specified galaxy entry
+
+        Parameters
+        ----------
+        galaxy : dict
+            the galaxy entry the missing optional fields of which are to be filled
+        
+        Returns
+        -------
+        augmentedGalaxy : dict
+            the galaxy entry with no missing optional fields
+        """
+        
+        # Get metadata
+        noptionalGalaxyFields=len(cls.galaxyFields['optional'])
+        noptionalFilterFields=len(cls.filterFields['optional'])
+
+        # Check whether all optional galaxy fields are present
+        for ioptionalGalaxyField in range(noptionalGalaxyFields):
+            # Determine the optional galaxy field
+            optionalGalaxyField=cls.galaxyFields['optional'][ioptionalGalaxyField]
+            # Fill in the optional galaxy field if it is missing
+            if(optionalGalaxyField not in galaxy.keys()):
+                galaxy[optionalGalaxyField]=cls.galaxyFieldPlaceholder[ioptionalGalaxyField]
+        
+        # Get the number of filters of the galaxy
+        nfilters=len(galaxy['filters'])
+
+        # Check whether all optional filter fields are present
+        for ioptionalFilterField in range(noptionalFilterFields):
+            # Determine the optional filter field
+            optionalFilterField=cls.filterFields['optional'][ioptionalFilterField]
+            # Fill in the optional filter field if it is missing
+            if(optionalFilterField not in galaxy.keys()):
+                galaxy[optionalFilterField]=[cls.filterFieldPlaceholder[ioptionalFilterField],]*nfilters
+        
+        # Return
+        return galaxy
+    
     def augmentFileDict(self, fileDict: dict) -> dict:
         """
         Fills in the missing optional fields of the specified file dict
@@ -138,38 +202,134 @@ class inputFileLoader(QRunnable):
         augmentedFileDict : dict
             the file dictionary with no missing optional fields
         """
-        
-        # Get metadata
-        ngalaxies=len(fileDict['galaxies'])
-        noptionalGalaxyFields=len(self.galaxyFields['optional'])
-        noptionalFilterFields=len(self.filterFields['optional'])
 
         # Copy the original file dict
         augmentedFileDict=dict(fileDict)
         
         # Fills in the missing optional fields of the file dict
-        for igalaxy in range(ngalaxies):
-            # Get the entry of the galaxy
-            galaxy=augmentedFileDict['galaxies'][igalaxy]
-            # Check whether all optional galaxy fields are present
-            for ioptionalGalaxyField in range(noptionalGalaxyFields):
-                # Determine the optional galaxy field
-                optionalGalaxyField=self.galaxyFields['optional'][ioptionalGalaxyField]
-                # Fill in the optional galaxy field if it is missing
-                if(optionalGalaxyField not in galaxy.keys()):
-                    galaxy[optionalGalaxyField]=self.galaxyFieldPlaceholder[ioptionalGalaxyField]
-            # Get the number of filters of the galaxy
-            nfilters=len(galaxy['filters'])
-            # Check whether all optional filter fields are present
-            for ioptionalFilterField in range(noptionalFilterFields):
-                # Determine the optional filter field
-                optionalFilterField=self.filterFields['optional'][ioptionalFilterField]
-                # Fill in the optional filter field if it is missing
-                if(optionalFilterField not in galaxy.keys()):
-                    galaxy[optionalFilterField]=[self.filterFieldPlaceholder[ioptionalFilterField],]*nfilters
+        for igalaxy in range(len(fileDict['galaxies'])):
+            self.augmentGalaxy(augmentedFileDict['galaxies'][igalaxy])
         
         # Return
         return augmentedFileDict
+    
+    def isInputFileIndexed(self) -> bool:
+        """
+        Checks whether the galaxy entries of the input file should be parsed on demand through an offset index rather than loaded at once
+
+        Returns
+        -------
+        isInputFileIndexed : bool
+            Is the input file uncompressed and at least as large as the indexing threshold?
+        """
+
+        # Check whether the input file is compressed
+        if(not isInputFileIndexable(self.inputFile)):
+            return False
+
+        # Return
+        return (os.path.getsize(os.path.expanduser(self.inputFile))>=self.indexingThreshold)
+
+    def indexFileDict(self) -> Optional[dict]:
+        """
+        Streams the galaxy entries of the input file, validating each one and recording its byte range, so that it can be parsed again on demand
+
+        Returns
+        -------
+        fileDict : dict or None
+            the file dictionary backed by the offset index, an empty dictionary if the input file is not valid, or None if the input file cannot be indexed
+        """
+
+        # Use the offset index of the input file if it is up to date
+        catalog=readOffsetIndex(self.inputFile, transform=self.augmentGalaxy)
+        if(catalog is not None):
+            return {'galaxies': catalog}
+
+        # Initialize the byte ranges, names and aliases of the galaxies
+        offsets=[]
+        lengths=[]
+        names=[]
+        aliases=[]
+
+        # Parse and validate the galaxy entries one at a time, keeping only their byte ranges, names and aliases
+        try:
+            for galaxy, offset, length in iterateGalaxyOffsets(self.inputFile):
+                # Make sure that the galaxy entry is valid
+                if(not self.isGalaxyValid(galaxy)):
+                    return {}
+                # Record the galaxy entry
+                offsets.append(offset)
+                lengths.append(length)
+                names.append(galaxy['name'])
+                aliases.append(galaxy.get('aliases', []))
+                # Report the progress of the loading
+                if(len(offsets)%self.progressInterval==0):
+                    self.signals.loaded.emit(len(offsets))
+        except ValueError:
+            return {}
+
+        # Check whether the input file includes any galaxies
+        if(not offsets):
+            return {}
+
+        # Assemble the offset index, which requires the names and aliases to be strings
+        arrays=buildOffsetIndex(offsets, lengths, names, aliases)
+        if(arrays is None):
+            return None
+
+        # Write the offset index of the input file for the next time it is opened
+        writeOffsetIndex(self.inputFile, arrays)
+
+        # Return
+        return {'galaxies': indexedCatalog(self.inputFile, arrays, transform=self.augmentGalaxy)}
+
+    def readFileDict(self) -> dict:
+        """
+        Streams the galaxy entries of the input file, validating and augmenting each one as soon as it has been parsed
+        
+        Returns
+        -------
+        fileDict : dict
+            the augmented file dictionary, or an empty dictionary if the input file is not valid
+        """
+
+        # Index the input file rather than loading it if it is large
+        if(self.isInputFileIndexed()):
+            fileDict=self.indexFileDict()
+            if(fileDict is not None):
+                return fileDict
+
+        # Use the catalog cache of the input file if it is up to date
+        catalog=readCatalogCache(self.inputFile)
+        if(catalog is not None):
+            return {'galaxies': catalog}
+
+        # Initialize the list of galaxies
+        galaxies=[]
+
+        # Parse, validate and augment the galaxy entries one at a time
+        try:
+            for galaxy in iterateGalaxies(self.inputFile):
+                # Make sure that the galaxy entry is valid
+                if(not self.isGalaxyValid(galaxy)):
+                    return {}
+                # Hand off the augmented galaxy entry
+                galaxies.append(self.augmentGalaxy(galaxy))
+                # Report the progress of the loading
+                if(len(galaxies)%self.progressInterval==0):
+                    self.signals.loaded.emit(len(galaxies))
+        except ValueError:
+            return {}
+        
+        # Check whether the input file includes any galaxies
+        if(not galaxies):
+            return {}
+
+        # Compile the catalog cache of the input file for the next time it is opened
+        writeCatalogCache(self.inputFile, galaxies)
+
+        # Return
+        return {'galaxies': galaxies}
 
     @pyqtSlot()
     def run(self):
@@ -177,19 +337,44 @@ class inputFileLoader(QRunnable):
         Loads the input file
         """
 
-        # Read JSON file
-        fileDict=readJSONFile(self.inputFile)
+        # Read the validated and augmented file dict
+        fileDict=self.readFileDict()
 
         # Evaluate the file dict
 
-        if(self.isFileDictValid(fileDict)):
-            # Fill in the missing optional fields of the file dict
-            fileDict=self.augmentFileDict(fileDict)
-            # Attempt to read previous output JSON file
-            try:
-                propertyDict=readJSONFile(self.outputFile)
-            except:
-                propertyDict={}
+        if(fileDict):
+            # Initialize the writer of the output file
+            if(self.outputBackend=="sqlite"):
+                writer=outputDatabaseWriter(self.outputFile, getDatabaseFile(self.outputFile))
+            else:
+                writer=None
+            # Read the previous output
+            if((writer is not None)and(writer.isOutputFileExported())):
+                # The output JSON file is an export of the output database, which may include newer updates
+                propertyDict=writer.store.exportPropertyDict()
+            else:
+                # Attempt to read previous output JSON file
+                try:
+                    propertyDict=readGalaxiesFile(self.outputFile)
+                except:
+                    propertyDict={}
+                if(propertyDict):
+                    # Replay the journal of the previous output JSON file
+                    journalRecords=readJournalFile(getJournalFile(self.outputFile))
+                    replayJournal(propertyDict, journalRecords)
+                    isOutputFileCurrent=(not journalRecords)
+                else:
+                    # Initialize the properties of the galaxies
+                    propertyDict={'galaxies': [{'name': galaxyName, 'categories': [], 'comments': ""} for galaxyName in getGalaxyNames(fileDict['galaxies'])]}
+                    isOutputFileCurrent=False
+                # Initialize the writer of the output file
+                if(writer is not None):
+                    writer.store.importPropertyDict(propertyDict)
+                else:
+                    writer=outputFileWriter(self.outputFile, propertyDict)
+                # Bring the output file up to date
+                if((not isOutputFileCurrent)or(isinstance(writer, outputDatabaseWriter))):
+                    writer.write({}, compact=True)
             # Determine the path to the input root directory
             inputRootDir=os.path.abspath(os.path.dirname(os.path.expanduser(self.inputFile)))
         else:
@@ -197,9 +382,198 @@ class inputFileLoader(QRunnable):
             fileDict={}
             propertyDict={}
             inputRootDir=None
+            writer=None
 
         # Emit finished signal
-        self.signals.finished.emit(fileDict, propertyDict, inputRootDir, self.outputFile)
+        self.signals.finished.emit(fileDict, propertyDict, inputRootDir, self.outputFile, writer)
+
+        # Return
+        return
+
+#********************#
+# Output file writer #
+#********************#
+
+class outputFileWriter():
+    """
+    Keeps a private copy of the properties of the galaxies and writes it to the output file
+    """
+
+    # Class attributes
+    compactionThreshold=1000
+
+    def __init__(self, outputFile: str, propertyDict: dict):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.outputFile=outputFile
+        self.journalFile=getJournalFile(outputFile)
+
+        # Initialize attributes
+        self.propertyDict={'galaxies': [dict(galaxy) for galaxy in propertyDict['galaxies']]}
+        self.njournalRecords=0
+
+        # Return
+        return
+    
+    def write(self, galaxyUpdates: dict, compact: bool = False) -> None:
+        """
+        Writes the specified updates of the properties of the galaxies
+
+        Parameters
+        ----------
+        galaxyUpdates : dict
+            A dictionary with the IDs of the updated galaxies as keys and snapshots of their properties as values
+        compact : bool, optional
+            Should the output file be rewritten and the journal be discarded? (default is False)
+        """
+
+        # Apply the updates to the private copy of the property dictionary
+        for igalaxy in sorted(galaxyUpdates.keys()):
+            self.propertyDict['galaxies'][igalaxy]=dict(galaxyUpdates[igalaxy])
+
+        # Check whether the journal has grown too large
+        if(self.njournalRecords+len(galaxyUpdates)>=self.compactionThreshold):
+            compact=True
+
+        if(compact):
+            # Rewrite the output file and discard the journal
+            compactJournal(self.outputFile, self.propertyDict, self.journalFile, quiet=True)
+            self.njournalRecords=0
+        else:
+            # Append the updates to the journal
+            appendJournalRecords(self.journalFile, [{'igalaxy': igalaxy, 'name': galaxy['name'], 'categories': galaxy['categories'], 'comments': galaxy['comments']} for igalaxy, galaxy in sorted(galaxyUpdates.items())])
+            self.njournalRecords=self.njournalRecords+len(galaxyUpdates)
+
+        # Return
+        return
+    
+    def close(self) -> None:
+        """
+        Releases the resources of the writer
+        """
+
+        # Return
+        return
+
+class outputDatabaseWriter():
+    """
+    Writes the properties of the galaxies to an output SQLite database, from which the output file is exported
+    """
+
+    def __init__(self, outputFile: str, databaseFile: str):
+        """
+        Constructor
+        """
+
+        # Evaluate arguments
+        self.outputFile=outputFile
+        self.journalFile=getJournalFile(outputFile)
+
+        # Open the output database
+        self.store=propertyStore(databaseFile)
+
+        # Return
+        return
+    
+    def isOutputFileExported(self) -> bool:
+        """
+        Checks whether the output file is still the one last exported from the output database
+        """
+
+        # Check whether the output file exists
+        if(not os.path.exists(self.outputFile)):
+            return False
+
+        # Compare the status of the output file with the one recorded during the last export
+        outputFileStat=os.stat(self.outputFile)
+
+        # Return
+        return (self.store.getMetadata('exportedOutputFile')==f"{outputFileStat.st_size}:{outputFileStat.st_mtime_ns}")
+    
+    def write(self, galaxyUpdates: dict, compact: bool = False) -> None:
+        """
+        Writes the specified updates of the properties of the galaxies
+
+        Parameters
+        ----------
+        galaxyUpdates : dict
+            A dictionary with the IDs of the updated galaxies as keys and snapshots of their properties as values
+        compact : bool, optional
+            Should the output file be exported from the database? (default is False)
+        """
+
+        # Upsert the updated galaxies
+        if(galaxyUpdates):
+            self.store.upsertGalaxies(galaxyUpdates)
+
+        if(compact):
+            # Export the output file and discard any journal left by the JSON backend
+            compactJournal(self.outputFile, self.store.exportPropertyDict(), self.journalFile, quiet=True)
+            # Record the status of the exported output file
+            outputFileStat=os.stat(self.outputFile)
+            self.store.setMetadata('exportedOutputFile', f"{outputFileStat.st_size}:{outputFileStat.st_mtime_ns}")
+
+        # Return
+        return
+    
+    def close(self) -> None:
+        """
+        Releases the resources of the writer
+        """
+
+        # Close the output database
+        self.store.close()
+
+        # Return
+        return
+
+class outputFileWriterTaskSignals(QObject):
+    """
+    Implements a failed signal for outputFileWriterTask
+    """
+
+    # Class attributes
+    failed=pyqtSignal(object)
+
+class outputFileWriterTask(QRunnable):
+    """
+    Hands a snapshot of updated galaxies over to an output file writer
+    """
+
+    def __init__(self, writer: outputFileWriter, galaxyUpdates: dict, compact: bool = False):
+        """
+        Constructor
+        """
+
+        # Call super().__init__
+        super(outputFileWriterTask, self).__init__()
+
+        # Initialize the signals
+        self.signals=outputFileWriterTaskSignals()
+
+        # Evaluate arguments
+        self.writer=writer
+        self.galaxyUpdates=galaxyUpdates
+        self.compact=compact
+
+        # Return
+        return
+    
+    @pyqtSlot()
+    def run(self):
+        """
+        Writes the snapshot
+        """
+
+        # Write the snapshot, handing the IDs of the galaxies back to be retried if it fails
+        try:
+            self.writer.write(self.galaxyUpdates, compact=self.compact)
+        except (OSError, sqlite3.Error) as error:
+            Console.printError(f"Could not write the output file: {error}")
+            self.signals.failed.emit(set(self.galaxyUpdates.keys()))
 
         # Return
         return
@@ -213,20 +587,25 @@ class QtSubstrate(QObject):
     A class to be used as the substrate for the Qt application
     """
 
-    def __init__(self, outputFileSuffix: Optional[str] = "_classified.json", defaultWindowSize: QSize = QSize(1920, 1080)):
+    def __init__(self, outputFileSuffix: Optional[str] = "_classified.json", defaultWindowSize: QSize = QSize(1920, 1080), autosaveInterval: int = 2000, outputBackend: str = "json"):
         """
         Constructor
         """
 
         # Evaluate arguments
         self.outputFileSuffix=outputFileSuffix
+        self.outputBackend=outputBackend
         self.defaultWindowSize=defaultWindowSize
+        self.autosaveInterval=autosaveInterval
 
         # Initialize attributes
 
         # Backend
         self.actionSubstrate=None
         self.loaderPool=QThreadPool()
+        self.writerPool=QThreadPool()
+        self.writerPool.setMaxThreadCount(1)
+        self.autosaveTimer=None
         self.window=None
 
         # Status
@@ -238,6 +617,8 @@ class QtSubstrate(QObject):
         self.propertyDict={}
         self.inputRootDir=None
         self.outputFile=None
+        self.outputWriter=None
+        self.dirtyGalaxies=set()
 
         # Configuration
         self.searchAliases=True
@@ -260,12 +641,15 @@ class QtSubstrate(QObject):
 
         # Initialize the categories dictionary
         if(categoriesFile is not None):
-            self.categoriesDict=readJSONFile(categoriesFile)
+            self.categoriesDict=readJSONFile(categoriesFile, mutable=False)
             self.excludeClassified=True
         else:
             self.categoriesDict={"categories": []}
             self.excludeClassified=False
 
+        # Compile the category hierarchy
+        self.categoryHierarchy=categoryHierarchy(self.categoriesDict)
+
         # Return
         return
     
@@ -277,6 +661,12 @@ class QtSubstrate(QObject):
         # Initialize action substrate
         self.__initActionSubstrate()
 
+        # Initialize the autosave timer
+        self.autosaveTimer=QTimer(self)
+        self.autosaveTimer.setSingleShot(True)
+        self.autosaveTimer.setInterval(self.autosaveInterval)
+        self.autosaveTimer.timeout.connect(self.flushOutputFile)
+
         # Initialize the main window
         self.window=MainWindow(self)
         self.window.resize(self.defaultWindowSize)
@@ -290,6 +680,9 @@ class QtSubstrate(QObject):
         Close the main window
         """
 
+        # Flush the pending updates to the output file
+        self.closeOutputFile()
+
         # Close the window
         self.window.close()
 
@@ -325,7 +718,7 @@ class QtSubstrate(QObject):
 
         # Open the file dialog
         fileDialog=QFileDialog()
-        inputFile=fileDialog.getOpenFileName(self.window, "Open input file list JSON File", "", "JSON Files (*.json)")[0]
+        inputFile=fileDialog.getOpenFileName(self.window, "Open input file list JSON File", "", "JSON Files (*.json *.json.gz *.json.xz *.json.bz2);;JSON Lines Files (*.jsonl *.ndjson *.jsonl.gz *.jsonl.xz *.jsonl.bz2)")[0]
 
         # Open the specified file
         if(inputFile!=""):
@@ -360,22 +753,31 @@ class QtSubstrate(QObject):
         # Unload the current galaxy
         self.window.loadGalaxy(None)
 
+        # Flush the pending updates to the current output file
+        self.closeOutputFile()
+
         # Disable actions
         self.actionSubstrate.setFileActionsEnabled(False)
         self.actionSubstrate.setExclusionNavigationActionEnabled(False)
         self.actionSubstrate.setSearchActionsEnabled(False)
 
-        # Determine the output filename
+        # Determine the output filename, compressed in the same way as the input file
         outputFile=inputFile
-        inputFileSuffixes=[".json", ".txt", ".lst", ".dat"]
+        compressionSuffix=getCompressionSuffix(outputFile)
+        if(compressionSuffix):
+            outputFile=outputFile[:-len(compressionSuffix)]
+        inputFileSuffixes=[".json", ".jsonl", ".ndjson", ".txt", ".lst", ".dat"]
         for inputFileSuffix in inputFileSuffixes:
             # outputFile=outputFile.removesuffix(inputFileSuffix)
             if(outputFile.endswith(inputFileSuffix)):
                 outputFile=outputFile[:-len(inputFileSuffix)]
         outputFile=outputFile+self.outputFileSuffix
+        if(not getCompressionSuffix(outputFile)):
+            outputFile=outputFile+compressionSuffix
 
         # Initialize the input file loader
-        loader=inputFileLoader(inputFile, outputFile)
+        loader=inputFileLoader(inputFile, outputFile, outputBackend=self.outputBackend)
+        loader.signals.loaded.connect(self.loadingProgress)
         loader.signals.finished.connect(self.loadingDone)
 
         # Start the snapshot loader
@@ -384,7 +786,23 @@ class QtSubstrate(QObject):
         # Return
         return
     
-    def loadingDone(self, fileDict: dict, propertyDict: dict, inputRootDir: str, outputFile: str) -> None:
+    def loadingProgress(self, ngalaxies: int) -> None:
+        """
+        Reports the progress of the loading of a new file dictionary
+
+        Parameters
+        ----------
+        ngalaxies : int
+            The number of galaxies that have been loaded so far
+        """
+
+        # Update the status bar message of the window
+        self.window.updateStatusBarMessage(f"Loaded {ngalaxies} galaxies...")
+
+        # Return
+        return
+    
+    def loadingDone(self, fileDict: dict, propertyDict: dict, inputRootDir: str, outputFile: str, outputWriter: Optional[Union[outputFileWriter, outputDatabaseWriter]]) -> None:
         """
         Loading of a new file dictionary has been completed
 
@@ -398,11 +816,15 @@ class QtSubstrate(QObject):
             The path to the root directory of the input file
         outputFile : str
             The path to the file to use for the writing of the properties of the galaxies
+        outputWriter : outputFileWriter or outputDatabaseWriter, optional
+            The writer of the output file
         """
 
         # Evaluate arguments
         self.inputRootDir=inputRootDir
         self.outputFile=outputFile
+        self.outputWriter=outputWriter
+        self.dirtyGalaxies=set()
 
         # Set metadata
         self.inputFileLoading=False
@@ -411,12 +833,7 @@ class QtSubstrate(QObject):
         self.fileDict=fileDict
 
         # Update the property dict
-        if(propertyDict):
-            self.propertyDict=propertyDict
-        elif(fileDict):
-            self.__initGalaxyProperties()
-        else:
-            self.propertyDict={}
+        self.propertyDict=propertyDict
         
         # Determine which galaxies have been classified
         if(self.fileDict):
@@ -565,25 +982,69 @@ class QtSubstrate(QObject):
         # Return
         return
     
-    def __initGalaxyProperties(self) -> None:
+    def flushOutputFile(self, compact: bool = False, wait: bool = False) -> None:
+        """
+        Hands the pending updates of the properties of the galaxies over to the output file writer
 
-        # Initialize the property dictionary
-        self.propertyDict={'galaxies':[]}
+        Parameters
+        ----------
+        compact : bool, optional
+            Should the output file be rewritten and the journal be discarded? (default is False)
+        wait : bool, optional
+            Should we wait for the writing to be completed? (default is False)
+        """
 
-        # Propulate the property dictionary
-        for igalaxy in range(len(self.fileDict['galaxies'])):
-            self.propertyDict['galaxies'].append({'name':self.fileDict['galaxies'][igalaxy]['name'], 'categories':[], 'comments':""})
-        
-        # Write the property dictionary to file
-        self.__writeOutputFile()
+        # Stop the autosave timer
+        if(self.autosaveTimer is not None):
+            self.autosaveTimer.stop()
+
+        # Take a snapshot of the updated galaxies
+        if((self.outputWriter is not None)and((self.dirtyGalaxies)or(compact))):
+            galaxyUpdates={igalaxy: dict(self.propertyDict['galaxies'][igalaxy]) for igalaxy in self.dirtyGalaxies}
+            self.dirtyGalaxies=set()
+            task=outputFileWriterTask(self.outputWriter, galaxyUpdates, compact=compact)
+            task.signals.failed.connect(self.writingFailed)
+            self.writerPool.start(task)
+
+        # Wait for the writing to be completed
+        if(wait):
+            self.writerPool.waitForDone()
+
+        # Return
+        return
+    
+    def writingFailed(self, igalaxies: set) -> None:
+        """
+        Marks the galaxies of a snapshot that could not be written as updated again, so that the next flush retries them
+
+        Parameters
+        ----------
+        igalaxies : set
+            The IDs of the galaxies of the snapshot
+        """
+
+        # Mark the galaxies as updated
+        self.dirtyGalaxies.update(igalaxies)
+
+        # Schedule the next flush
+        if((self.outputWriter is not None)and(self.autosaveTimer is not None)and(not self.autosaveTimer.isActive())):
+            self.autosaveTimer.start()
 
         # Return
         return
     
-    def __writeOutputFile(self) -> None:
+    def closeOutputFile(self) -> None:
+        """
+        Flushes all pending updates to the output file and releases its writer
+        """
+
+        # Flush the pending updates
+        self.flushOutputFile(compact=True, wait=True)
 
-        # Write the property dictionary to file
-        writeJSONFile(self.outputFile, self.propertyDict)
+        # Release the writer of the output file
+        if(self.outputWriter is not None):
+            self.outputWriter.close()
+            self.outputWriter=None
 
         # Return
         return
@@ -607,8 +1068,10 @@ class QtSubstrate(QObject):
             self.propertyDict['galaxies'][igalaxy]['categories']=categories
         self.propertyDict['galaxies'][igalaxy]['comments']=comments
 
-        # Write the property dictionary to file
-        writeJSONFile(self.outputFile, self.propertyDict)
+        # Schedule the writing of the update
+        self.dirtyGalaxies.add(igalaxy)
+        if(not self.autosaveTimer.isActive()):
+            self.autosaveTimer.start()
 
         # Determine whether the galaxy has been classified
         if(categories):
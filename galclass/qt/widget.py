@@ -450,52 +450,39 @@ class categoriesToolbar(QToolBar):
         # Return
         return
     
-    def __buildCategoryTree(self, category: dict, depth: int = 1, isAlso: list = [], isNot: list = []):
+    def __buildCategoryTree(self):
         """
-        Build the category tree of the specified category
-
-        Parameters
-        ----------
-        category : str
-            The dictionary of the category the tree of which to be built
-        depth : int, optional
-            The depth of the root of the tree (default is 1)
-        isAlso : list, optional
-            A list of categories of which the root category is a subcategory (default is [])
-        isNot : list, optional
-            A list of categories with which the root category is mutually exclusive (default is [])
+        Build the category tree from the compiled category hierarchy of the substrate
         """
 
-        # Initialize the checkboxes of all subcategories of the category
+        # Get the category hierarchy along with the categories implied by and mutually exclusive with each category
+        hierarchy=self.substrate.categoryHierarchy
+        self.implicationMatrix=hierarchy.getImplicationMatrix()
+        self.exclusionMatrix=hierarchy.getExclusionMatrix()
 
-        for subcategory in category['categories']:
+        # Initialize the checkboxes of all categories, in depth-first order
 
-            # Determine the isAlso and isNot of the subcategory
-            subname=subcategory['name']
-            subisAlso=isAlso+subcategory['isAlso']
-            subisNot=isNot+subcategory['isNot']
-            subshortcut=subcategory['shortcut']
+        for icategory in range(hierarchy.ncategories):
 
-            # Initialize the checkbox of the subcategory
+            # Determine the metadata of the category
+            subname=hierarchy.categories[icategory]
+            subshortcut=hierarchy.shortcuts[icategory]
+
+            # Initialize the checkbox of the category
             checkbox=QCheckBox(self)
             checkbox.setCheckable(True)
             checkbox.setChecked(False)
             checkbox.setEnabled(self.categoryWidgetsEnabled)
             if(subshortcut!=""):
                 checkbox.setShortcut(QKeySequence(subshortcut))
-            checkbox.stateChanged.connect(partial(self.checkboxToggled, subname, subisAlso, subisNot))
+            checkbox.stateChanged.connect(partial(self.checkboxToggled, icategory))
             
             # Append the checkbox and its metadata to the category checkboxes list
             self.categoryCheckboxes['checkbox'].append(checkbox)
             self.categoryCheckboxes['name'].append(subname)
-            self.categoryCheckboxes['isAlso'].append(subisAlso)
-            self.categoryCheckboxes['isNot'].append(subisNot)
-            self.categoryCheckboxes['depth'].append(depth)
+            self.categoryCheckboxes['depth'].append(int(hierarchy.depths[icategory]))
             self.categoryCheckboxes['shortcut'].append(subshortcut)
 
-            # Initialize the checkboxes of the subcategories of the subcategory
-            self.__buildCategoryTree(subcategory, depth=depth+1, isAlso=subisAlso+[subname,], isNot=subisNot)
-
         # Return
         return
     
@@ -505,10 +492,10 @@ class categoriesToolbar(QToolBar):
         """
 
         # Initialize the category checkboxes dict
-        self.categoryCheckboxes={'checkbox': [], 'name': [], 'isAlso': [], 'isNot': [], 'depth': [], 'shortcut': []}
+        self.categoryCheckboxes={'checkbox': [], 'name': [], 'depth': [], 'shortcut': []}
 
         # Build the category tree
-        self.__buildCategoryTree(self.substrate.categoriesDict)
+        self.__buildCategoryTree()
 
         # Determine the total number of categories
         self.ncategories=len(self.categoryCheckboxes['name'])
@@ -586,39 +573,33 @@ class categoriesToolbar(QToolBar):
         # Return
         return
     
-    def checkboxToggled(self, name: str, isAlso: list, isNot: list, checked: bool):
+    def checkboxToggled(self, icategory: int, checked: bool):
         """
         Handles the toggling of a checkbox
 
         Parameters
         ----------
-        name : str
-            The name of the category of the toggled checkbox
-        isAlso : list
-            A list of categories of which the category of the toggled checkbox is a subcategory
-        isNot : list, optional
-            A list of categories with which the category of the toggled checkbox is mutually exclusive
+        icategory : int
+            The ID of the category of the toggled checkbox in the category hierarchy
+        checked : bool
+            Has the checkbox been checked?
         """
 
         # Get checkbox toggled
 
-        for icategory in range(self.ncategories):
-
-            # Determine the metadata of the category
-            subcheckbox=self.categoryCheckboxes['checkbox'][icategory]
-            subname=self.categoryCheckboxes['name'][icategory]
-            subisAlso=self.categoryCheckboxes['isAlso'][icategory]
-            subisNot=self.categoryCheckboxes['isNot'][icategory]
-
-            # Determine whether the checkbox needs to be toggled or not
-            if(checked):
-                if(subname in isAlso):
-                    subcheckbox.setChecked(True)
-                if(subname in isNot):
-                    subcheckbox.setChecked(False)
-            else:
-                if(name in subisAlso):
-                    subcheckbox.setChecked(False)
+        if(checked):
+            # Check the categories implied by the category and uncheck those mutually exclusive with it
+            isImplied=self.implicationMatrix[icategory]
+            isExcluded=self.exclusionMatrix[icategory]
+            for jcategory in np.flatnonzero(isImplied|isExcluded):
+                if(isImplied[jcategory]):
+                    self.categoryCheckboxes['checkbox'][jcategory].setChecked(True)
+                if(isExcluded[jcategory]):
+                    self.categoryCheckboxes['checkbox'][jcategory].setChecked(False)
+        else:
+            # Uncheck the categories that imply the category
+            for jcategory in np.flatnonzero(self.implicationMatrix[:,icategory]):
+                self.categoryCheckboxes['checkbox'][jcategory].setChecked(False)
 
         # Return
         return
@@ -19,6 +19,7 @@ from PyQt6.QtPdfWidgets import QPdfView
 # Local #
 
 from .widget import pdfView, MenuBar, navigationToolbar, infoToolbar, categoriesToolbar
+from ..fileio import getGalaxyNames, getGalaxyAliases
 
 ###########
 # Classes #
@@ -166,8 +167,8 @@ class MainWindow(QMainWindow):
         # Update the metadata of the files
         if(self.substrate.fileDict):
             self.ngalaxies=len(self.substrate.fileDict['galaxies'])
-            galaxyNames=[self.substrate.fileDict['galaxies'][igalaxy]['name'] for igalaxy in range(self.ngalaxies)]
-            galaxyAliases=[self.substrate.fileDict['galaxies'][igalaxy]['aliases'] for igalaxy in range(self.ngalaxies)]
+            galaxyNames=getGalaxyNames(self.substrate.fileDict['galaxies'])
+            galaxyAliases=getGalaxyAliases(self.substrate.fileDict['galaxies'])
         else:
             self.ngalaxies=0
             galaxyNames=[]